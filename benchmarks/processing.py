@@ -0,0 +1,124 @@
+"""processing.py: Benchmarks how the cost of processing code comments grows with file size."""
+
+import logging
+import sys
+import tempfile
+import time
+from argparse import ArgumentDefaultsHelpFormatter, ArgumentParser
+from pathlib import Path
+
+from logbookgenerator.computation.code_processing import scan_code_comments
+from logbookgenerator.logs.setup_logging import setup_logging
+from logbookgenerator.logs.tracing import enable_tracing
+
+# The most the time per line may grow from the smallest to the largest file
+LINEARITY_TOLERANCE: float = 1.5
+
+TASK_CODE = (
+    "double solve_{index}(double x) {{\n"
+    "    // Use Newton's method\n"
+    '    const char* label = "/* not a comment */";\n'
+    "    for (int i = 0; i < 10; i++) {{\n"
+    "        x = x - (x * x - 2) / (2 * x);  /* one step */\n"
+    "    }}\n"
+    "    return x;\n"
+    "    /* ANSWER (Task {index}.1): Solves for the square root of two. */\n"
+    "}}\n"
+    "/**\n"
+    " * ANSWER (Task {index}.2):\n"
+    " * Every step doubles the number of correct digits.\n"
+    " */\n"
+)
+
+
+def generate_code(tasks: int) -> str:
+    """
+    Generate C++ code with answer comments.
+
+    Parameters
+    ----------
+    tasks : int
+        The number of tasks, each with two answer comments.
+
+    Returns
+    -------
+    str
+        The code.
+    """
+    return "".join(TASK_CODE.format(index=index) for index in range(tasks))
+
+
+def time_processing(code: str, repeats: int) -> float:
+    """
+    Time processing some code, taking the best of several runs.
+
+    Parameters
+    ----------
+    code : str
+        The code.
+    repeats : int
+        The number of times to process the code.
+
+    Returns
+    -------
+    float
+        The shortest time taken to process the code, in seconds.
+    """
+    timings: list[float] = []
+
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        scan_code_comments(code, remove_comments=True)
+        timings.append(time.perf_counter() - start_time)
+
+    return min(timings)
+
+
+def main() -> None:
+    """
+    Time processing files of doubling size and check the cost grows linearly.
+
+    Notes
+    -----
+    Logging is setup as it is by the application, with DEBUG messages written
+    to a log file, so any logging in the hot loops is included in the timings.
+    Exits with a non-zero code if the time per line grows by more than
+    LINEARITY_TOLERANCE between the smallest and largest files.
+    """
+    parser = ArgumentParser(
+        description="Benchmark how processing code comments scales with file size.",
+        formatter_class=ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("--tasks", type=int, default=250, help="Tasks in the smallest file.")
+    parser.add_argument("--sizes", type=int, default=5, help="Number of doubling file sizes.")
+    parser.add_argument("--repeats", "-n", type=int, default=3, help="Runs per file size.")
+    parser.add_argument("--trace", action="store_true", help="Time with all tracing enabled.")
+    parsed_args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as log_directory:
+        setup_logging(Path(log_directory) / "benchmark_log.txt", console_logging_level="WARNING")
+        logging.getLogger().handlers[0].setLevel(logging.CRITICAL)  # Hide the no answer warnings
+        if parsed_args.trace:
+            enable_tracing(["all"])
+
+        times_per_line: list[float] = []
+        for size in range(parsed_args.sizes):
+            code = generate_code(parsed_args.tasks * 2**size)
+            lines = code.count("\n")
+
+            timing = time_processing(code, parsed_args.repeats)
+            times_per_line.append(timing / lines)
+            print(f"{lines:>9} lines {timing * 1000:10.1f} ms {timing / lines * 1e6:8.2f} us/line")
+
+        logging.shutdown()
+
+    growth = times_per_line[-1] / times_per_line[0]
+    print(f"Time per line grew {growth:.2f}x (tolerance {LINEARITY_TOLERANCE:.2f}x)")
+
+    if growth > LINEARITY_TOLERANCE:
+        print("Processing does not scale linearly.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
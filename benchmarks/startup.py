@@ -0,0 +1,83 @@
+"""startup.py: Benchmarks the cold-start time of the command line interface."""
+
+import statistics
+import subprocess
+import sys
+import time
+from argparse import ArgumentDefaultsHelpFormatter, ArgumentParser
+
+# The budget for the time logbookgenerator adds on top of starting the interpreter
+STARTUP_BUDGET_SECONDS: float = 0.15
+
+COMMANDS: dict[str, list[str]] = {
+    "interpreter": [sys.executable, "-c", "pass"],
+    "import": [sys.executable, "-c", "import logbookgenerator.main"],
+    "version": [sys.executable, "-m", "logbookgenerator.main", "--version"],
+}
+
+
+def time_command(command: list[str], repeats: int) -> float:
+    """
+    Time a command, taking the median of several runs.
+
+    Parameters
+    ----------
+    command : list[str]
+        The command to run.
+    repeats : int
+        The number of times to run the command.
+
+    Returns
+    -------
+    float
+        The median wall time of the command in seconds.
+    """
+    timings: list[float] = []
+
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - start_time)
+
+    return statistics.median(timings)
+
+
+def main() -> None:
+    """
+    Time each command and check the startup overhead against its budget.
+
+    Notes
+    -----
+    Exits with a non-zero code if `logbookgenerator --version` takes longer
+    than STARTUP_BUDGET_SECONDS more than starting the bare interpreter.
+    """
+    parser = ArgumentParser(
+        description="Benchmark the cold-start time of logbookgenerator.",
+        formatter_class=ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("--repeats", "-n", type=int, default=20, help="Runs per command.")
+    parser.add_argument(
+        "--budget",
+        "-b",
+        type=float,
+        default=STARTUP_BUDGET_SECONDS,
+        help="Maximum startup overhead in seconds.",
+    )
+    parsed_args = parser.parse_args()
+
+    timings = {
+        name: time_command(command, parsed_args.repeats) for name, command in COMMANDS.items()
+    }
+    for name, timing in timings.items():
+        print(f"{name:<12} {timing * 1000:8.1f} ms")
+
+    overhead = timings["version"] - timings["interpreter"]
+    print(f"{'overhead':<12} {overhead * 1000:8.1f} ms (budget {parsed_args.budget * 1000:.0f} ms)")
+
+    if overhead > parsed_args.budget:
+        print("Startup overhead is over budget.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
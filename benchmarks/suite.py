@@ -0,0 +1,293 @@
+"""suite.py: Benchmarks the time and memory of each stage of a build at several scales."""
+
+import gc
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from argparse import ArgumentDefaultsHelpFormatter, ArgumentParser
+from collections.abc import Callable
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from logbookgenerator import __version__
+from logbookgenerator.computation.code_processing import process_code_comments
+from logbookgenerator.computation.context_generation import generate_logbook_contexts
+from logbookgenerator.computation.parsing import parse_input_directory
+from logbookgenerator.computation.render_context import (
+    create_logbook,
+    setup_template_environment,
+)
+from logbookgenerator.logs.setup_logging import setup_logging
+from logbookgenerator.utilities.file_handling import load_yaml
+from logbookgenerator.utilities.validation import validate_input_directory
+from synthetic import generate_input_directory
+
+RESULTS_DIRECTORY: Path = Path(__file__).parent / "results"
+
+# The most a stage's time or memory may grow over the baseline before it is a regression
+REGRESSION_TOLERANCE: float = 1.25
+
+# Smaller growths are within the noise of a measurement, whatever their ratio
+NOISE_FLOORS: dict[str, float] = {"seconds": 0.005, "peak_memory_bytes": 64 * 1024}
+
+SCALES: dict[str, dict[str, Any]] = {
+    "small": {"weeks": 4, "files_per_week": 4, "lines_per_file": 100, "coursework_lines": 300},
+    "medium": {"weeks": 12, "files_per_week": 6, "lines_per_file": 300, "coursework_lines": 1000},
+    "large": {"weeks": 24, "files_per_week": 8, "lines_per_file": 500, "coursework_lines": 5000},
+}
+
+
+def measure_stage(stage: Callable[[], Any], repeats: int) -> tuple[dict[str, float], Any]:
+    """
+    Measure the time and memory of a stage.
+
+    Parameters
+    ----------
+    stage : Callable[[], Any]
+        The stage, which is run repeats times and then once more to measure memory.
+    repeats : int
+        The number of times to time the stage.
+
+    Returns
+    -------
+    tuple[dict[str, float], Any]
+        The shortest wall and CPU times in seconds, and the peak memory allocated
+        in bytes, along with the result of the stage.
+
+    Notes
+    -----
+    Memory is measured in its own run, as tracing allocations slows the stage
+    down too much to time it at the same time. As with timeit, garbage is
+    collected before each timed run and not during it, so that collecting
+    the garbage of earlier stages is not timed.
+    """
+    wall_times: list[float] = []
+    cpu_times: list[float] = []
+
+    for _ in range(repeats):
+        gc.collect()
+        gc.disable()
+        try:
+            start_time, start_cpu_time = time.perf_counter(), time.process_time()
+            result = stage()
+            wall_times.append(time.perf_counter() - start_time)
+            cpu_times.append(time.process_time() - start_cpu_time)
+        finally:
+            gc.enable()
+
+    tracemalloc.start()
+    stage()
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "seconds": min(wall_times),
+        "cpu_seconds": min(cpu_times),
+        "peak_memory_bytes": peak_memory,
+    }, result
+
+
+def benchmark_scale(parameters: dict[str, Any], repeats: int) -> dict[str, Any]:
+    """
+    Benchmark each stage of a build of a synthetic input directory.
+
+    Parameters
+    ----------
+    parameters : dict[str, Any]
+        The arguments to generate_input_directory.
+    repeats : int
+        The number of times to time each stage.
+
+    Returns
+    -------
+    dict[str, Any]
+        The parameters, the number and size of the input files, and the
+        measurements of each stage.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        input_directory, config_file = generate_input_directory(Path(directory), **parameters)
+        config = load_yaml(config_file)
+        input_files = [path for path in input_directory.rglob("*") if path.is_file()]
+
+        stages: dict[str, dict[str, float]] = {}
+
+        stages["validate_input_directory"], _ = measure_stage(
+            lambda: validate_input_directory(input_directory), repeats
+        )
+        stages["parse_input_directory"], parsed_input = measure_stage(
+            lambda: parse_input_directory(input_directory), repeats
+        )
+        weekly_files, coursework, references = parsed_input
+
+        cpp_files = [
+            (file_content, file_name.startswith("e") and "-coursework-" in file_name)
+            for weekly_file in weekly_files
+            for file_name, file_content in weekly_file["cpp"].items()
+        ]
+        stages["process_code_comments"], _ = measure_stage(
+            lambda: [
+                process_code_comments(file_content.splitlines(), remove_comments)
+                for file_content, remove_comments in cpp_files
+            ],
+            repeats,
+        )
+        stages["generate_logbook_contexts"], contexts = measure_stage(
+            lambda: generate_logbook_contexts(config, weekly_files, coursework, references),
+            repeats,
+        )
+        logbook_contexts, _, _ = contexts
+
+        setup_template_environment()
+        stages["create_logbook"], _ = measure_stage(
+            lambda: create_logbook(logbook_contexts), repeats
+        )
+
+        return {
+            "parameters": parameters,
+            "files": len(input_files),
+            "bytes": sum(path.stat().st_size for path in input_files),
+            "stages": stages,
+        }
+
+
+def compare_results(
+    results: dict[str, Any], baseline: dict[str, Any], tolerance: float
+) -> list[str]:
+    """
+    Compare results with a baseline, such as those of the previous release.
+
+    Parameters
+    ----------
+    results : dict[str, Any]
+        The results.
+    baseline : dict[str, Any]
+        The baseline results.
+    tolerance : float
+        The most a stage's time or peak memory may grow over the baseline.
+
+    Returns
+    -------
+    list[str]
+        A description of each regression, for the scales and stages in both.
+
+    Notes
+    -----
+    A stage has only regressed if it grew by more than both the tolerance and
+    its measure's NOISE_FLOORS, so that stages taking a few milliseconds do
+    not fail on noise.
+    """
+    regressions: list[str] = []
+
+    for scale, scale_results in results["scales"].items():
+        baseline_stages = baseline.get("scales", {}).get(scale, {}).get("stages", {})
+        for stage, measurements in scale_results["stages"].items():
+            for measure in ("seconds", "peak_memory_bytes"):
+                baseline_value = baseline_stages.get(stage, {}).get(measure)
+                if not baseline_value:
+                    continue
+
+                growth = measurements[measure] / baseline_value
+                print(f"{scale:<8} {stage:<26} {measure:<18} {growth:6.2f}x baseline")
+                if (
+                    growth > tolerance
+                    and measurements[measure] - baseline_value > NOISE_FLOORS[measure]
+                ):
+                    regressions.append(f"{stage} {measure} at {scale} scale grew {growth:.2f}x")
+
+    return regressions
+
+
+def main() -> None:
+    """
+    Benchmark every stage at each scale, save the results and compare them.
+
+    Notes
+    -----
+    Logging is setup as it is by the application, with DEBUG messages written
+    to a log file, so any logging in the hot loops is included in the results.
+    Results are saved as JSON, by default as RESULTS_DIRECTORY/<version>.json,
+    so that each release can be compared with the previous one. Exits with a
+    non-zero code if any stage regressed by more than the tolerance.
+    """
+    parser = ArgumentParser(
+        description="Benchmark the time and memory of each stage of a build.",
+        formatter_class=ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument(
+        "--scales",
+        "-s",
+        nargs="+",
+        choices=list(SCALES),
+        default=list(SCALES),
+        help="Scales to benchmark.",
+    )
+    parser.add_argument("--repeats", "-n", type=int, default=3, help="Runs per stage.")
+    parser.add_argument(
+        "--output",
+        "-o",
+        type=Path,
+        default=RESULTS_DIRECTORY / f"{__version__}.json",
+        help="Path to save the results to.",
+    )
+    parser.add_argument("--compare", "-c", type=Path, help="Results to compare with.")
+    parser.add_argument(
+        "--tolerance",
+        "-t",
+        type=float,
+        default=REGRESSION_TOLERANCE,
+        help="Most a stage may grow over the compared results.",
+    )
+    parsed_args = parser.parse_args()
+
+    results: dict[str, Any] = {
+        "version": __version__,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "repeats": parsed_args.repeats,
+        "scales": {},
+    }
+
+    with tempfile.TemporaryDirectory() as log_directory:
+        setup_logging(Path(log_directory) / "benchmark_log.txt", console_logging_level="WARNING")
+        logging.getLogger().handlers[0].setLevel(logging.CRITICAL)  # Hide the no answer warnings
+
+        for scale in parsed_args.scales:
+            scale_results = benchmark_scale(SCALES[scale], parsed_args.repeats)
+            results["scales"][scale] = scale_results
+
+            print(f"{scale} scale: {scale_results['files']} files, {scale_results['bytes']} bytes")
+            for stage, measurements in scale_results["stages"].items():
+                print(
+                    f"  {stage:<26} {measurements['seconds'] * 1000:10.1f} ms "
+                    f"{measurements['cpu_seconds'] * 1000:10.1f} ms CPU "
+                    f"{measurements['peak_memory_bytes'] / 2**20:8.1f} MiB peak"
+                )
+
+        logging.shutdown()
+
+    parsed_args.output.parent.mkdir(parents=True, exist_ok=True)
+    parsed_args.output.write_text(json.dumps(results, indent=4) + "\n")
+    print(f"Saved the results to {parsed_args.output}")
+
+    if parsed_args.compare is not None:
+        baseline = json.loads(parsed_args.compare.read_text())
+        print(f"Comparing with {parsed_args.compare} (version {baseline.get('version')})")
+
+        regressions = compare_results(results, baseline, parsed_args.tolerance)
+        for regression in regressions:
+            print(f"Regression: {regression}")
+
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""synthetic.py: Generates synthetic input directories of any size for the benchmarks."""
+
+import random
+from argparse import ArgumentDefaultsHelpFormatter, ArgumentParser
+from pathlib import Path
+
+CODE_LINES: list[str] = [
+    "double x = {value} * y + z;",
+    "for (int i = 0; i < {value}; i++) {{ total += i; }}",
+    'std::cout << "Step " << {value} << std::endl;',
+    'const char* label = "/* not a comment {value} */";',
+    "x = x - (x * x - {value}) / (2 * x);  // One Newton step",
+    "if (x > {value}) {{ return x; }}",
+    "std::vector<double> values({value}, 0.0);",
+    "/* Scale by {value} */ y *= {value};",
+]
+
+ANSWER_COMMENTS: list[str] = [
+    "/* ANSWER (Task {task}): The loop runs {value} times. */",
+    "// ANSWER (Task {task}): Each step doubles the number of correct digits.",
+    "/**\n * ANSWER (Task {task}):\n * The result converges after {value} steps,\n"
+    " * as the error is squared each time.\n */",
+]
+
+REFERENCES_FILE: str = (
+    "references:\n"
+    "  - description: A textbook on numerical methods\n"
+    "    title: Numerical Recipes\n"
+    "    year: 2007\n"
+    "    url: http://numerical.recipes\n"
+    '    date_accessed: "2024-01-01"\n'
+)
+
+CONFIG_FILE: str = (
+    "module:\n"
+    "    code: MTH2008\n"
+    "    name: Scientific Computing\n"
+    "    semester: Semester A\n"
+    "    year: 2024\n"
+    "statement:\n"
+    "    text: I confirm that this logbook is entirely my own work.\n"
+    "student:\n"
+    "    id: 12345678\n"
+    "    name: Synthetic Student\n"
+    "university:\n"
+    "    department: School of Engineering and Physical Sciences\n"
+    "    name: University of Lincoln\n"
+    '    start: "2024-09-23"\n'
+)
+
+
+def generate_code(
+    random_generator: random.Random, lines: int, answer_density: float, week_number: int
+) -> str:
+    """
+    Generate a C++ file with answer comments.
+
+    Parameters
+    ----------
+    random_generator : random.Random
+        The seeded random generator, so the same arguments give the same code.
+    lines : int
+        The number of lines of code, not counting the answer comments.
+    answer_density : float
+        The chance of an answer comment following each line of code.
+    week_number : int
+        The week number, which the answer comments' task numbers start with.
+
+    Returns
+    -------
+    str
+        The code.
+    """
+    code_lines = ["#include <iostream>", "#include <vector>", "", "int main() {"]
+    answers = 0
+
+    for _ in range(lines):
+        value = random_generator.randint(1, 100)
+        code_lines.append(f"    {random_generator.choice(CODE_LINES).format(value=value)}")
+
+        if random_generator.random() < answer_density:
+            answers += 1
+            answer_comment = random_generator.choice(ANSWER_COMMENTS)
+            code_lines.append(
+                "    "
+                + answer_comment.format(task=f"{week_number}.{answers}", value=value).replace(
+                    "\n", "\n    "
+                )
+            )
+
+    code_lines.extend(["    return 0;", "}", ""])
+    return "\n".join(code_lines)
+
+
+def generate_input_directory(
+    directory: Path,
+    weeks: int = 12,
+    files_per_week: int = 6,
+    lines_per_file: int = 200,
+    answer_density: float = 0.05,
+    coursework_lines: int = 1000,
+    seed: int = 0,
+) -> tuple[Path, Path]:
+    """
+    Generate an input directory and configuration file.
+
+    Parameters
+    ----------
+    directory : Path
+        Path to the directory to generate them in.
+    weeks : int, optional
+        The number of week directories, by default 12
+    files_per_week : int, optional
+        The number of lab and extra task files in each week, by default 6
+    lines_per_file : int, optional
+        The number of lines of code in each task file, by default 200
+    answer_density : float, optional
+        The chance of an answer comment following each line of code, by default 0.05
+    coursework_lines : int, optional
+        The number of lines of code in the coursework file, which is in the
+        last week, by default 1000. No coursework file is generated if 0.
+    seed : int, optional
+        The seed of the random generator, by default 0
+
+    Returns
+    -------
+    tuple[Path, Path]
+        Paths to the input directory and the configuration file.
+
+    Notes
+    -----
+    The same arguments always give the same files. The first half of each
+    week's files are lab tasks and the rest are extra tasks. Week directories
+    are zero padded, so that they are ordered chronologically.
+    """
+    random_generator = random.Random(seed)
+    input_directory = directory / "weeks"
+
+    for week_number in range(1, weeks + 1):
+        week_path = input_directory / f"week{week_number:02d}"
+        week_path.mkdir(parents=True, exist_ok=True)
+
+        for file_number in range(1, files_per_week + 1):
+            task_type = "l" if file_number <= (files_per_week + 1) // 2 else "e"
+            file_name = f"{task_type}{file_number:02d}-topic_{file_number}-task_{file_number}.cpp"
+            (week_path / file_name).write_text(
+                generate_code(random_generator, lines_per_file, answer_density, week_number)
+            )
+
+        if coursework_lines and week_number == weeks:
+            (week_path / f"e{files_per_week + 1:02d}-coursework-solver.cpp").write_text(
+                generate_code(random_generator, coursework_lines, answer_density, week_number)
+            )
+
+        (week_path / "reflection.md").write_text(
+            f"This week I learnt about topic {week_number}.\n" * 5
+        )
+
+    (input_directory / "references.yaml").write_text(REFERENCES_FILE)
+
+    config_file = directory / "config.yaml"
+    config_file.write_text(CONFIG_FILE)
+
+    return input_directory, config_file
+
+
+def main() -> None:
+    """Generate a synthetic input directory and configuration file from the command line."""
+    parser = ArgumentParser(
+        description="Generate a synthetic input directory and configuration file.",
+        formatter_class=ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("directory", type=Path, help="Directory to generate them in.")
+    parser.add_argument("--weeks", type=int, default=12, help="Number of week directories.")
+    parser.add_argument("--files", type=int, default=6, help="Task files in each week.")
+    parser.add_argument("--lines", type=int, default=200, help="Lines of code in each file.")
+    parser.add_argument(
+        "--answer_density", type=float, default=0.05, help="Chance of an answer after each line."
+    )
+    parser.add_argument(
+        "--coursework_lines", type=int, default=1000, help="Lines of code in the coursework."
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the random generator.")
+    parsed_args = parser.parse_args()
+
+    input_directory, config_file = generate_input_directory(
+        parsed_args.directory,
+        weeks=parsed_args.weeks,
+        files_per_week=parsed_args.files,
+        lines_per_file=parsed_args.lines,
+        answer_density=parsed_args.answer_density,
+        coursework_lines=parsed_args.coursework_lines,
+        seed=parsed_args.seed,
+    )
+    print(f"Generated {input_directory} and {config_file}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""batch.py: Called when building the logbooks of a whole cohort at once."""
+
+import logging
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from logging import shutdown as shutdown_logging
+from pathlib import Path
+from typing import Any
+
+from .computation.render_context import setup_template_environment
+from .config.constants import Constants
+from .interface.command_line import batch_command_line_interface
+from .logs.setup_logging import setup_logging
+from .main import build_logbook
+from .utilities.batching import find_students, load_batch_manifest
+from .utilities.caching import evict_cache_entries
+from .utilities.file_handling import load_yaml
+from .utilities.scanning import scan_input_directory
+from .utilities.validation import validate_input_directory
+
+logger = logging.getLogger(__name__)
+
+
+def initialise_worker(logging_level: int, cache_directory: Path | None) -> None:
+    """
+    Prepare a worker process to build logbooks.
+
+    Parameters
+    ----------
+    logging_level : int
+        The logging level for the worker's own log messages.
+    cache_directory : Path | None
+        Path to the build cache directory, or None to disable caching.
+
+    Notes
+    -----
+    This runs once per worker, rather than once per student, so the cost of
+    importing the build pipeline and preparing its templates is shared by
+    every student the worker builds.
+    """
+    logging.getLogger().setLevel(logging_level)
+    setup_template_environment(cache_directory)
+
+
+def build_student_logbook(
+    student: dict[str, Any], cache_directory: Path | None
+) -> tuple[str, float, str | None]:
+    """
+    Build the logbook of a single student.
+
+    Parameters
+    ----------
+    student : dict[str, Any]
+        The student, with the keys "name", "input_directory", "config_file" and
+        "output_file".
+    cache_directory : Path | None
+        Path to the build cache directory, or None to disable caching.
+
+    Returns
+    -------
+    tuple[str, float, str | None]
+        The student's name, the number of seconds the build took, and the error
+        that stopped the build, if there was one.
+    """
+    start_time = time.perf_counter()
+
+    try:
+        manifest = scan_input_directory(student["input_directory"])
+        validate_input_directory(student["input_directory"], manifest)
+        config = load_yaml(student["config_file"])
+
+        build_logbook(
+            {
+                "input_directory": student["input_directory"],
+                "output_file": student["output_file"],
+                "jobs": Constants.DEFAULT_JOBS,
+                "cache_directory": cache_directory,
+                "weeks": None,
+                "targets": set(Constants.BUILD_TARGETS),
+                "split": False,
+            },
+            config,
+            manifest,
+        )
+    except Exception as error:
+        logger.debug(f"Failed to build the logbook of {student['name']}", exc_info=True)
+        return student["name"], time.perf_counter() - start_time, f"{type(error).__name__}: {error}"
+
+    return student["name"], time.perf_counter() - start_time, None
+
+
+def main() -> None:
+    """
+    Overall control flow of the batch application.
+
+    Notes
+    -----
+    Each student's logbook is built in its own task on a process pool, with
+    their outputs saved in their own directory. A failure for one student
+    does not stop the others, and a summary of every build is logged at the
+    end. The exit code is non-zero if any build failed.
+    """
+    # Get the arguments from the command line
+    user_arguments = batch_command_line_interface()
+
+    # Setup logging
+    setup_logging(
+        user_arguments["log_output_location"],
+        console_logging_level=(
+            "DEBUG" if user_arguments["verbose"] else Constants.LOGGING_LEVEL_CONSOLE_DEFAULT
+        ),
+    )
+
+    # Find the students to build
+    if user_arguments["manifest_file"] is not None:
+        students = load_batch_manifest(
+            user_arguments["manifest_file"], user_arguments["output_directory"]
+        )
+    else:
+        students = find_students(
+            user_arguments["root_directory"], user_arguments["output_directory"]
+        )
+    logger.info(f"Building {len(students)} logbooks with {user_arguments['jobs']} workers...")
+
+    # Build every student's logbook across the pool
+    results: dict[int, tuple[float, str | None]] = {}
+    with ProcessPoolExecutor(
+        max_workers=min(user_arguments["jobs"], max(len(students), 1)),
+        initializer=initialise_worker,
+        initargs=(logging.WARNING, user_arguments["cache_directory"]),
+    ) as executor:
+        futures = {
+            executor.submit(
+                build_student_logbook, student, user_arguments["cache_directory"]
+            ): student_index
+            for student_index, student in enumerate(students)
+        }
+        for future in as_completed(futures):
+            name, duration, error = future.result()
+            results[futures[future]] = (duration, error)
+
+            if error is None:
+                logger.debug(f"Built the logbook of {name} in {duration:.2f}s.")
+            else:
+                logger.error(f"Failed to build the logbook of {name}: {error}")
+
+    # Keep the build cache within its size cap
+    if user_arguments["cache_directory"] is not None:
+        for cache_name in (Constants.COMMENTS_CACHE_NAME, Constants.SECTIONS_CACHE_NAME):
+            evict_cache_entries(user_arguments["cache_directory"] / cache_name)
+
+    # Summarise the builds, in the order the students were given
+    failures = [student_index for student_index, (_, error) in results.items() if error]
+    for student_index, student in enumerate(students):
+        duration, error = results[student_index]
+        logger.info(
+            f"{'FAILED' if error else 'OK':<6} {student['name']} ({duration:.2f}s)"
+            + (f": {error}" if error else "")
+        )
+    logger.info(f"{len(students) - len(failures)} succeeded, {len(failures)} failed.")
+
+    shutdown_logging()
+
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,105 +1,203 @@
 """code_processing.py: Contains the functions for processing the code files."""
 
-import re
+from collections.abc import Iterable, Iterator
+from functools import partial
+from math import ceil
+from pathlib import Path
+from time import perf_counter
+from typing import Any
 
 from ..config.constants import Constants
+from ..logs.profiling import get_profiler
+from ..logs.tracing import get_tracer
+from ..utilities.caching import cache_key, load_cache_entry, save_cache_entry
 from . import logger
-from .comment_extraction import (
-    extract_block_comment,
-    extract_comment_content,
-    extract_comment_id,
-)
+from .comment_lexing import TokenKind, lex_code, parse_answer_comment, split_code
+from .models import CodeSpan
 
 logger = logger.getChild(__name__)
+tracer = get_tracer("processing")
 
 
-def process_inline_comment(
-    comment_line: str,
-    code_lines: list[str],
-    task_comments: dict[str, list[tuple[str, str]]],
-) -> tuple[str, list[str], dict[str, list[tuple[str, str]]]]:
+def stream_token_comments(
+    tokens: Iterable[tuple[TokenKind, str]],
+    code: str,
+    clean_code_lines: list[str] | None = None,
+) -> Iterator[tuple[str, str, str | CodeSpan]]:
     """
-    Process an inline comment to extract answer comments and related code.
+    Stream the answer comments and related code out of some lexed C++ code.
 
     Parameters
     ----------
-    comment_line : str
-        The comment line.
-    code_lines : list[str]
-        The code lines.
-    task_comments : dict[str, list[tuple[str, str]]]
-        A dictionary where keys are task identifiers and values are lists of tuples
-        containing comments and associated code.
+    tokens : Iterable[tuple[TokenKind, str]]
+        The tokens of the code, from lex_code.
+    code : str
+        The code that the tokens were lexed from, as a single buffer.
+    clean_code_lines : list[str] | None, optional
+        If given, every line of code with its comments removed is appended to
+        this list, by default None. Lines holding only comments are left out.
 
-    Returns
-    -------
-    tuple[str, list[str], dict[str, list[tuple[str, str]]]]
-        The updated comment line, code lines, and task comments.
+    Yields
+    ------
+    tuple[str, str, str | CodeSpan]
+        The comment identifier, comment content and associated code of each
+        answer comment, in the order they appear.
+
+    Notes
+    -----
+    The code associated with an answer comment is every line of code since
+    the previous block comment that started its own line. Line comments, and
+    comments that follow code on the same line, are kept as part of the code,
+    unless they are answer comments, in which case the code on their line
+    belongs to them.
+
+    The code of an answer is kept as a span of the buffer, so most answers
+    never have their lines copied.
     """
-    match = re.match(
-        Constants.INLINE_ANSWER_COMMENT, comment_line.strip(f"{Constants.INLINE_COMMENT_START} ")
-    )
+    line_parts: list[str] = []
+    line_has_comment = False
+
+    # Offsets into the buffer of the answer's code
+    position = span_start = 0
+    span_after_comment = False
+
+    def finish_line() -> None:
+        """Add the code of the current line to the clean code."""
+        nonlocal line_parts, line_has_comment
 
-    if not match:
-        logger.debug(f"No match found for inline comment: {comment_line}")
-        return "", [], task_comments
+        if clean_code_lines is not None:
+            line_code = "".join(line_parts)
+            if line_code.strip() or not line_has_comment:
+                clean_code_lines.append(line_code.rstrip() if line_has_comment else line_code)
 
-    comment_id = f"{match.group(1)}_{match.group(2)}_{match.group(3)}"
-    comment_content = match.group(4).strip()
-    logger.debug(f"Comment ID: {comment_id}, Comment content: {comment_content}")
+        line_parts, line_has_comment = [], False
 
-    task_comments.setdefault(comment_id, [])
-    task_comments[comment_id].append((comment_content, "\n".join(code_lines)))
+    for token_kind, token_text in tokens:
+        token_start = position
+        position += len(token_text)
 
-    return "", [], task_comments
+        if token_kind is TokenKind.CODE:
+            line_parts.append(token_text)
+            continue
 
+        if token_kind is TokenKind.NEWLINE:
+            finish_line()
+            continue
 
-def process_block_comment(
-    comment_lines: list[str],
-    code_lines: list[str],
-    task_comments: dict[str, list[tuple[str, str]]],
-) -> tuple[list[str], list[str], dict[str, list[tuple[str, str]]]]:
+        if tracer.enabled:
+            tracer("Comment found: %s", token_text)
+        follows_code = bool("".join(line_parts).strip())
+        answer = parse_answer_comment(token_text) if token_kind is TokenKind.ANSWER else None
+
+        if answer is None and (follows_code or token_text.startswith(Constants.LINE_COMMENT_START)):
+            # Kept as code, so it is in the answer's code and the clean code as it was written
+            for part_kind, part_text in split_code(token_text):
+                if part_kind is TokenKind.CODE:
+                    line_parts.append(part_text)
+                else:
+                    finish_line()
+            continue
+
+        if answer is not None:
+            answer_code: str | CodeSpan = CodeSpan(
+                code, span_start, token_start, span_after_comment
+            )
+            if token_start - span_start < Constants.MINIMUM_CODE_SPAN_LENGTH:
+                answer_code = str(answer_code)
+
+            yield *answer, answer_code
+
+        # A block comment on its own line, or an answer, ends the code for the next answer
+        span_start, span_after_comment = position, True
+
+        line_has_comment = True
+        if "\n" in token_text:
+            # The comment ran onto later lines, so any code after it is on a new line
+            finish_line()
+            line_has_comment = True
+
+    if line_parts:
+        finish_line()
+
+
+def normalise_code(code: str) -> str:
     """
-    Process a block comment to extract answer comments and related code.
+    Normalise the line endings of some C++ code, so that it can be lexed whole.
 
     Parameters
     ----------
-    comment_lines : list[str]
-        The comment lines.
-    code_lines : list[str]
-        The code lines.
-    task_comments : dict[str, list[tuple[str, str]]]
-        A dictionary where keys are task identifiers and values are lists of tuples
-        containing comments and associated code.
+    code : str
+        The code.
 
     Returns
     -------
-    tuple[list[str], list[str], dict[str, list[tuple[str, str]]]]
-        The updated comment lines, code lines, and task comments.
+    str
+        The code with only "\\n" line endings, ending with a line ending.
+    """
+    if "\r" in code:
+        code = code.replace("\r\n", "\n").replace("\r", "\n")
+    if not code.endswith("\n"):
+        code += "\n"
 
-    Raises
-    ------
-    ValueError
-        If the block comment is empty.
+    return code
+
+
+def scan_code_comments(
+    code: str, remove_comments: bool = False
+) -> tuple[dict[str, list[tuple[str, str | CodeSpan]]] | str, str | None]:
     """
-    if not comment_lines:
-        logger.error("Block comment is empty.")
-        raise ValueError("Block comment is empty.")
+    Scan the whole of some C++ code to extract answer comments and related code.
 
-    if comment_lines[0].startswith(Constants.ANSWER_KEYWORD):
-        comment_id = extract_comment_id(comment_lines[0])
-        comment_content = extract_comment_content(comment_lines)
-        logger.debug(f"Comment ID: {comment_id}, Comment content: {comment_content}")
+    Parameters
+    ----------
+    code : str
+        The code.
+    remove_comments : bool, optional
+        Whether to remove comments from the code, by default False
+
+    Returns
+    -------
+    tuple[dict[str, list[tuple[str, str | CodeSpan]]] | str, str | None]
+        The same as process_code_comments.
+
+    Notes
+    -----
+    Code that does not contain Constants.ANSWER_KEYWORD anywhere cannot have
+    any answer comments, so it is returned as it is without being lexed or
+    warned about. Any other code is lexed as a single buffer, and the code of
+    its answers is kept as spans of that buffer where possible.
+    """
+    if Constants.ANSWER_KEYWORD not in code:
+        # Most files have no answers, so this is too common to be worth a warning
+        logger.debug("No answer comments found, returning code as string")
+        original_code = "\n".join(code.splitlines())
+        return original_code, (original_code if remove_comments else None)
+
+    code = normalise_code(code)
+
+    task_comments: dict[str, list[tuple[str, str | CodeSpan]]] = {}
+    cleaned_code_lines: list[str] | None = [] if remove_comments else None
+
+    for comment_id, comment_content, comment_code in stream_token_comments(
+        lex_code([code]), code, cleaned_code_lines
+    ):
+        task_comments.setdefault(comment_id, []).append((comment_content, comment_code))
+
+    if task_comments:
+        tracer("Task comments: %s", task_comments)
+        return task_comments, (
+            "\n".join(cleaned_code_lines) if cleaned_code_lines is not None else None
+        )
 
-        task_comments.setdefault(comment_id, [])
-        task_comments[comment_id].append((comment_content, "\n".join(code_lines)))
+    logger.warning("No answer comments found, returning code as string")
+    original_code = "\n".join(code.splitlines())
 
-    return [], [], task_comments
+    return original_code, (original_code if remove_comments else None)
 
 
 def process_code_comments(
     code_lines: list[str], remove_comments: bool = False
-) -> tuple[dict[str, list[tuple[str, str]]] | str, str | None]:
+) -> tuple[dict[str, list[tuple[str, str | CodeSpan]]] | str, str | None]:
     """
     Process the C++ code to extract answer comments and related code.
 
@@ -112,7 +210,7 @@ def process_code_comments(
 
     Returns
     -------
-    tuple[dict[str, list[tuple[str, str]]] | str, str | None]
+    tuple[dict[str, list[tuple[str, str | CodeSpan]]] | str, str | None]
         The task comments, or the code as a string, and any remaining code lines,
         if remove_comments is True.
 
@@ -127,42 +225,252 @@ def process_code_comments(
         ...
     }
     """
-    task_comments: dict[str, list[tuple[str, str]]] = {}
-    current_code_lines: list[str] = []
-    cleaned_code_lines: list[str] = []
-    line_number = 0
-
-    while line_number < len(code_lines):
-        raw_line = code_lines[line_number]
-        line = raw_line.strip()
-        logger.debug(f"Processing line: {line}")
-
-        if line.startswith(Constants.BLOCK_COMMENT_START):
-            logger.debug("Block comment found")
-            line_number += 1  # Skip the block comment start line
-            current_comment_lines, line_number = extract_block_comment(code_lines, line_number)
-            current_comment_lines, current_code_lines, task_comments = process_block_comment(
-                current_comment_lines, current_code_lines, task_comments
-            )
-        elif line.startswith(Constants.INLINE_COMMENT_START):
-            logger.debug("Inline comment found")
-            line, current_code_lines, task_comments = process_inline_comment(
-                line, current_code_lines, task_comments
-            )
-        else:
-            logger.debug("Code line found")
-            current_code_lines.append(line)
-            if remove_comments:
-                cleaned_code_lines.append(raw_line)
+    return scan_code_comments("\n".join(code_lines), remove_comments=remove_comments)
 
-        line_number += 1
-        logger.debug(f"Current code lines: {current_code_lines}")
 
-    if task_comments:
-        logger.debug(f"Task comments: {task_comments}")
-        return task_comments, ("\n".join(cleaned_code_lines) if remove_comments else None)
+def process_file_comments(
+    file_content: str,
+    remove_comments: bool = False,
+    cache_directory: Path | None = None,
+) -> tuple[dict[str, list[tuple[str, str | CodeSpan]]] | str, str | None]:
+    """
+    Process the contents of a C++ file, reusing the cached result if it is unchanged.
 
-    logger.warning("No answer comments found, returning code as string")
-    original_code = "\n".join(code_lines)
+    Parameters
+    ----------
+    file_content : str
+        The contents of the file.
+    remove_comments : bool, optional
+        Whether to remove comments from the code, by default False
+    cache_directory : Path | None, optional
+        Path to the build cache directory, by default None, which disables caching.
 
-    return original_code, (original_code if remove_comments else None)
+    Returns
+    -------
+    tuple[dict[str, list[tuple[str, str | CodeSpan]]] | str, str | None]
+        The same as process_code_comments.
+
+    Notes
+    -----
+    Results are cached by a hash of the file contents and the tool version,
+    so a file only needs to be processed again once it has been changed.
+    Files without any answer comments are cheaper to scan than to look up, so
+    are never cached.
+    """
+    result, _, _ = time_file_comments(file_content, remove_comments, cache_directory)
+    return result
+
+
+def time_file_comments(
+    file_content: str,
+    remove_comments: bool = False,
+    cache_directory: Path | None = None,
+) -> tuple[tuple[dict[str, list[tuple[str, str | CodeSpan]]] | str, str | None], float, bool]:
+    """
+    Process the contents of a C++ file, timing it and noting whether the cache was used.
+
+    Parameters
+    ----------
+    file_content : str
+        The contents of the file.
+    remove_comments : bool, optional
+        Whether to remove comments from the code, by default False
+    cache_directory : Path | None, optional
+        Path to the build cache directory, by default None, which disables caching.
+
+    Returns
+    -------
+    tuple[tuple[dict[str, list[tuple[str, str | CodeSpan]]] | str, str | None], float, bool]
+        The same as process_code_comments, along with the wall time it took in
+        seconds and whether the result was reused from the cache.
+
+    Notes
+    -----
+    The time and cache use are returned rather than recorded, so that they
+    reach the profiler even when the file is processed in a worker process.
+    """
+    start_time = perf_counter()
+
+    if cache_directory is None or Constants.ANSWER_KEYWORD not in file_content:
+        return (
+            scan_code_comments(file_content, remove_comments=remove_comments),
+            perf_counter() - start_time,
+            False,
+        )
+
+    comments_cache_directory = cache_directory / Constants.COMMENTS_CACHE_NAME
+    key = cache_key(file_content, str(remove_comments))
+
+    cached_result = load_cache_entry(comments_cache_directory, key)
+    if cached_result is not None:
+        task_comments = cached_result["task_comments"]
+        if isinstance(task_comments, dict):
+            # JSON has no tuples or spans, so restore them for the templates
+            code = normalise_code(file_content)
+            task_comments = {
+                comment_id: [
+                    (
+                        comment,
+                        (
+                            answer_code
+                            if isinstance(answer_code, str)
+                            else CodeSpan(code, *answer_code)
+                        ),
+                    )
+                    for comment, answer_code in answers
+                ]
+                for comment_id, answers in task_comments.items()
+            }
+        return (task_comments, cached_result["clean_code"]), perf_counter() - start_time, True
+
+    task_comments, clean_code = scan_code_comments(file_content, remove_comments=remove_comments)
+    cached_task_comments: dict[str, Any] | str = task_comments
+    if isinstance(task_comments, dict):
+        # Spans are stored by their offsets, as the file contents are part of the key
+        cached_task_comments = {
+            comment_id: [
+                (
+                    comment,
+                    (
+                        answer_code
+                        if isinstance(answer_code, str)
+                        else [answer_code.start, answer_code.end, answer_code.after_comment]
+                    ),
+                )
+                for comment, answer_code in answers
+            ]
+            for comment_id, answers in task_comments.items()
+        }
+    save_cache_entry(
+        comments_cache_directory,
+        key,
+        {"task_comments": cached_task_comments, "clean_code": clean_code},
+    )
+
+    return (task_comments, clean_code), perf_counter() - start_time, False
+
+
+def process_files_comments(
+    file_contents: list[str],
+    remove_comments: bool | list[bool] = False,
+    cache_directory: Path | None = None,
+    jobs: int = Constants.DEFAULT_JOBS,
+    file_names: list[str] | None = None,
+) -> list[tuple[dict[str, list[tuple[str, str | CodeSpan]]] | str, str | None]]:
+    """
+    Process the contents of several C++ files, optionally in parallel.
+
+    Parameters
+    ----------
+    file_contents : list[str]
+        The contents of each file.
+    remove_comments : bool | list[bool], optional
+        Whether to remove comments from the code, either for every file or for
+        each file in turn, by default False
+    cache_directory : Path | None, optional
+        Path to the build cache directory, by default None, which disables caching.
+    jobs : int, optional
+        The maximum number of processes to use, by default Constants.DEFAULT_JOBS
+    file_names : list[str] | None, optional
+        The name of each file, by default None, which names them by position.
+        When profiling, the time each file took is recorded under its name.
+
+    Returns
+    -------
+    list[tuple[dict[str, list[tuple[str, str | CodeSpan]]] | str, str | None]]
+        The result of process_file_comments for each file, in the same order
+        as the given contents.
+
+    Notes
+    -----
+    Processing is CPU bound, so the files are spread over a process pool in
+    chunks, and the results are identical to processing them one by one.
+    Files without any answer comments are always scanned in this process, and
+    the rest are only sent to the pool once they add up to at least
+    Constants.PARALLEL_PROCESSING_MINIMUM_SIZE, as starting the pool costs
+    more than it saves on smaller inputs.
+    """
+    process_file = partial(time_file_comments, cache_directory=cache_directory)
+    if isinstance(remove_comments, bool):
+        remove_comments = [remove_comments] * len(file_contents)
+
+    answer_indices = [
+        index
+        for index, file_content in enumerate(file_contents)
+        if Constants.ANSWER_KEYWORD in file_content
+    ]
+    answer_size = sum(len(file_contents[index]) for index in answer_indices)
+
+    if (
+        jobs <= 1
+        or len(answer_indices) <= 1
+        or answer_size < Constants.PARALLEL_PROCESSING_MINIMUM_SIZE
+    ):
+        timed_results = [
+            process_file(file_content, remove_file_comments)
+            for file_content, remove_file_comments in zip(file_contents, remove_comments)
+        ]
+        return record_source_times(timed_results, file_contents, file_names)
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = min(jobs, len(answer_indices))
+    chunk_size = ceil(len(answer_indices) / (workers * Constants.PARALLEL_CHUNKS_PER_WORKER))
+    logger.debug(
+        f"Processing {len(answer_indices)} files with {workers} processes "
+        f"in chunks of {chunk_size}"
+    )
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        answer_results = executor.map(
+            process_file,
+            [file_contents[index] for index in answer_indices],
+            [remove_comments[index] for index in answer_indices],
+            chunksize=chunk_size,
+        )
+        results = dict(zip(answer_indices, answer_results))
+
+    timed_results = [
+        results[index] if index in results else process_file(file_content, remove_comments[index])
+        for index, file_content in enumerate(file_contents)
+    ]
+    return record_source_times(timed_results, file_contents, file_names)
+
+
+def record_source_times(
+    timed_results: list[
+        tuple[tuple[dict[str, list[tuple[str, str | CodeSpan]]] | str, str | None], float, bool]
+    ],
+    file_contents: list[str],
+    file_names: list[str] | None = None,
+) -> list[tuple[dict[str, list[tuple[str, str | CodeSpan]]] | str, str | None]]:
+    """
+    Record the time each file took to process and any cache use, if profiling is enabled.
+
+    Parameters
+    ----------
+    timed_results : list[tuple[tuple[...], float, bool]]
+        The results of time_file_comments for each file.
+    file_contents : list[str]
+        The contents of each file.
+    file_names : list[str] | None, optional
+        The name of each file, by default None, which names them by position.
+
+    Returns
+    -------
+    list[tuple[dict[str, list[tuple[str, str | CodeSpan]]] | str, str | None]]
+        The results, without their times.
+    """
+    profiler = get_profiler()
+    if profiler.enabled:
+        if file_names is None:
+            file_names = [f"file {index}" for index in range(1, len(file_contents) + 1)]
+
+        for file_name, file_content, (_, seconds, cache_hit) in zip(
+            file_names, file_contents, timed_results
+        ):
+            profiler.record_source(file_name, seconds, len(file_content.encode()))
+            if cache_hit:
+                profiler.increment("comment_cache_hits")
+
+    return [result for result, _, _ in timed_results]
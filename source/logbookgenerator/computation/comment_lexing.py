@@ -0,0 +1,247 @@
+"""comment_lexing.py: Contains a single pass lexer for the comments in C++ code."""
+
+import re
+from collections.abc import Iterable, Iterator
+from enum import Enum
+
+from ..config.constants import Constants
+from ..logs.tracing import get_tracer
+from . import logger
+
+logger = logger.getChild(__name__)
+tracer = get_tracer("lexing")
+
+
+class TokenKind(Enum):
+    """
+    The kinds of token emitted by the lexer.
+
+    Attributes
+    ----------
+    CODE : str
+        A span of code within a single line, including any string literals.
+    NEWLINE : str
+        The end of a line of code.
+    COMMENT : str
+        A comment, including its delimiters.
+    ANSWER : str
+        A comment whose text begins with Constants.ANSWER_KEYWORD.
+    """
+
+    CODE = "code"
+    NEWLINE = "newline"
+    COMMENT = "comment"
+    ANSWER = "answer"
+
+
+# Everything that can hide or start a comment, matched in a single pass
+TOKEN_PATTERN = re.compile(
+    r"""
+    (?P<line_comment>//[^\n]*)
+    | (?P<block_comment>/\*(?:.*?(?P<block_end>\*/)|.*))
+    | (?P<raw_string>
+        (?<!\w)(?:u8|[uUL])?R"(?P<delimiter>[^()\\\s]{0,16})\(
+        (?:.*?(?P<raw_end>\)(?P=delimiter)")|.*)
+    )
+    | (?P<string>(?<!\w)(?:u8|[uUL])?"(?:[^"\\\n]|\\[^\n])*")
+    | (?P<character>(?<!\w)(?:u8|[uUL])?'(?:[^'\\\n]|\\[^\n])*')
+    | (?P<newline>\n)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+ANSWER_PATTERN = re.compile(Constants.ANSWER_COMMENT_REGEX)
+DECORATION_PATTERN = re.compile(r"^[ \t]*[*/!]*[ \t]?")
+
+
+def classify_comment(comment: str) -> tuple[TokenKind, str]:
+    """
+    Classify a comment as an answer comment or an ordinary comment.
+
+    Parameters
+    ----------
+    comment : str
+        The comment, including its delimiters.
+
+    Returns
+    -------
+    tuple[TokenKind, str]
+        The comment's token.
+    """
+    if comment[2:].lstrip("*/! \t\n").startswith(Constants.ANSWER_KEYWORD):
+        return TokenKind.ANSWER, comment
+
+    return TokenKind.COMMENT, comment
+
+
+def split_code(code: str) -> Iterator[tuple[TokenKind, str]]:
+    """
+    Split code that may span several lines into code and newline tokens.
+
+    Parameters
+    ----------
+    code : str
+        The code.
+
+    Yields
+    ------
+    tuple[TokenKind, str]
+        The code and newline tokens.
+    """
+    for line_number, line in enumerate(code.split("\n")):
+        if line_number:
+            yield TokenKind.NEWLINE, "\n"
+        if line:
+            yield TokenKind.CODE, line
+
+
+def lex_code(code_chunks: Iterable[str]) -> Iterator[tuple[TokenKind, str]]:
+    """
+    Lex C++ code into code, newline and comment tokens.
+
+    Parameters
+    ----------
+    code_chunks : Iterable[str]
+        The code, either whole or in consecutive chunks such as lines. Each
+        chunk must keep its line endings.
+
+    Yields
+    ------
+    tuple[TokenKind, str]
+        The tokens, in the order they appear in the code.
+
+    Notes
+    -----
+    Each chunk is scanned once with the finditer of a precompiled pattern, so
+    the cost is linear in the size of the code, and a whole file can be lexed
+    as a single chunk. Comment delimiters within string, character and
+    raw string literals are treated as code, and comments may start anywhere
+    on a line. Block comments and raw strings may span several chunks, and an
+    unterminated block comment runs to the end of the code.
+    """
+    open_comment: list[str] | None = None
+    raw_string_end: str | None = None
+
+    for chunk in code_chunks:
+        position = 0
+
+        # Finish any block comment or raw string left open by the previous chunk
+        if open_comment is not None:
+            end = chunk.find(Constants.BLOCK_COMMENT_END)
+            if end == -1:
+                open_comment.append(chunk)
+                continue
+
+            position = end + len(Constants.BLOCK_COMMENT_END)
+            open_comment.append(chunk[:position])
+            yield classify_comment("".join(open_comment))
+            open_comment = None
+        elif raw_string_end is not None:
+            end = chunk.find(raw_string_end)
+            if end == -1:
+                yield from split_code(chunk)
+                continue
+
+            position = end + len(raw_string_end)
+            yield from split_code(chunk[:position])
+            raw_string_end = None
+
+        # Unterminated tokens run to the end of the chunk, so are always the last match
+        for match in TOKEN_PATTERN.finditer(chunk, position):
+            start = match.start()
+            if start > position:
+                yield TokenKind.CODE, chunk[position:start]
+            position = match.end()
+
+            if match.lastgroup == "newline":
+                yield TokenKind.NEWLINE, "\n"
+            elif match.lastgroup == "line_comment":
+                yield classify_comment(match.group())
+            elif match.lastgroup == "block_comment":
+                if match.group("block_end") is None:
+                    open_comment = [match.group()]
+                else:
+                    yield classify_comment(match.group())
+            elif match.lastgroup == "raw_string":
+                if match.group("raw_end") is None:
+                    raw_string_end = f"){match.group('delimiter')}\""
+                yield from split_code(match.group())
+            else:
+                yield TokenKind.CODE, match.group()
+
+        if position < len(chunk):
+            yield TokenKind.CODE, chunk[position:]
+
+    if open_comment is not None:
+        logger.warning(
+            "Block comment is not terminated, treating the rest of the code as a comment."
+        )
+        yield classify_comment("".join(open_comment))
+
+
+def parse_answer_comment(comment: str) -> tuple[str, str] | None:
+    """
+    Parse the identifier and content out of an answer comment.
+
+    Parameters
+    ----------
+    comment : str
+        The answer comment, including its delimiters.
+
+    Returns
+    -------
+    tuple[str, str] | None
+        The comment identifier and comment content, or None if the comment
+        does not have an identifier.
+
+    Notes
+    -----
+    The identifier is the text in parentheses after Constants.ANSWER_KEYWORD,
+    with spaces and full stops replaced by underscores. Text lines of the
+    content are joined with spaces, and fenced code blocks are kept as
+    separate paragraphs. Any leading "*" decoration is removed from each line.
+    """
+    body = comment[2:]
+    if comment.startswith(Constants.BLOCK_COMMENT_START) and body.endswith(
+        Constants.BLOCK_COMMENT_END
+    ):
+        body = body[: -len(Constants.BLOCK_COMMENT_END)]
+
+    comment_lines = [DECORATION_PATTERN.sub("", line, count=1) for line in body.split("\n")]
+    while comment_lines and not comment_lines[0].strip():
+        comment_lines.pop(0)
+
+    match = ANSWER_PATTERN.match(comment_lines[0].strip()) if comment_lines else None
+    if match is None:
+        tracer("Answer comment has no identifier: %s", comment)
+        return None
+
+    comment_id = match.group(1).strip().replace(" ", "_").replace(".", "_")
+
+    paragraphs: list[str] = []
+    text_parts: list[str] = [match.group(2).strip()]
+    code_lines: list[str] | None = None
+
+    for comment_line in comment_lines[1:]:
+        is_delimiter = comment_line.strip().startswith(Constants.CODE_COMMENT_DELIMITER)
+
+        if code_lines is not None:
+            if is_delimiter:
+                paragraphs.append("\n".join([*code_lines, Constants.CODE_COMMENT_DELIMITER]))
+                code_lines = None
+            else:
+                code_lines.append(comment_line.rstrip())
+        elif is_delimiter:
+            paragraphs.append(" ".join(part for part in text_parts if part))
+            text_parts = []
+            code_lines = [comment_line.strip()]
+        else:
+            text_parts.append(comment_line.strip())
+
+    if code_lines is not None:
+        paragraphs.append("\n".join([*code_lines, Constants.CODE_COMMENT_DELIMITER]))
+    paragraphs.append(" ".join(part for part in text_parts if part))
+
+    comment_content = "\n\n".join(paragraph for paragraph in paragraphs if paragraph)
+    tracer("Comment ID: %s, Comment content: %s", comment_id, comment_content)
+
+    return comment_id, comment_content
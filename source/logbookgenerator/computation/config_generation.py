@@ -3,8 +3,6 @@
 from os import getcwd
 from pathlib import Path
 
-import questionary
-
 from ..config.constants import Constants
 from ..utilities.validation import validate_date, validate_student_id, validate_year
 from . import logger
@@ -41,7 +39,11 @@ def build_config_file() -> Path:
         name: <university_name>
         start: <university_start>
     ```
+    questionary is only imported here, as it is slow to import and most runs
+    never need to prompt for a configuration file.
     """
+    import questionary
+
     print("No configuration file found, please provide the following information...")
 
     # Get user input
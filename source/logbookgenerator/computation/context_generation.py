@@ -1,16 +1,96 @@
 """context_generation.py: Contains the functions for generating the context for the logbook."""
 
+import re
 from datetime import datetime, timedelta
+from pathlib import Path
 from typing import Any
 
 from ..config.constants import Constants
+from ..logs.tracing import get_tracer
 from . import logger
-from .code_processing import process_code_comments
+from .code_processing import process_files_comments
+from .models import Answer, CodeSpan, CourseworkFile, Task, Week
 
 logger = logger.getChild(__name__)
+tracer = get_tracer("contexts")
 
 
-def generate_tasks_context(cpp_files: dict[str, str]) -> dict[str, Any]:
+def parse_start_date(config: dict[str, Any]) -> datetime:
+    """
+    Parse the start date of the university from the configuration.
+
+    Parameters
+    ----------
+    config : dict[str, Any]
+        The configuration file.
+
+    Returns
+    -------
+    datetime
+        The start date of the university.
+    """
+    start_date = datetime.strptime(
+        config["university"]["start"],
+        Constants.DATE_DATETIME_FORMAT,
+    )
+    logger.debug(f"Start date: {start_date}")
+
+    return start_date
+
+
+def calculate_week_dates(start_date: datetime, week_number: int) -> tuple[datetime, datetime]:
+    """
+    Calculate the start and end dates of a week.
+
+    Parameters
+    ----------
+    start_date : datetime
+        The start date of the university.
+    week_number : int
+        The week number, starting from 1.
+
+    Returns
+    -------
+    tuple[datetime, datetime]
+        The start and end dates of the week.
+    """
+    week_start_date = start_date + timedelta(weeks=week_number - 1)
+    week_end_date = week_start_date + timedelta(weeks=1)
+
+    return week_start_date, week_end_date
+
+
+def generate_answers(
+    task_comments: dict[str, list[tuple[str, str | CodeSpan]]] | str,
+) -> dict[str, list[Answer]]:
+    """
+    Generate the answers from the processed comments of a file.
+
+    Parameters
+    ----------
+    task_comments : dict[str, list[tuple[str, str | CodeSpan]]] | str
+        The task comments, or the code as a string, from process_file_comments.
+
+    Returns
+    -------
+    dict[str, list[Answer]]
+        The answers to each question, which is empty if the file has none.
+    """
+    if isinstance(task_comments, str):
+        return {}
+
+    return {
+        comment_id: [Answer(comment, code) for comment, code in answers]
+        for comment_id, answers in task_comments.items()
+    }
+
+
+def generate_tasks_context(
+    cpp_files: dict[str, str],
+    cache_directory: Path | None = None,
+    jobs: int = Constants.DEFAULT_JOBS,
+    task_comments: dict[str, Any] | None = None,
+) -> dict[str, dict[str, Task]]:
     """
     Generate the tasks context.
 
@@ -18,19 +98,35 @@ def generate_tasks_context(cpp_files: dict[str, str]) -> dict[str, Any]:
     ----------
     cpp_files : dict[str, str]
         The CPP files.
+    cache_directory : Path | None, optional
+        Path to the build cache directory, by default None, which disables caching.
+    jobs : int, optional
+        The maximum number of processes to use, by default Constants.DEFAULT_JOBS
+    task_comments : dict[str, Any] | None, optional
+        The already processed comments of each CPP file, by default None, which
+        processes the CPP files here.
 
     Returns
     -------
-    dict[str, Any]
-        The tasks context.
+    dict[str, dict[str, Task]]
+        The lab and extra tasks, keyed by "lab" and "extra", and then by task number.
     """
-    tasks_context: dict[str, Any] = {
+    tasks_context: dict[str, dict[str, Task]] = {
         "lab": {},
         "extra": {},
     }
 
+    if task_comments is None:
+        processed_files = process_files_comments(
+            list(cpp_files.values()), cache_directory=cache_directory, jobs=jobs
+        )
+        task_comments = {
+            file_name: processed_file[0]
+            for file_name, processed_file in zip(cpp_files, processed_files)
+        }
+
     # Iterate through the CPP files
-    for file_name, file_content in cpp_files.items():
+    for file_name in cpp_files:
         # Extract information from the file name
         logger.debug(f"Processing file: {file_name}")
         task_codeword, task_topic, task_name = file_name.split("-", maxsplit=2)
@@ -40,26 +136,28 @@ def generate_tasks_context(cpp_files: dict[str, str]) -> dict[str, Any]:
         task_number = task_codeword[1:]
         task_topic = task_topic.replace("_", " ").title()
         task_name = task_name.replace("_", " ").title()
-        logger.debug(
-            f"Task type: {task_type}, number: {task_number}, topic: {task_topic}, name: {task_name}"
+        tracer(
+            "Task type: %s, number: %s, topic: %s, name: %s",
+            task_type,
+            task_number,
+            task_topic,
+            task_name,
         )
 
-        # Process the file content
-        code_lines = file_content.splitlines()
-        task_code_explanations = process_code_comments(code_lines)[0]
-
-        tasks_context[task_type][task_number] = {
-            "topic": task_topic,
-            "name": task_name,
-            "code": task_code_explanations,
-        }
-        logger.debug(f"Task context: {tasks_context[task_type][task_number]}")
+        file_comments = task_comments[file_name]
+        tasks_context[task_type][task_number] = Task(
+            task_topic,
+            task_name,
+            generate_answers(file_comments),
+            file_comments if isinstance(file_comments, str) else "",
+        )
+        tracer("Task context: %s", tasks_context[task_type][task_number])
 
     # Sort the tasks by their number
     for task_type in tasks_context:
         tasks_context[task_type] = dict(sorted(tasks_context[task_type].items()))
 
-    logger.debug(f"Tasks context: {tasks_context}")
+    tracer("Tasks context: %s", tasks_context)
     return tasks_context
 
 
@@ -68,7 +166,10 @@ def generate_week_context(
     week_start_date: datetime,
     week_end_date: datetime,
     weekly_file: dict[str, dict[str, str] | str],
-) -> dict[str, Any]:
+    cache_directory: Path | None = None,
+    jobs: int = Constants.DEFAULT_JOBS,
+    task_comments: dict[str, Any] | None = None,
+) -> Week:
     """
     Generate the week context.
 
@@ -82,27 +183,134 @@ def generate_week_context(
         The end date of the week.
     weekly_file : dict[str, dict[str, str] | str]
         The weekly file, containing the CPP files and reflections.
+    cache_directory : Path | None, optional
+        Path to the build cache directory, by default None, which disables caching.
+    jobs : int, optional
+        The maximum number of processes to use, by default Constants.DEFAULT_JOBS
+    task_comments : dict[str, Any] | None, optional
+        The already processed comments of each CPP file, by default None, which
+        processes the CPP files here.
 
     Returns
     -------
-    dict[str, Any]
+    Week
         The week context.
     """
-    week_context: dict[str, Any] = {
-        "number": week_number,
-        "start_date": week_start_date.strftime(Constants.DATE_DATETIME_FORMAT),
-        "end_date": week_end_date.strftime(Constants.DATE_DATETIME_FORMAT),
-        "reflection": weekly_file["reflection"],
-        "tasks": generate_tasks_context(weekly_file["cpp"]),  # type: ignore
-    }
+    tasks_context = generate_tasks_context(
+        weekly_file["cpp"], cache_directory, jobs, task_comments  # type: ignore
+    )
+    week_context = Week(
+        week_number,
+        week_start_date.strftime(Constants.DATE_DATETIME_FORMAT),
+        week_end_date.strftime(Constants.DATE_DATETIME_FORMAT),
+        weekly_file["reflection"],  # type: ignore
+        tasks_context["lab"],
+        tasks_context["extra"],
+    )
 
-    logger.debug(f"Week {week_number} context: {week_context}")
+    tracer("Week %s context: %s", week_number, week_context)
     return week_context
 
 
+def process_weekly_files(
+    weekly_files: list[dict[str, dict[str, str] | str]],
+    cache_directory: Path | None = None,
+    jobs: int = Constants.DEFAULT_JOBS,
+    week_numbers: list[int] | None = None,
+) -> list[dict[str, tuple[dict[str, list[tuple[str, str | CodeSpan]]] | str, str | None]]]:
+    """
+    Process the CPP files of every week.
+
+    Parameters
+    ----------
+    weekly_files: list[dict[str, dict[str, str] | str]]
+        The weekly files, containing the CPP files and reflections.
+    cache_directory : Path | None, optional
+        Path to the build cache directory, by default None, which disables caching.
+    jobs : int, optional
+        The maximum number of processes to use, by default Constants.DEFAULT_JOBS
+    week_numbers : list[int] | None, optional
+        The number of each week, by default None, which numbers the weeks from
+        1. The files are named after their week when profiling.
+
+    Returns
+    -------
+    list[dict[str, tuple[dict[str, list[tuple[str, str | CodeSpan]]] | str, str | None]]]
+        The result of process_file_comments for each CPP file of each week.
+
+    Notes
+    -----
+    The CPP files of every week are processed together, so that they can be
+    spread over a single process pool. Coursework files have their comments
+    removed while they are processed, so the one result serves both the
+    week's tasks and the coursework.
+    """
+    weekly_cpp_files: list[dict[str, str]] = [
+        weekly_file["cpp"] for weekly_file in weekly_files  # type: ignore
+    ]
+    if week_numbers is None:
+        week_numbers = list(range(1, len(weekly_files) + 1))
+
+    processed_files = iter(
+        process_files_comments(
+            [file_content for cpp_files in weekly_cpp_files for file_content in cpp_files.values()],
+            remove_comments=[
+                re.match(Constants.COURSEWORK_REGEX, file_name) is not None
+                for cpp_files in weekly_cpp_files
+                for file_name in cpp_files
+            ],
+            cache_directory=cache_directory,
+            jobs=jobs,
+            file_names=[
+                f"Week {week_number}: {file_name}.cpp"
+                for week_number, cpp_files in zip(week_numbers, weekly_cpp_files)
+                for file_name in cpp_files
+            ],
+        )
+    )
+
+    return [
+        {file_name: next(processed_files) for file_name in cpp_files}
+        for cpp_files in weekly_cpp_files
+    ]
+
+
+def find_processed_coursework(
+    processed_weekly_files: list[
+        dict[str, tuple[dict[str, list[tuple[str, str | CodeSpan]]] | str, str | None]]
+    ],
+) -> dict[str, tuple[dict[str, list[tuple[str, str | CodeSpan]]] | str, str | None]]:
+    """
+    Find the processed coursework files amongst the processed CPP files.
+
+    Parameters
+    ----------
+    processed_weekly_files : list[dict[str, tuple[...]]]
+        The processed CPP files of each week, from process_weekly_files.
+
+    Returns
+    -------
+    dict[str, tuple[dict[str, list[tuple[str, str | CodeSpan]]] | str, str | None]]
+        The processed coursework files, keyed by their coursework name.
+    """
+    return {
+        match.group(1): processed_file
+        for processed_files in processed_weekly_files
+        for file_name, processed_file in processed_files.items()
+        if (match := re.match(Constants.COURSEWORK_REGEX, file_name))
+    }
+
+
 def generate_weeks_context(
-    weekly_files: list[dict[str, dict[str, str] | str]], start_date: datetime
-) -> dict[str, Any]:
+    weekly_files: list[dict[str, dict[str, str] | str]],
+    start_date: datetime,
+    cache_directory: Path | None = None,
+    jobs: int = Constants.DEFAULT_JOBS,
+    processed_weekly_files: (
+        list[dict[str, tuple[dict[str, list[tuple[str, str | CodeSpan]]] | str, str | None]]] | None
+    ) = None,
+    week_numbers: list[int] | None = None,
+) -> dict[str, Week]:
     """
     Generate the weeks context.
 
@@ -112,25 +320,46 @@ def generate_weeks_context(
         The weekly files, containing the CPP files and reflections.
     start_date : datetime
         The start date of the university.
+    cache_directory : Path | None, optional
+        Path to the build cache directory, by default None, which disables caching.
+    jobs : int, optional
+        The maximum number of processes to use, by default Constants.DEFAULT_JOBS
+    processed_weekly_files : list[dict[str, tuple[...]]] | None, optional
+        The processed CPP files of each week, by default None, which processes
+        them here with process_weekly_files.
+    week_numbers : list[int] | None, optional
+        The number of each week, by default None, which numbers the weeks from 1.
 
     Returns
     -------
-    dict[str, Any]
-        The weeks context.
+    dict[str, Week]
+        The weeks, keyed by week number.
     """
-    weeks_context: dict[str, Any] = {}
-    numbered_weekly_files = enumerate(weekly_files, start=1)
-    logger.debug(f"Numbered weekly files: {numbered_weekly_files}")
-
-    for week_number, weekly_file in numbered_weekly_files:
-        week_start_date = start_date + timedelta(weeks=week_number - 1)
-        week_end_date = week_start_date + timedelta(weeks=1)
+    weeks_context: dict[str, Week] = {}
+    if processed_weekly_files is None:
+        processed_weekly_files = process_weekly_files(weekly_files, cache_directory, jobs)
+
+    if week_numbers is None:
+        week_numbers = list(range(1, len(weekly_files) + 1))
+
+    numbered_weekly_files = zip(week_numbers, weekly_files)
+    tracer("Numbered weekly files: %s", numbered_weekly_files)
+
+    for (week_number, weekly_file), processed_files in zip(
+        numbered_weekly_files, processed_weekly_files
+    ):
+        week_start_date, week_end_date = calculate_week_dates(start_date, week_number)
+        task_comments = {
+            file_name: processed_file[0] for file_name, processed_file in processed_files.items()
+        }
 
         week_context = generate_week_context(
             week_number,
             week_start_date,
             week_end_date,
             weekly_file,
+            cache_directory,
+            task_comments=task_comments,
         )
 
         weeks_context[str(week_number)] = week_context
@@ -139,8 +368,13 @@ def generate_weeks_context(
 
 
 def generate_coursework_context(
-    coursework_files: dict[str, str]
-) -> tuple[dict[str, Any], dict[str, str]]:
+    coursework_files: dict[str, str],
+    cache_directory: Path | None = None,
+    jobs: int = Constants.DEFAULT_JOBS,
+    processed_coursework: (
+        dict[str, tuple[dict[str, list[tuple[str, str | CodeSpan]]] | str, str | None]] | None
+    ) = None,
+) -> tuple[dict[str, CourseworkFile], dict[str, str]]:
     """
     Generate the coursework context.
 
@@ -148,41 +382,54 @@ def generate_coursework_context(
     ----------
     coursework_files: dict[str, str]
         The coursework files.
+    cache_directory : Path | None, optional
+        Path to the build cache directory, by default None, which disables caching.
+    jobs : int, optional
+        The maximum number of processes to use, by default Constants.DEFAULT_JOBS
+    processed_coursework : dict[str, tuple[...]] | None, optional
+        Coursework files already processed with their comments removed, such as
+        by process_weekly_files, by default None. Any other files are processed here.
 
     Returns
     -------
-    tuple[dict[str, Any], dict[str, str]]
-        The coursework context and clean codes.
+    tuple[dict[str, CourseworkFile], dict[str, str]]
+        The coursework files and their clean codes, keyed by coursework name.
 
     Notes
     -----
     The clean code is the code without any comments.
-    The coursework context is a dictionary in the form:
-    {
-        "file_name": {
-            "task_{task_number}_{subtask_number}": [
-                ("The comment", "The associated code"),
-                ...
-            ],
-            ...
-        },
-        ...
-    }
     """
-    coursework_context: dict[str, Any] = {}
+    coursework_context: dict[str, CourseworkFile] = {}
     clean_codes: dict[str, str] = {}
 
-    for file_name, file_code in coursework_files.items():
-        logger.debug(f"Processing coursework file: {file_name}.")
+    processed_files = dict(processed_coursework or {})
 
-        coursework_context[file_name], clean_codes[file_name] = (
-            process_code_comments(  # type: ignore
-                file_code.splitlines(),
+    unprocessed_files = {
+        file_name: file_code
+        for file_name, file_code in coursework_files.items()
+        if file_name not in processed_files
+    }
+    processed_files.update(
+        zip(
+            unprocessed_files,
+            process_files_comments(
+                list(unprocessed_files.values()),
                 remove_comments=True,
-            )
+                cache_directory=cache_directory,
+                jobs=jobs,
+                file_names=[f"Coursework: {file_name}" for file_name in unprocessed_files],
+            ),
         )
-        logger.debug(f"Coursework context: {coursework_context[file_name]}")
-        logger.debug(f"Clean code: {clean_codes[file_name]}")
+    )
+
+    for file_name in coursework_files:
+        logger.debug(f"Processing coursework file: {file_name}.")
+
+        task_comments, clean_code = processed_files[file_name]
+        coursework_context[file_name] = CourseworkFile(file_name, generate_answers(task_comments))
+        clean_codes[file_name] = clean_code  # type: ignore
+        tracer("Coursework context: %s", coursework_context[file_name])
+        tracer("Clean code: %s", clean_codes[file_name])
 
     return coursework_context, clean_codes
 
@@ -192,7 +439,10 @@ def generate_logbook_contexts(
     weekly_files: list[dict[str, dict[str, str] | str]],
     coursework_files: dict[str, str],
     references: list[dict[str, str]],
-) -> tuple[dict[str, Any], dict[str, Any] | None, dict[str, str] | None]:
+    cache_directory: Path | None = None,
+    jobs: int = Constants.DEFAULT_JOBS,
+    week_numbers: list[int] | None = None,
+) -> tuple[dict[str, Any], dict[str, CourseworkFile] | None, dict[str, str] | None]:
     """
     Generate the contexts for the logbook.
 
@@ -206,32 +456,44 @@ def generate_logbook_contexts(
         The coursework files.
     references : list[dict[str, str]]
         The references.
+    cache_directory : Path | None, optional
+        Path to the build cache directory, by default None, which disables caching.
+    jobs : int, optional
+        The maximum number of processes to use, by default Constants.DEFAULT_JOBS
+    week_numbers : list[int] | None, optional
+        The number of each week, by default None, which numbers the weeks from 1.
 
     Returns
     -------
-    tuple[dict[str, Any], dict[str, Any] | None, dict[str, str] | None]
+    tuple[dict[str, Any], dict[str, CourseworkFile] | None, dict[str, str] | None]
         The logbook contexts, coursework context, and clean coursework code.
     """
     logbook_contexts: dict[str, Any] = {}
+    coursework_context: dict[str, CourseworkFile] | None = None
+    clean_coursework_code: dict[str, str] | None = None
 
     logbook_contexts["cover"] = config
-    logger.debug(f"Cover context: {logbook_contexts["cover"]}")
+    tracer("Cover context: %s", logbook_contexts["cover"])
 
-    start_date = datetime.strptime(
-        config["university"]["start"],
-        Constants.DATE_DATETIME_FORMAT,
+    start_date = parse_start_date(config)
+    processed_weekly_files = process_weekly_files(weekly_files, cache_directory, jobs, week_numbers)
+    logbook_contexts["weeks"] = generate_weeks_context(
+        weekly_files, start_date, cache_directory, jobs, processed_weekly_files, week_numbers
     )
-    logger.debug(f"Start date: {start_date}")
-    logbook_contexts["weeks"] = generate_weeks_context(weekly_files, start_date)
-    logger.debug(f"Weeks context: {logbook_contexts["weeks"]}")
+    tracer("Weeks context: %s", logbook_contexts["weeks"])
 
     if coursework_files:
         logger.debug("Generating coursework context...")
-        coursework_context, clean_coursework_code = generate_coursework_context(coursework_files)
-        logger.debug(f"Coursework context: {coursework_context}")
+        coursework_context, clean_coursework_code = generate_coursework_context(
+            coursework_files,
+            cache_directory,
+            jobs,
+            find_processed_coursework(processed_weekly_files),
+        )
+        tracer("Coursework context: %s", coursework_context)
 
     logbook_contexts["references"] = references
-    logger.debug(f"References context: {logbook_contexts["references"]}")
+    tracer("References context: %s", logbook_contexts["references"])
 
     return (
         logbook_contexts,
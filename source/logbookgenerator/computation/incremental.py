@@ -0,0 +1,249 @@
+"""incremental.py: Contains the logic for rebuilding only the parts of a logbook that changed."""
+
+from pathlib import Path
+from typing import Any
+
+from ..config.constants import Constants
+from ..utilities.file_handling import load_yaml
+from ..utilities.scanning import scan_input_directory
+from . import logger
+from .context_generation import (
+    calculate_week_dates,
+    find_processed_coursework,
+    generate_coursework_context,
+    generate_week_context,
+    parse_start_date,
+    process_weekly_files,
+)
+from .models import CourseworkFile, Week
+from .parsing import (
+    find_coursework_files,
+    find_week_directories,
+    parse_weekly_directories,
+)
+from .render_context import (
+    create_coursework,
+    create_logbook,
+    render_coursework_files,
+    render_weeks,
+)
+
+logger = logger.getChild(__name__)
+
+
+class IncrementalBuild:
+    """
+    A logbook build that keeps its intermediate results between rebuilds.
+
+    Parameters
+    ----------
+    config : dict[str, Any]
+        The configuration file.
+    input_directory : Path
+        Path to the input directory.
+    jobs : int, optional
+        The maximum number of files to read and process, and sections to
+        render, at once, by default Constants.DEFAULT_JOBS
+    cache_directory : Path | None, optional
+        Path to the build cache directory, by default None, which disables caching.
+
+    Notes
+    -----
+    The first call to build does a full build. Later calls are given the
+    paths that changed since the previous build, and only re-parse, re-process
+    and re-render the weeks and coursework files affected by those paths. The
+    rendered markdown of every other week is spliced in from the previous build.
+    """
+
+    def __init__(
+        self,
+        config: dict[str, Any],
+        input_directory: Path,
+        jobs: int = Constants.DEFAULT_JOBS,
+        cache_directory: Path | None = None,
+    ) -> None:
+        self.config = config
+        self.input_directory = input_directory
+        self.jobs = jobs
+        self.cache_directory = cache_directory
+
+        self.week_names: list[str] = []
+        self.weekly_files: dict[str, dict[str, dict[str, str] | str]] = {}
+        self.references: list[dict[str, str]] = []
+        self.weeks_context: dict[str, Week] = {}
+        self.rendered_weeks: dict[str, str] = {}
+        self.coursework_files: dict[str, str] = {}
+        self.coursework_context: dict[str, CourseworkFile] = {}
+        self.clean_code: dict[str, str] = {}
+        self.rendered_coursework: dict[str, str] = {}
+
+    def reset(self) -> None:
+        """Forget the previous build, so that the next build is a full build."""
+        self.week_names = []
+
+    def find_affected_weeks(
+        self, week_names: list[str], changed_paths: set[Path] | None
+    ) -> set[str]:
+        """
+        Find the weeks that need to be rebuilt.
+
+        Parameters
+        ----------
+        week_names : list[str]
+            The names of the week directories that currently exist.
+        changed_paths : set[Path] | None
+            The paths that changed since the previous build, or None for a full build.
+
+        Returns
+        -------
+        set[str]
+            The names of the week directories to rebuild.
+        """
+        if changed_paths is None or week_names != self.week_names:
+            logger.debug("Week directories changed, rebuilding every week.")
+            return set(week_names)
+
+        affected_weeks: set[str] = set()
+        for changed_path in changed_paths:
+            try:
+                relative_path = changed_path.resolve().relative_to(self.input_directory.resolve())
+            except ValueError:
+                continue
+
+            if relative_path.parts and relative_path.parts[0] in week_names:
+                affected_weeks.add(relative_path.parts[0])
+
+        logger.debug(f"Weeks affected by the changes: {sorted(affected_weeks)}")
+        return affected_weeks
+
+    def build(
+        self, changed_paths: set[Path] | None = None
+    ) -> tuple[str, str | None, dict[str, str] | None] | None:
+        """
+        Build the logbook, reusing as much of the previous build as possible.
+
+        Parameters
+        ----------
+        changed_paths : set[Path] | None, optional
+            The paths that changed since the previous build, by default None,
+            which does a full build.
+
+        Returns
+        -------
+        tuple[str, str | None, dict[str, str] | None] | None
+            The logbook markdown, coursework markdown, and clean coursework code,
+            or None if none of the changes affect the logbook.
+        """
+        manifest = scan_input_directory(self.input_directory)
+        week_names = find_week_directories(self.input_directory, manifest)
+        affected_weeks = self.find_affected_weeks(week_names, changed_paths)
+
+        references_path = self.input_directory / "references.yaml"
+        references_changed = changed_paths is None or week_names != self.week_names
+        references_changed |= any(
+            changed_path.resolve() == references_path.resolve()
+            for changed_path in changed_paths or set()
+        )
+
+        if not affected_weeks and not references_changed:
+            logger.debug("No changes affect the logbook.")
+            return None
+
+        if references_changed:
+            logger.debug(f"Reading references from {references_path}")
+            self.references = load_yaml(references_path)["references"]
+
+        # Re-parse, re-process and re-render only the affected weeks
+        ordered_affected_weeks = [week for week in week_names if week in affected_weeks]
+        weekly_files, _ = parse_weekly_directories(
+            self.input_directory, jobs=self.jobs, weeks=ordered_affected_weeks, manifest=manifest
+        )
+
+        start_date = parse_start_date(self.config)
+        processed_weekly_files = process_weekly_files(weekly_files, self.cache_directory, self.jobs)
+        changed_coursework: set[str] = set()
+        affected_weeks_context: dict[str, Week] = {}
+        for week_name, week_files, processed_files in zip(
+            ordered_affected_weeks, weekly_files, processed_weekly_files
+        ):
+            week_number = week_names.index(week_name) + 1
+            week_start_date, week_end_date = calculate_week_dates(start_date, week_number)
+
+            self.weekly_files[week_name] = week_files
+            week_context = generate_week_context(
+                week_number,
+                week_start_date,
+                week_end_date,
+                week_files,
+                self.cache_directory,
+                task_comments={
+                    file_name: processed_file[0]
+                    for file_name, processed_file in processed_files.items()
+                },
+            )
+            affected_weeks_context[str(week_number)] = week_context
+            changed_coursework.update(find_coursework_files(week_files["cpp"]))  # type: ignore
+
+        self.weeks_context.update(affected_weeks_context)
+        self.rendered_weeks.update(
+            render_weeks(affected_weeks_context, self.cache_directory, self.jobs)
+        )
+
+        # Forget any weeks that no longer exist
+        self.week_names = week_names
+        self.weekly_files = {week: self.weekly_files[week] for week in week_names}
+        week_keys = [str(week_number) for week_number in range(1, len(week_names) + 1)]
+        self.weeks_context = {key: self.weeks_context[key] for key in week_keys}
+        self.rendered_weeks = {key: self.rendered_weeks[key] for key in week_keys}
+
+        # Re-process and re-render only the changed coursework files
+        coursework_files: dict[str, str] = {}
+        for week_files in self.weekly_files.values():
+            coursework_files.update(find_coursework_files(week_files["cpp"]))  # type: ignore
+
+        changed_coursework_files = {
+            file_name: file_code
+            for file_name, file_code in coursework_files.items()
+            if file_name in changed_coursework or file_name not in self.coursework_context
+        }
+        if changed_coursework_files:
+            coursework_context, clean_code = generate_coursework_context(
+                changed_coursework_files,
+                self.cache_directory,
+                self.jobs,
+                find_processed_coursework(processed_weekly_files),
+            )
+            self.coursework_context.update(coursework_context)
+            self.clean_code.update(clean_code)
+            self.rendered_coursework.update(
+                render_coursework_files(coursework_context, self.cache_directory, self.jobs)
+            )
+
+        self.coursework_files = coursework_files
+        self.coursework_context = {name: self.coursework_context[name] for name in coursework_files}
+        self.clean_code = {name: self.clean_code[name] for name in coursework_files}
+        self.rendered_coursework = {
+            name: self.rendered_coursework[name] for name in coursework_files
+        }
+
+        # Splice the rendered sections back together
+        logbook_markdown = create_logbook(
+            {
+                "cover": self.config,
+                "weeks": self.weeks_context,
+                "references": self.references,
+            },
+            rendered_weeks=self.rendered_weeks,
+            cache_directory=self.cache_directory,
+        )
+        coursework_markdown = (
+            create_coursework(
+                self.coursework_context,
+                rendered_files=self.rendered_coursework,
+                cache_directory=self.cache_directory,
+            )
+            if self.coursework_context
+            else None
+        )
+
+        return logbook_markdown, coursework_markdown, self.clean_code or None
@@ -0,0 +1,214 @@
+"""models.py: Contains the data model of the logbook, which the templates are rendered from."""
+
+from dataclasses import dataclass, field
+
+from . import logger
+
+logger = logger.getChild(__name__)
+
+
+class CodeSpan:
+    """
+    The code of an answer, as a span of the buffer it was lexed from.
+
+    Attributes
+    ----------
+    code : str
+        The whole buffer of code that the span lies within.
+    start : int
+        The offset the span starts at, just after the previous comment.
+    end : int
+        The offset the span ends at, just before the answer comment.
+    after_comment : bool
+        Whether the span starts just after a comment, rather than at the start
+        of the code.
+
+    Notes
+    -----
+    The span holds no comments, so the answer's code is just the span's lines
+    with their indentation removed, leaving out a first line that only
+    followed the previous comment and a last line that only precedes the
+    answer comment. The string is only built when it is needed, such as when
+    a template renders it, and a span compares equal to that string.
+    """
+
+    __slots__ = ("code", "start", "end", "after_comment")
+
+    def __init__(self, code: str, start: int, end: int, after_comment: bool) -> None:
+        """
+        Initialise the span.
+
+        Parameters
+        ----------
+        code : str
+            The whole buffer of code that the span lies within.
+        start : int
+            The offset the span starts at.
+        end : int
+            The offset the span ends at.
+        after_comment : bool
+            Whether the span starts just after a comment.
+        """
+        self.code = code
+        self.start = start
+        self.end = end
+        self.after_comment = after_comment
+
+    def lines(self) -> list[str]:
+        """
+        Split the span into the lines of the answer's code.
+
+        Returns
+        -------
+        list[str]
+            The lines, with their indentation removed.
+        """
+        start, end = self.start, self.end
+        span_lines = [line.strip() for line in self.code[start:end].split("\n")]
+
+        if not span_lines[-1]:
+            span_lines.pop()
+        if self.after_comment and span_lines and not span_lines[0]:
+            span_lines.pop(0)
+
+        return span_lines
+
+    def __str__(self) -> str:
+        """
+        Build the answer's code.
+
+        Returns
+        -------
+        str
+            The lines of the span, joined by newlines.
+        """
+        return "\n".join(self.lines())
+
+    def __repr__(self) -> str:
+        """
+        Represent the span by the answer's code.
+
+        Returns
+        -------
+        str
+            The representation of the answer's code.
+        """
+        return repr(str(self))
+
+    def __eq__(self, other: object) -> bool:
+        """
+        Compare the span with another span or a string, by the answer's code.
+
+        Parameters
+        ----------
+        other : object
+            The span or string to compare with.
+
+        Returns
+        -------
+        bool
+            Whether the answer's code is the same.
+        """
+        if isinstance(other, (CodeSpan, str)):
+            return str(self) == str(other)
+
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        """
+        Hash the span by the answer's code.
+
+        Returns
+        -------
+        int
+            The hash of the answer's code.
+        """
+        return hash(str(self))
+
+
+@dataclass(frozen=True, slots=True)
+class Answer:
+    """
+    An answer comment and the code it explains.
+
+    Attributes
+    ----------
+    text : str
+        The content of the answer comment.
+    code : str | CodeSpan
+        The code associated with the answer comment, which is rendered as a string.
+    """
+
+    text: str
+    code: str | CodeSpan
+
+
+@dataclass(slots=True)
+class Task:
+    """
+    A lab or extra task, made from a single CPP file.
+
+    Attributes
+    ----------
+    topic : str
+        The topic of the task.
+    name : str
+        The name of the task.
+    answers : dict[str, list[Answer]]
+        The answers to each question of the task, keyed by question identifier,
+        such as "Task_1_1".
+    code : str
+        The code of the task, which is shown instead if it has no answers.
+    """
+
+    topic: str
+    name: str
+    answers: dict[str, list[Answer]] = field(default_factory=dict)
+    code: str = ""
+
+
+@dataclass(slots=True)
+class Week:
+    """
+    A week of the logbook.
+
+    Attributes
+    ----------
+    number : int
+        The week number, starting from 1.
+    start_date : str
+        The formatted start date of the week.
+    end_date : str
+        The formatted end date of the week.
+    reflection : str
+        The reflection on the week.
+    lab_tasks : dict[str, Task]
+        The lab tasks, keyed and sorted by task number.
+    extra_tasks : dict[str, Task]
+        The extra tasks, keyed and sorted by task number.
+    """
+
+    number: int
+    start_date: str
+    end_date: str
+    reflection: str
+    lab_tasks: dict[str, Task] = field(default_factory=dict)
+    extra_tasks: dict[str, Task] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class CourseworkFile:
+    """
+    A coursework file.
+
+    Attributes
+    ----------
+    name : str
+        The name of the coursework.
+    answers : dict[str, list[Answer]]
+        The answers to each question of the coursework, keyed by question
+        identifier, such as "Task_1_1".
+    """
+
+    name: str
+    answers: dict[str, list[Answer]] = field(default_factory=dict)
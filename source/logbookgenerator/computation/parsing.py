@@ -2,17 +2,163 @@
 
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from ..config.constants import Constants
+from ..logs.tracing import get_tracer
 from ..utilities.file_handling import load_yaml
+from ..utilities.scanning import InputManifest
 from . import logger
 
 logger = logger.getChild(__name__)
+tracer = get_tracer("parsing")
+
+
+def read_file(file_path: Path) -> str:
+    """
+    Read the contents of a file.
+
+    Parameters
+    ----------
+    file_path : Path
+        Path to the file.
+
+    Returns
+    -------
+    str
+        The contents of the file.
+    """
+    with open(file_path) as file:
+        file_contents = file.read()
+
+    tracer("Read file %s", file_path)
+    return file_contents
+
+
+def read_files(file_paths: list[Path], jobs: int = Constants.DEFAULT_JOBS) -> dict[Path, str]:
+    """
+    Read the contents of several files, optionally in parallel.
+
+    Parameters
+    ----------
+    file_paths : list[Path]
+        Paths to the files.
+    jobs : int, optional
+        The maximum number of files to read at once, by default Constants.DEFAULT_JOBS
+
+    Returns
+    -------
+    dict[Path, str]
+        The contents of each file, in the same order as the given paths.
+
+    Notes
+    -----
+    Reading is I/O bound, so a thread pool is enough to overlap the reads,
+    which matters most on network-mounted input directories.
+    """
+    if jobs <= 1 or len(file_paths) <= 1:
+        return {file_path: read_file(file_path) for file_path in file_paths}
+
+    logger.debug(f"Reading {len(file_paths)} files with {jobs} threads")
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        return dict(zip(file_paths, executor.map(read_file, file_paths)))
+
+
+def find_week_directories(
+    input_directory: Path, manifest: InputManifest | None = None
+) -> list[str]:
+    """
+    Find the week directories within the input directory.
+
+    Parameters
+    ----------
+    input_directory : Path
+        Path to the input directory.
+    manifest : InputManifest | None, optional
+        A manifest of the input directory, by default None, which lists the
+        input directory instead.
+
+    Returns
+    -------
+    list[str]
+        The names of the week directories, organised chronologically.
+    """
+    if manifest is not None:
+        return list(manifest.weeks)
+
+    weeks = sorted(
+        [
+            directory
+            for directory in os.listdir(input_directory)
+            if directory.startswith("week") and (input_directory / directory).is_dir()
+        ]
+    )
+    logger.debug(f"Weeks found: {weeks}")
+
+    return weeks
+
+
+def select_week_directories(week_directories: list[str], week_numbers: list[int]) -> list[str]:
+    """
+    Select the week directories with the given week numbers.
+
+    Parameters
+    ----------
+    week_directories : list[str]
+        The names of every week directory, organised chronologically.
+    week_numbers : list[int]
+        The week numbers to select, starting from 1, in chronological order.
+
+    Returns
+    -------
+    list[str]
+        The names of the selected week directories.
+
+    Raises
+    ------
+    ValueError
+        If there is no week directory for one of the week numbers.
+    """
+    missing_weeks = [str(number) for number in week_numbers if number > len(week_directories)]
+    if missing_weeks:
+        raise ValueError(
+            f"There is no week {', '.join(missing_weeks)}, "
+            f"as there are only {len(week_directories)} weeks."
+        )
+
+    return [week_directories[number - 1] for number in week_numbers]
+
+
+def find_coursework_files(cpp_files: dict[str, str]) -> dict[str, str]:
+    """
+    Find the coursework files amongst a week's CPP files.
+
+    Parameters
+    ----------
+    cpp_files : dict[str, str]
+        The CPP files, keyed by their file name without the extension.
+
+    Returns
+    -------
+    dict[str, str]
+        The coursework files, keyed by their coursework name.
+    """
+    coursework_files: dict[str, str] = {}
+
+    for file_name, file_contents in cpp_files.items():
+        if match := re.match(Constants.COURSEWORK_REGEX, file_name):
+            coursework_files[match.group(1)] = file_contents
+            logger.debug(f"Added file {file_name} to coursework")
+
+    return coursework_files
 
 
 def parse_weekly_directories(
     input_directory: Path,
+    jobs: int = Constants.DEFAULT_JOBS,
+    weeks: list[str] | None = None,
+    manifest: InputManifest | None = None,
 ) -> tuple[list[dict[str, dict[str, str] | str]], dict[str, str]]:
     """
     Parse the weeks directory.
@@ -21,6 +167,14 @@ def parse_weekly_directories(
     ----------
     input_directory : Path
         Path to the input directory.
+    jobs : int, optional
+        The maximum number of files to read at once, by default Constants.DEFAULT_JOBS
+    weeks : list[str] | None, optional
+        The names of the week directories to parse, by default None, which parses
+        every week directory.
+    manifest : InputManifest | None, optional
+        A manifest of the input directory, by default None, which lists the
+        directories instead.
 
     Returns
     -------
@@ -29,49 +183,58 @@ def parse_weekly_directories(
         where each week has keys "cpp" and "reflection", each containing a
         dictionary of files or a string respectively.
         Also returns the coursework files.
+
+    Notes
+    -----
+    All of the file paths are collected before any file is read, so that the
+    reads can happen concurrently whilst the results are still assembled in
+    the same order as a serial run.
     """
     weeks_files: list[dict[str, dict[str, str] | str]] = []
     coursework_files: dict[str, str] = {}
 
     # Get the weeks, organised chronologically so that the dictionary is ordered
-    weeks = sorted(
+    if weeks is None:
+        weeks = find_week_directories(input_directory, manifest)
+
+    # Find the files to read for each week
+    week_paths: dict[Path, list[Path]] = {}
+    for week in weeks:
+        week_path = input_directory / week
+        week_paths[week_path] = (
+            [entry.path for entry in manifest.week_cpp_files(week)]
+            if manifest is not None
+            else list(week_path.glob("*.cpp"))
+        )
+
+    # Read all of the files at once
+    file_contents = read_files(
         [
-            directory
-            for directory in os.listdir(input_directory)
-            if directory.startswith("week") and (input_directory / directory).is_dir()
-        ]
+            file_path
+            for week_path, cpp_paths in week_paths.items()
+            for file_path in [*cpp_paths, week_path / "reflection.md"]
+        ],
+        jobs=jobs,
     )
-    logger.debug(f"Weeks found: {weeks}")
 
-    for week in weeks:
+    for week_path, cpp_paths in week_paths.items():
         week_files: dict[str, dict[str, str] | str] = {
             "cpp": {},
             "reflection": "",
         }
-        week_path = input_directory / week
         logger.debug(f"Reading week from {week_path}")
 
         # Parse CPP files
-        for file_path in week_path.glob("*.cpp"):
-            with open(file_path) as file:
-                file_contents = file.read()
-                logger.debug(f"Read file {file_path}")
-
-                # Add the file to the week
-                week_files["cpp"][file_path.stem] = file_contents  # type: ignore
-                logger.debug(f"Added file {file_path} to week")
+        for file_path in cpp_paths:
+            # Add the file to the week
+            week_files["cpp"][file_path.stem] = file_contents[file_path]  # type: ignore
+            tracer("Added file %s to week", file_path)
 
-                # Check if the file is coursework
-                if match := re.match(Constants.COURSEWORK_REGEX, file_path.stem):
-                    # Add the coursework file to the list
-                    coursework_files[match.group(1)] = file_contents
-                    logger.debug(f"Added file {file_path} to coursework")
+        # Check for coursework files
+        coursework_files.update(find_coursework_files(week_files["cpp"]))  # type: ignore
 
         # Parse reflection
-        reflection_path = week_path / "reflection.md"
-        with open(reflection_path) as file:
-            week_files["reflection"] = file.read()
-            logger.debug(f"Read reflection {reflection_path}")
+        week_files["reflection"] = file_contents[week_path / "reflection.md"]
 
         # Add the week to the list
         weeks_files.append(week_files)
@@ -81,6 +244,9 @@ def parse_weekly_directories(
 
 def parse_input_directory(
     input_directory: Path,
+    jobs: int = Constants.DEFAULT_JOBS,
+    manifest: InputManifest | None = None,
+    week_numbers: list[int] | None = None,
 ) -> tuple[list[dict[str, dict[str, str] | str]], dict[str, str], list[dict[str, str]]]:
     """
     Parse the input directory.
@@ -89,21 +255,42 @@ def parse_input_directory(
     ----------
     input_directory : Path
         Path to the input directory.
+    jobs : int, optional
+        The maximum number of files to read at once, by default Constants.DEFAULT_JOBS
+    manifest : InputManifest | None, optional
+        A manifest of the input directory, by default None, which lists the
+        directories instead.
+    week_numbers : list[int] | None, optional
+        The numbers of the weeks to parse, in chronological order, by default
+        None, which parses every week. The other weeks are never read.
 
     Returns
     -------
     tuple[list[dict[str, dict[str, str] | str]], dict[str, str], list[dict[str, str]]]
         The weekly files (code and reflections), coursework files, and references.
+
+    Raises
+    ------
+    ValueError
+        If there is no week directory for one of the week numbers.
     """
     logger.debug(f"Reading weeks from {input_directory}")
-    weeks, coursework = parse_weekly_directories(input_directory)
-    logger.debug(f"Read weeks: {weeks}")
-    logger.debug(f"Read coursework: {coursework}")
+    week_directories = None
+    if week_numbers is not None:
+        week_directories = select_week_directories(
+            find_week_directories(input_directory, manifest), week_numbers
+        )
+
+    weeks, coursework = parse_weekly_directories(
+        input_directory, jobs=jobs, weeks=week_directories, manifest=manifest
+    )
+    tracer("Read weeks: %s", weeks)
+    tracer("Read coursework: %s", coursework)
 
     references_path = input_directory / "references.yaml"
     logger.debug(f"Reading references from {references_path}")
     references_dictionary = load_yaml(references_path)
     references = references_dictionary["references"]
-    logger.debug(f"Read references: {references}")
+    tracer("Read references: %s", references)
 
     return weeks, coursework, references
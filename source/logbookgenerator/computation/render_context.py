@@ -1,31 +1,130 @@
 """render_context.py: Contains the logic for rendering the context into a logbook."""
 
+from collections.abc import Iterable, Iterator
+from functools import partial
+from math import ceil
 from pathlib import Path
-from typing import Any
-
-import jinja2
+from typing import TYPE_CHECKING, Any
 
+from ..config.constants import Constants
 from ..config.paths import Paths
+from ..logs.profiling import get_profiler
+from ..logs.tracing import get_tracer
+from ..utilities.caching import (
+    cache_key,
+    disable_cache_directory,
+    fingerprint,
+    load_cache_entry,
+    save_cache_entry,
+)
 from . import logger
+from .models import CourseworkFile, Week
+
+if TYPE_CHECKING:
+    import jinja2
 
 logger = logger.getChild(__name__)
+tracer = get_tracer("rendering")
+
+_template_environment: "jinja2.Environment | None" = None
+_template_sources: dict[str, str] = {}
 
 
-def render_template(template_path: Path, context: dict[str, Any]) -> str:
+def setup_template_environment(cache_directory: Path | None = None) -> "jinja2.Environment":
     """
-    Render the template with the context.
+    Setup the template environment shared by every render in this process.
 
     Parameters
     ----------
-    template_path : Path
-        Path to the template.
-    context : dict[str, Any]
-        Context to render the template.
+    cache_directory : Path | None, optional
+        Path to the build cache directory, in which the compiled templates are
+        kept between runs, by default None, which only keeps them in memory.
 
     Returns
     -------
+    jinja2.Environment
+        The template environment.
+
+    Notes
+    -----
+    The environment compiles each template the first time it is used and then
+    reuses it for the rest of the process. With a cache directory, the compiled
+    bytecode is also saved to disk, so later runs skip compiling the templates,
+    unless the directory cannot be created. Jinja invalidates the bytecode whenever a template's source changes.
+    The templates are read from the package resources, which also works when
+    the package is installed as a zip archive. jinja2 is only imported once
+    the first template is needed.
+    """
+    import jinja2
+
+    global _template_environment
+
+    _template_sources.clear()
+    bytecode_cache = None
+    if cache_directory is not None:
+        bytecode_cache_directory = cache_directory / Constants.TEMPLATES_CACHE_NAME
+        try:
+            bytecode_cache_directory.mkdir(parents=True, exist_ok=True)
+            bytecode_cache = jinja2.FileSystemBytecodeCache(str(bytecode_cache_directory))
+        except OSError as error:
+            disable_cache_directory(bytecode_cache_directory, error)
+
+    # The templates do not change whilst running, so skip checking them for updates
+    _template_environment = jinja2.Environment(
+        loader=jinja2.PackageLoader(Paths.TEMPLATES_PACKAGE, Paths.TEMPLATES_PATH),
+        bytecode_cache=bytecode_cache,
+        auto_reload=False,
+    )
+
+    logger.debug(f"Setup the template environment with bytecode cache {cache_directory}.")
+    return _template_environment
+
+
+def get_template_environment() -> "jinja2.Environment":
+    """
+    Get the template environment shared by every render in this process.
+
+    Returns
+    -------
+    jinja2.Environment
+        The template environment, setup without a bytecode cache if it has not
+        been setup already.
+    """
+    if _template_environment is None:
+        return setup_template_environment()
+
+    return _template_environment
+
+
+def setup_worker_template_environment(cache_directory: Path | None = None) -> None:
+    """
+    Setup the template environment of a worker process, unless it inherited one.
+
+    Parameters
+    ----------
+    cache_directory : Path | None, optional
+        Path to the build cache directory, in which the compiled templates are
+        kept between runs, by default None, which only keeps them in memory.
+    """
+    if _template_environment is None:
+        setup_template_environment(cache_directory)
+
+
+def stream_template(template_name: str, context: dict[str, Any]) -> Iterator[str]:
+    """
+    Render the template with the context, a piece at a time.
+
+    Parameters
+    ----------
+    template_name : str
+        Name of the template within the templates directory.
+    context : dict[str, Any]
+        Context to render the template.
+
+    Yields
+    ------
     str
-        Rendered template.
+        The next piece of the rendered template.
 
     Raises
     ------
@@ -34,113 +133,710 @@ def render_template(template_path: Path, context: dict[str, Any]) -> str:
     jinja2.exceptions.TemplateSyntaxError
         If there is a syntax error in the template.
     """
-    if not template_path.exists():
-        logger.error(f"Template at {template_path} does not exist.")
-        raise FileNotFoundError(f"Template at {template_path} does not exist.")
+    import jinja2
 
     try:
-        logger.debug(f"Rendering the template at {template_path}.")
-        with open(template_path) as file:
-            template = jinja2.Template(file.read())
+        logger.debug(f"Rendering the template {template_name}.")
+        template = get_template_environment().get_template(template_name)
 
-        rendered_template = template.render(context)
+        yield from template.generate(context)
+    except jinja2.exceptions.TemplateNotFound:
+        logger.error(f"Template {template_name} does not exist.")
+        raise FileNotFoundError(f"Template {template_name} does not exist.")
     except jinja2.exceptions.TemplateSyntaxError as e:
-        logger.error(f"Error in the template at {template_path}: {e}")
+        logger.error(f"Error in the template {template_name}: {e}")
         raise e
     except ValueError as e:
-        logger.error(f"Error in the context for the template at {template_path}: {e}")
+        logger.error(f"Error in the context for the template {template_name}: {e}")
         logger.error(f"Context: {context}")
         raise e
 
-    logger.debug(f"Rendered the template at {template_path}.")
-    return rendered_template
+    logger.debug(f"Rendered the template {template_name}.")
 
 
-def create_logbook(logbook_contexts: dict[str, Any]) -> str:
+def get_template_source(template_name: str) -> str:
     """
-    Create the logbook from the contexts.
+    Get the source of a template, reading it only the first time it is needed.
 
     Parameters
     ----------
-    logbook_contexts : dict
-        The contexts to render into the logbook.
+    template_name : str
+        Name of the template within the templates directory.
+
+    Returns
+    -------
+    str
+        The source of the template.
+    """
+    if template_name not in _template_sources:
+        template_environment = get_template_environment()
+        _template_sources[template_name] = template_environment.loader.get_source(  # type: ignore
+            template_environment, template_name
+        )[0]
+
+    return _template_sources[template_name]
+
+
+def section_cache_key(template_name: str, key_context: Any) -> str:
+    """
+    Build the key that a rendering of a section is cached under.
+
+    Parameters
+    ----------
+    template_name : str
+        Name of the template within the templates directory.
+    key_context : Any
+        The parts of the context that the template reads.
+
+    Returns
+    -------
+    str
+        The cache key, which changes whenever the template or context does.
+    """
+    return cache_key(template_name, get_template_source(template_name), fingerprint(key_context))
+
+
+def stream_section(
+    template_name: str,
+    context: dict[str, Any],
+    cache_directory: Path | None = None,
+    key_context: Any = None,
+) -> Iterator[str]:
+    """
+    Render a section of the logbook, reusing the cached rendering if it is unchanged.
+
+    Parameters
+    ----------
+    template_name : str
+        Name of the template within the templates directory.
+    context : dict[str, Any]
+        Context to render the template.
+    cache_directory : Path | None, optional
+        Path to the build cache directory, by default None, which disables caching.
+    key_context : Any, optional
+        The parts of the context that the template reads, if it only reads a
+        few of them, by default None, which is the whole context.
+
+    Yields
+    ------
+    str
+        The next piece of the rendered section, or the whole of it if it was
+        cached.
 
     Notes
     -----
-    This function renders each part of the logbook and then combines them into
-    the final markdown logbook.
+    Renderings are cached by a fingerprint of the context and the source of
+    the template, so a section is only rendered again once either changes.
     """
-    logger.debug("Rendering the logbook.")
-    logbook_markdown = ""
+    profiler = get_profiler()
+    if cache_directory is None:
+        profiler.increment("sections_rendered")
+        yield from stream_template(template_name, context)
+        return
 
-    logger.debug("Rendering the logbook cover.")
-    logbook_markdown += (
-        render_template(
-            Paths.TEMPLATES_PATH / "cover.md.j2",
-            logbook_contexts["cover"],
+    sections_cache_directory = cache_directory / Constants.SECTIONS_CACHE_NAME
+    key = section_cache_key(template_name, context if key_context is None else key_context)
+
+    cached_section = load_cache_entry(sections_cache_directory, key)
+    if isinstance(cached_section, str):
+        logger.debug(f"Reusing the cached rendering of the template {template_name}.")
+        profiler.increment("section_cache_hits")
+        yield cached_section
+        return
+
+    profiler.increment("sections_rendered")
+    rendered_section = render_template(template_name, context)
+    save_cache_entry(sections_cache_directory, key, rendered_section)
+
+    yield rendered_section
+
+
+def render_template(template_name: str, context: dict[str, Any]) -> str:
+    """
+    Render the template with the context.
+
+    Parameters
+    ----------
+    template_name : str
+        Name of the template within the templates directory.
+    context : dict[str, Any]
+        Context to render the template.
+
+    Returns
+    -------
+    str
+        Rendered template.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the template does not exist.
+    jinja2.exceptions.TemplateSyntaxError
+        If there is a syntax error in the template.
+    """
+    return "".join(stream_template(template_name, context))
+
+
+def renders_in_parallel(jobs: int, sections: int) -> bool:
+    """
+    Check whether sections left to render would be spread over a process pool.
+
+    Parameters
+    ----------
+    jobs : int
+        The maximum number of processes to use.
+    sections : int
+        The number of sections left to render.
+
+    Returns
+    -------
+    bool
+        Whether there are enough jobs and sections for a process pool.
+    """
+    return jobs > 1 and sections >= Constants.PARALLEL_RENDERING_MINIMUM_SECTIONS
+
+
+def render_sections(
+    template_name: str,
+    contexts: list[dict[str, Any]],
+    cache_directory: Path | None = None,
+    jobs: int = Constants.DEFAULT_JOBS,
+) -> list[str]:
+    """
+    Render several independent sections of the same template, optionally in parallel.
+
+    Parameters
+    ----------
+    template_name : str
+        Name of the template within the templates directory.
+    contexts : list[dict[str, Any]]
+        Context to render each section.
+    cache_directory : Path | None, optional
+        Path to the build cache directory, by default None, which disables caching.
+    jobs : int, optional
+        The maximum number of processes to use, by default Constants.DEFAULT_JOBS
+
+    Returns
+    -------
+    list[str]
+        The rendered sections, in the same order as the given contexts.
+
+    Notes
+    -----
+    Rendering is CPU bound, so the sections are spread over a process pool in
+    chunks, and the results are identical to rendering them one by one.
+    Cached sections are always loaded in this process, and the rest are only
+    sent to the pool once there are at least
+    Constants.PARALLEL_RENDERING_MINIMUM_SECTIONS of them, as starting the
+    pool costs more than it saves on shorter logbooks.
+    """
+    sections: dict[int, str] = {}
+    if cache_directory is not None:
+        sections_cache_directory = cache_directory / Constants.SECTIONS_CACHE_NAME
+        keys = [section_cache_key(template_name, context) for context in contexts]
+        for index, key in enumerate(keys):
+            cached_section = load_cache_entry(sections_cache_directory, key)
+            if isinstance(cached_section, str):
+                sections[index] = cached_section
+
+    missing_indices = [index for index in range(len(contexts)) if index not in sections]
+    profiler = get_profiler()
+    profiler.increment("section_cache_hits", len(sections))
+    profiler.increment("sections_rendered", len(missing_indices))
+
+    rendered_sections: Iterable[str]
+    if not renders_in_parallel(jobs, len(missing_indices)):
+        rendered_sections = [
+            render_template(template_name, contexts[index]) for index in missing_indices
+        ]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        workers = min(jobs, len(missing_indices))
+        chunk_size = ceil(len(missing_indices) / (workers * Constants.PARALLEL_CHUNKS_PER_WORKER))
+        logger.debug(
+            f"Rendering {len(missing_indices)} sections of the template {template_name} "
+            f"with {workers} processes in chunks of {chunk_size}"
         )
-        + "\n\n"
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=setup_worker_template_environment,
+            initargs=(cache_directory,),
+        ) as executor:
+            rendered_sections = list(
+                executor.map(
+                    partial(render_template, template_name),
+                    [contexts[index] for index in missing_indices],
+                    chunksize=chunk_size,
+                )
+            )
+
+    for index, rendered_section in zip(missing_indices, rendered_sections):
+        sections[index] = rendered_section
+        if cache_directory is not None:
+            save_cache_entry(sections_cache_directory, keys[index], rendered_section)
+
+    return [sections[index] for index in range(len(contexts))]
+
+
+def stream_week(week: Week, cache_directory: Path | None = None) -> Iterator[str]:
+    """
+    Render a single week of the logbook, a piece at a time.
+
+    Parameters
+    ----------
+    week : Week
+        The week.
+    cache_directory : Path | None, optional
+        Path to the build cache directory, by default None, which disables caching.
+
+    Yields
+    ------
+    str
+        The next piece of the rendered week, ending with its page break.
+    """
+    logger.debug(f"Rendering week {week.number}.")
+    tracer("Week %s context: %s", week.number, week)
+    yield from stream_section("week.md.j2", {"week": week}, cache_directory)
+    yield Constants.PAGE_BREAK
+    logger.debug(f"Rendered week {week.number}.")
+
+
+def render_week(week: Week, cache_directory: Path | None = None) -> str:
+    """
+    Render a single week of the logbook.
+
+    Parameters
+    ----------
+    week : Week
+        The week.
+    cache_directory : Path | None, optional
+        Path to the build cache directory, by default None, which disables caching.
+
+    Returns
+    -------
+    str
+        The rendered week, including its page break.
+    """
+    return "".join(stream_week(week, cache_directory))
+
+
+def render_weeks(
+    weeks: dict[str, Week],
+    cache_directory: Path | None = None,
+    jobs: int = Constants.DEFAULT_JOBS,
+) -> dict[str, str]:
+    """
+    Render several weeks of the logbook, optionally in parallel.
+
+    Parameters
+    ----------
+    weeks : dict[str, Week]
+        The weeks, keyed the same as the weeks context.
+    cache_directory : Path | None, optional
+        Path to the build cache directory, by default None, which disables caching.
+    jobs : int, optional
+        The maximum number of processes to use, by default Constants.DEFAULT_JOBS
+
+    Returns
+    -------
+    dict[str, str]
+        The rendered weeks, including their page breaks, keyed the same as the
+        given weeks.
+    """
+    logger.debug(f"Rendering weeks {', '.join(weeks)}.")
+    rendered_weeks = render_sections(
+        "week.md.j2", [{"week": week} for week in weeks.values()], cache_directory, jobs
     )
 
+    return {
+        week_key: rendered_week + Constants.PAGE_BREAK
+        for week_key, rendered_week in zip(weeks, rendered_weeks)
+    }
+
+
+def stream_coursework_file(
+    coursework_file: CourseworkFile, cache_directory: Path | None = None
+) -> Iterator[str]:
+    """
+    Render the coursework for a single file, a piece at a time.
+
+    Parameters
+    ----------
+    coursework_file : CourseworkFile
+        The coursework file.
+    cache_directory : Path | None, optional
+        Path to the build cache directory, by default None, which disables caching.
+
+    Yields
+    ------
+    str
+        The next piece of the rendered coursework file.
+    """
+    logger.debug(f"Rendering coursework for {coursework_file.name}.")
+    yield from stream_section(
+        "coursework.md.j2", {"coursework_file": coursework_file}, cache_directory
+    )
+    yield Constants.SECTION_BREAK
+    logger.debug(f"Rendered coursework for {coursework_file.name}.")
+
+
+def render_coursework_file(
+    coursework_file: CourseworkFile, cache_directory: Path | None = None
+) -> str:
+    """
+    Render the coursework for a single file.
+
+    Parameters
+    ----------
+    coursework_file : CourseworkFile
+        The coursework file.
+    cache_directory : Path | None, optional
+        Path to the build cache directory, by default None, which disables caching.
+
+    Returns
+    -------
+    str
+        The rendered coursework file.
+    """
+    return "".join(stream_coursework_file(coursework_file, cache_directory))
+
+
+def render_coursework_files(
+    coursework_files: dict[str, CourseworkFile],
+    cache_directory: Path | None = None,
+    jobs: int = Constants.DEFAULT_JOBS,
+) -> dict[str, str]:
+    """
+    Render the coursework for several files, optionally in parallel.
+
+    Parameters
+    ----------
+    coursework_files : dict[str, CourseworkFile]
+        The coursework files, keyed by file name.
+    cache_directory : Path | None, optional
+        Path to the build cache directory, by default None, which disables caching.
+    jobs : int, optional
+        The maximum number of processes to use, by default Constants.DEFAULT_JOBS
+
+    Returns
+    -------
+    dict[str, str]
+        The rendered coursework files, keyed by file name.
+    """
+    logger.debug(f"Rendering coursework for {', '.join(coursework_files)}.")
+    rendered_files = render_sections(
+        "coursework.md.j2",
+        [{"coursework_file": coursework_file} for coursework_file in coursework_files.values()],
+        cache_directory,
+        jobs,
+    )
+
+    return {
+        file_name: rendered_file + Constants.SECTION_BREAK
+        for file_name, rendered_file in zip(coursework_files, rendered_files)
+    }
+
+
+def stream_cover(cover: dict[str, Any], cache_directory: Path | None = None) -> Iterator[str]:
+    """
+    Render the cover of the logbook, a piece at a time.
+
+    Parameters
+    ----------
+    cover : dict[str, Any]
+        The configuration file, which the cover is rendered from.
+    cache_directory : Path | None, optional
+        Path to the build cache directory, by default None, which disables caching.
+
+    Yields
+    ------
+    str
+        The next piece of the rendered cover, ending with its section break.
+    """
+    logger.debug("Rendering the logbook cover.")
+    yield from stream_section("cover.md.j2", cover, cache_directory)
+    yield Constants.SECTION_BREAK
+
+
+def stream_contents(weeks: dict[str, Week], cache_directory: Path | None = None) -> Iterator[str]:
+    """
+    Render the table of contents of the logbook, a piece at a time.
+
+    Parameters
+    ----------
+    weeks : dict[str, Week]
+        The weeks, keyed by week number.
+    cache_directory : Path | None, optional
+        Path to the build cache directory, by default None, which disables caching.
+
+    Yields
+    ------
+    str
+        The next piece of the rendered table of contents, ending with its page
+        break.
+    """
     logger.debug("Rendering the logbook table of contents.")
-    logbook_markdown += (
-        render_template(
-            Paths.TEMPLATES_PATH / "contents.md.j2",
-            {"weeks": logbook_contexts["weeks"]},
-        )
-        + "\n\\newpage\n"
+    yield from stream_section(
+        "contents.md.j2",
+        {"weeks": weeks},
+        cache_directory,
+        # The table of contents only lists the weeks and the names of their tasks
+        key_context=[
+            (
+                week.number,
+                week.start_date,
+                week.end_date,
+                [(task.topic, task.name) for task in week.lab_tasks.values()],
+                [(task.topic, task.name) for task in week.extra_tasks.values()],
+            )
+            for week in weeks.values()
+        ],
     )
+    yield Constants.PAGE_BREAK
+
+
+def logbook_section_order(section_name: str) -> tuple[int, str]:
+    """
+    Get the position of a section of the logbook, among those of any build.
+
+    Parameters
+    ----------
+    section_name : str
+        The name of the section, as given by stream_logbook_sections.
+
+    Returns
+    -------
+    tuple[int, str]
+        A key that orders the cover, the table of contents, each week and the
+        references as they are in the logbook.
+    """
+    if section_name == "cover":
+        return 0, ""
+    if section_name == "contents":
+        return 1, ""
+    if section_name == "references":
+        return 3, ""
+    return 2, section_name
+
+
+def stream_logbook_sections(
+    logbook_contexts: dict[str, Any],
+    rendered_weeks: dict[str, str] | None = None,
+    cache_directory: Path | None = None,
+    jobs: int = Constants.DEFAULT_JOBS,
+) -> Iterator[tuple[str, Iterator[str]]]:
+    """
+    Render the sections of the logbook from the contexts, a piece at a time.
+
+    Parameters
+    ----------
+    logbook_contexts : dict
+        The contexts to render into the logbook.
+    rendered_weeks : dict[str, str] | None, optional
+        Weeks that have already been rendered, keyed the same as the weeks
+        context, by default None
+    cache_directory : Path | None, optional
+        Path to the build cache directory, by default None, which disables caching.
+    jobs : int, optional
+        The maximum number of processes to render with, by default
+        Constants.DEFAULT_JOBS
+
+    Yields
+    ------
+    tuple[str, Iterator[str]]
+        The name of the next section, such as "cover" or "week-01", and the
+        pieces of the section, which must be consumed before the next section.
+
+    Notes
+    -----
+    The sections are the cover, the table of contents, each week and the
+    references, in order. Each one ends with the break that separates it from
+    the next, so joining them gives the whole logbook.
+    """
+    logger.debug("Rendering the logbook.")
+    rendered_weeks = rendered_weeks or {}
+    if jobs > 1:
+        unrendered_weeks = {
+            week_key: week
+            for week_key, week in logbook_contexts["weeks"].items()
+            if week_key not in rendered_weeks
+        }
+        if renders_in_parallel(jobs, len(unrendered_weeks)):
+            rendered_weeks = rendered_weeks | render_weeks(unrendered_weeks, cache_directory, jobs)
+
+    yield "cover", stream_cover(logbook_contexts["cover"], cache_directory)
+    yield "contents", stream_contents(logbook_contexts["weeks"], cache_directory)
 
     logger.debug("Rendering the logbook weekly entries.")
-    for week in logbook_contexts["weeks"].values():
-        logger.debug(f"Rendering week {week['number']} with context {week}.")
-        logbook_markdown += (
-            render_template(
-                Paths.TEMPLATES_PATH / "week.md.j2",
-                week,
-            )
-            + "\n\\newpage\n"
-        )
-        logger.debug(f"Rendered week {week['number']}.")
+    for week_key, week in logbook_contexts["weeks"].items():
+        week_section_name = Constants.WEEK_SECTION_NAME_FORMAT.format(week.number)
+        if week_key in rendered_weeks:
+            logger.debug(f"Reusing the rendered week {week.number}.")
+            yield week_section_name, iter([rendered_weeks[week_key]])
+        else:
+            yield week_section_name, stream_week(week, cache_directory)
 
     logger.debug("Rendering the logbook references.")
-    logbook_markdown += render_template(
-        Paths.TEMPLATES_PATH / "references.md.j2",
-        {"references": logbook_contexts["references"]},
+    yield "references", stream_section(
+        "references.md.j2", {"references": logbook_contexts["references"]}, cache_directory
     )
 
-    return logbook_markdown
+
+def stream_logbook(
+    logbook_contexts: dict[str, Any],
+    rendered_weeks: dict[str, str] | None = None,
+    cache_directory: Path | None = None,
+    jobs: int = Constants.DEFAULT_JOBS,
+) -> Iterator[str]:
+    """
+    Render the logbook from the contexts, a piece at a time.
+
+    Parameters
+    ----------
+    logbook_contexts : dict
+        The contexts to render into the logbook.
+    rendered_weeks : dict[str, str] | None, optional
+        Weeks that have already been rendered, keyed the same as the weeks
+        context, by default None
+    cache_directory : Path | None, optional
+        Path to the build cache directory, by default None, which disables caching.
+    jobs : int, optional
+        The maximum number of processes to render with, by default
+        Constants.DEFAULT_JOBS
+
+    Yields
+    ------
+    str
+        The next piece of the rendered logbook.
+
+    Notes
+    -----
+    Each part of the logbook is yielded as soon as it is rendered, so it can
+    be written out without holding the whole logbook in memory. Any week found
+    in rendered_weeks is spliced in as it is, rather than being rendered again.
+    With a cache directory, every other section is only rendered if it has
+    changed since it was cached. With more than one job and enough weeks to
+    render them in parallel, they are rendered together before the logbook is
+    yielded, and otherwise each week is rendered as it is yielded.
+    """
+    for _, section in stream_logbook_sections(
+        logbook_contexts, rendered_weeks, cache_directory, jobs
+    ):
+        yield from section
 
 
-def create_coursework(coursework_context: dict[str, Any]) -> str:
+def create_logbook(
+    logbook_contexts: dict[str, Any],
+    rendered_weeks: dict[str, str] | None = None,
+    cache_directory: Path | None = None,
+    jobs: int = Constants.DEFAULT_JOBS,
+) -> str:
     """
-    Create the coursework from the context.
+    Create the logbook from the contexts.
+
+    Parameters
+    ----------
+    logbook_contexts : dict
+        The contexts to render into the logbook.
+    rendered_weeks : dict[str, str] | None, optional
+        Weeks that have already been rendered, keyed the same as the weeks
+        context, by default None
+    cache_directory : Path | None, optional
+        Path to the build cache directory, by default None, which disables caching.
+    jobs : int, optional
+        The maximum number of processes to render with, by default
+        Constants.DEFAULT_JOBS
+
+    Returns
+    -------
+    str
+        The rendered logbook.
+    """
+    return "".join(stream_logbook(logbook_contexts, rendered_weeks, cache_directory, jobs))
+
+
+def stream_coursework(
+    coursework_context: dict[str, CourseworkFile],
+    rendered_files: dict[str, str] | None = None,
+    cache_directory: Path | None = None,
+    jobs: int = Constants.DEFAULT_JOBS,
+) -> Iterator[str]:
+    """
+    Render the coursework from the context, a piece at a time.
 
     Parameters
     ----------
-    coursework_context : dict
-        The contexts to render into the coursework.
+    coursework_context : dict[str, CourseworkFile]
+        The coursework files to render into the coursework, keyed by file name.
+    rendered_files : dict[str, str] | None, optional
+        Coursework files that have already been rendered, keyed by file name,
+        by default None
+    cache_directory : Path | None, optional
+        Path to the build cache directory, by default None, which disables caching.
+    jobs : int, optional
+        The maximum number of processes to render with, by default
+        Constants.DEFAULT_JOBS
+
+    Yields
+    ------
+    str
+        The next piece of the rendered coursework.
 
     Notes
     -----
-    This function renders each part of the coursework and then combines them into
-    the final markdown coursework.
+    Any file found in rendered_files is spliced in as it is, rather than being
+    rendered again. With more than one job and enough other files to render
+    them in parallel, they are rendered together before the coursework is
+    yielded, and otherwise each file is rendered as it is yielded.
     """
     logger.debug("Rendering the coursework.")
-    coursework_markdown = ""
-
-    for file_name, file_context in coursework_context.items():
-        logger.debug(f"Rendering coursework for {file_name}.")
-        coursework_markdown += (
-            render_template(
-                Paths.TEMPLATES_PATH / "coursework.md.j2",
-                {
-                    "file_name": file_name,
-                    "tasks": file_context,
-                },
+    rendered_files = rendered_files or {}
+    if jobs > 1:
+        unrendered_files = {
+            file_name: coursework_file
+            for file_name, coursework_file in coursework_context.items()
+            if file_name not in rendered_files
+        }
+        if renders_in_parallel(jobs, len(unrendered_files)):
+            rendered_files = rendered_files | render_coursework_files(
+                unrendered_files, cache_directory, jobs
             )
-            + "\n\n"
-        )
-        logger.debug(f"Rendered coursework for {file_name}.")
 
-    return coursework_markdown
+    for file_name, coursework_file in coursework_context.items():
+        if file_name in rendered_files:
+            logger.debug(f"Reusing the rendered coursework for {file_name}.")
+            yield rendered_files[file_name]
+        else:
+            yield from stream_coursework_file(coursework_file, cache_directory)
+
+
+def create_coursework(
+    coursework_context: dict[str, CourseworkFile],
+    rendered_files: dict[str, str] | None = None,
+    cache_directory: Path | None = None,
+    jobs: int = Constants.DEFAULT_JOBS,
+) -> str:
+    """
+    Create the coursework from the context.
+
+    Parameters
+    ----------
+    coursework_context : dict[str, CourseworkFile]
+        The coursework files to render into the coursework, keyed by file name.
+    rendered_files : dict[str, str] | None, optional
+        Coursework files that have already been rendered, keyed by file name,
+        by default None
+    cache_directory : Path | None, optional
+        Path to the build cache directory, by default None, which disables caching.
+    jobs : int, optional
+        The maximum number of processes to render with, by default
+        Constants.DEFAULT_JOBS
+
+    Returns
+    -------
+    str
+        The rendered coursework.
+    """
+    return "".join(stream_coursework(coursework_context, rendered_files, cache_directory, jobs))
@@ -1,5 +1,6 @@
 """constants.py: Constants for the application."""
 
+from os import cpu_count, environ
 from pathlib import Path
 from typing import Literal
 
@@ -28,6 +29,26 @@ class Constants:
     LOGGING_DATE_FORMAT: str = "[%X]"
     LOGGING_TRACEBACKS: bool = True
 
+    # Tracing constants
+    TRACE_SUBSYSTEMS: list[str] = ["parsing", "lexing", "processing", "contexts", "rendering"]
+    TRACE_ALL: str = "all"
+    TRACE_LOGGER_NAME: str = "logbookgenerator.trace"
+    TRACE_ENVIRONMENT_VARIABLE: str = "LOGBOOKGENERATOR_TRACE"
+
+    # Profiling constants
+    PROFILE_SLOWEST_SOURCES: int = 10
+
+    # Metrics constants
+    METRICS_PREFIX: str = "logbookgenerator"
+    METRICS_PROMETHEUS_SUFFIX: str = ".prom"
+
+    # Build target constants
+    LOGBOOK_TARGET: str = "logbook"
+    COURSEWORK_TARGET: str = "coursework"
+    CLEAN_CODE_TARGET: str = "clean-code"
+    BUILD_TARGETS: list[str] = [LOGBOOK_TARGET, COURSEWORK_TARGET, CLEAN_CODE_TARGET]
+    WEEK_SELECTION_REGEX: str = r"^(\d+)(?:-(\d+))?$"
+
     # API response constants
     SUCCESS_CODE: int = 200
     SUCCESS_TEXT: str = "OK"
@@ -38,10 +59,38 @@ class Constants:
     DEFAULT_INPUT_DIRECTORY: Path = Path("weeks")
     DEFAULT_CONFIG_FILE: Path = Path("config.yaml")
     DEFAULT_OUTPUT_FILE: Path = Path("renders/logbook.md")
+    STANDARD_OUTPUT: str = "-"
+    DEFAULT_JOBS: int = 1
+    DEFAULT_BATCH_JOBS: int = cpu_count() or 1
+    DEFAULT_CACHE_DIRECTORY: Path = (
+        Path(environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "logbookgenerator"
+    )
+
+    # Cache constants
+    # Bump whenever the layout of cache entries or the results cached change, such as the lexer's
+    CACHE_FORMAT_VERSION: int = 2
+    CACHE_FILE_SUFFIX: str = ".json"
+    CACHE_MAX_SIZE: int = 64 * 1024 * 1024  # 64 MiB
+    COMMENTS_CACHE_NAME: str = "comments"
+    TEMPLATES_CACHE_NAME: str = "templates"
+    SECTIONS_CACHE_NAME: str = "sections"
+
+    # Output constants
+    OUTPUT_MANIFEST_NAME: str = ".outputs.json"
+    SPLIT_INDEX_NAME: str = "index.json"
+    FILE_COMPARISON_CHUNK_SIZE: int = 1024 * 1024  # 1 MiB
+
+    # Code processing constants
+    MINIMUM_CODE_SPAN_LENGTH: int = 16  # Shorter code takes less memory as a string
+
+    # Parallel processing constants
+    PARALLEL_PROCESSING_MINIMUM_SIZE: int = 1024 * 1024  # 1 MiB of code
+    PARALLEL_CHUNKS_PER_WORKER: int = 4
+    PARALLEL_RENDERING_MINIMUM_SECTIONS: int = 8
 
-    # Type hints
-    TASK_ANNOTATION = dict[str, str | dict[str, list[tuple[str, str]]]]
-    WEEK_ANNOTATION = dict[str, str | dict[Literal["lab", "extra"], dict[str, TASK_ANNOTATION]]]
+    # Watch mode constants
+    WATCH_POLL_INTERVAL: float = 1.0
+    WATCH_DEBOUNCE_INTERVAL: float = 0.2
 
     # Format patterns
     YEAR_REGEX_FORMAT: str = r"^\d{4}$"
@@ -65,10 +114,11 @@ class Constants:
     # Formatting
     JINJA_DATE_FORMAT: str = "%Y-%m-%d"
     ANSWER_KEYWORD: str = "ANSWER"
-    INLINE_COMMENT_START: str = "/*"
-    BLOCK_COMMENT_START: str = "/**"
-    BLOCK_COMMENT_MIDDLE: str = "*"
-    COMMENT_END: str = "*/"
-    ANSWER_ID_DELIMITERS: str = "()"
-    INLINE_ANSWER_COMMENT: str = f"{ANSWER_KEYWORD} {r'\((\w+) (\d+)\.(\d+)\): (.+)'}"
+    LINE_COMMENT_START: str = "//"
+    BLOCK_COMMENT_START: str = "/*"
+    BLOCK_COMMENT_END: str = "*/"
+    ANSWER_COMMENT_REGEX: str = f"{ANSWER_KEYWORD}{r'\s*\(([^)]*)\)\s*:?\s*(.*)'}"
     CODE_COMMENT_DELIMITER: str = "```"
+    PAGE_BREAK: str = "\n\\newpage\n"
+    SECTION_BREAK: str = "\n\n"
+    WEEK_SECTION_NAME_FORMAT: str = "week-{:02d}"
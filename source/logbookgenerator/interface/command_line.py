@@ -5,7 +5,9 @@ from os import getcwd
 from pathlib import Path
 from typing import Any
 
+from ..computation.parsing import find_week_directories
 from ..config.constants import Constants
+from ..utilities.validation import parse_week_selection
 from . import __version__, logger
 
 logger = logger.getChild(__name__)
@@ -75,11 +77,165 @@ def command_line_interface() -> dict[str, Any]:
         type=str,
         required=False,
         default=getcwd() / Constants.DEFAULT_OUTPUT_FILE,
-        help="Path to save the output file, should end in .md.",
+        help="Path to save the output file, should end in .md, or - for stdout. The coursework "
+        "is saved alongside it, in a coursework directory, so with - only the logbook is built, "
+        "unless --only selects the coursework, which is then saved in ./coursework.",
     )  # Path to the output file
 
+    argparser.add_argument(
+        "--jobs",
+        "-j",
+        action="store",
+        type=int,
+        required=False,
+        default=Constants.DEFAULT_JOBS,
+        help="Number of input files to read and process, and sections to render, concurrently.",
+    )  # Number of concurrent jobs
+
+    argparser.add_argument(
+        "--cache_directory",
+        action="store",
+        type=str,
+        required=False,
+        default=Constants.DEFAULT_CACHE_DIRECTORY,
+        help="Path to the directory used to cache results between builds.",
+    )  # Path to the cache directory
+
+    argparser.add_argument(
+        "--no_cache",
+        action="store_true",
+        required=False,
+        help="Disable the build cache.",
+    )  # Disable the build cache
+
+    argparser.add_argument(
+        "--watch",
+        "-w",
+        action="store_true",
+        required=False,
+        help="Keep running and rebuild the weeks that change in the input directory.",
+    )  # Watch the input directory for changes
+
+    argparser.add_argument(
+        "--weeks",
+        action="store",
+        type=str,
+        required=False,
+        default=None,
+        help="Only build these weeks, such as 3-5 or 1,3,7-9, keeping their week numbers.",
+    )  # Weeks to build
+
+    argparser.add_argument(
+        "--only",
+        action="append",
+        choices=Constants.BUILD_TARGETS,
+        required=False,
+        default=[],
+        help="Only build this output, can be given more than once.",
+    )  # Outputs to build
+
+    argparser.add_argument(
+        "--split",
+        action="store_true",
+        required=False,
+        help="Save each section of the logbook as its own file, in a directory named after "
+        f"the output file, listed in order in {Constants.SPLIT_INDEX_NAME}.",
+    )  # Split the logbook into one file per section
+
+    argparser.add_argument(
+        "--trace",
+        "-t",
+        action="append",
+        choices=[*Constants.TRACE_SUBSYSTEMS, Constants.TRACE_ALL],
+        required=False,
+        default=[],
+        help="Trace the hot paths of a subsystem to the log, can be given more than once.",
+    )  # Subsystems to trace
+
+    argparser.add_argument(
+        "--profile",
+        "-p",
+        action="store_true",
+        required=False,
+        help="Report the time spent in each stage of the build, and the files and bytes "
+        "it handled, along with the slowest files to process.",
+    )  # Profile the stages of the build
+
+    argparser.add_argument(
+        "--profile_dump",
+        action="store",
+        type=str,
+        required=False,
+        default=None,
+        help="Also profile every function call of the build with cProfile, saving it to this "
+        "path, should end in .prof.",
+    )  # Path to save the cProfile profile
+
+    argparser.add_argument(
+        "--profile_slowest",
+        action="store",
+        type=int,
+        required=False,
+        default=Constants.PROFILE_SLOWEST_SOURCES,
+        help="Number of the slowest files to process to report when profiling.",
+    )  # Number of the slowest files to report
+
+    argparser.add_argument(
+        "--metrics_file",
+        action="store",
+        type=str,
+        required=False,
+        default=None,
+        help="Path to save the metrics of the build to, as a Prometheus textfile if it ends in "
+        f"{Constants.METRICS_PROMETHEUS_SUFFIX}, otherwise as JSON, or - for stdout.",
+    )  # Path to save the build metrics
+
     parsed_args = argparser.parse_args()
 
+    if parsed_args.jobs < 1:
+        argparser.error("The number of jobs must be at least 1.")
+
+    if parsed_args.profile_slowest < 0:
+        argparser.error("The number of the slowest files cannot be negative.")
+
+    if parsed_args.watch and (parsed_args.profile or parsed_args.profile_dump is not None):
+        argparser.error("The build cannot be profiled whilst watching.")
+
+    if parsed_args.watch and parsed_args.metrics_file is not None:
+        argparser.error("Metrics cannot be saved whilst watching.")
+
+    if parsed_args.metrics_file == Constants.STANDARD_OUTPUT == parsed_args.output_file:
+        argparser.error("The metrics and the logbook cannot both be written to stdout.")
+
+    if parsed_args.watch and (parsed_args.weeks is not None or parsed_args.only):
+        argparser.error("Weeks and outputs cannot be selected whilst watching.")
+
+    if parsed_args.split and parsed_args.watch:
+        argparser.error("The logbook cannot be split whilst watching.")
+
+    if parsed_args.split and parsed_args.output_file == Constants.STANDARD_OUTPUT:
+        argparser.error("The logbook cannot be split when it is written to stdout.")
+
+    # The weeks can only be checked against the input directory once it exists
+    week_count = None
+    input_directory = Path(parsed_args.input_directory)
+    if parsed_args.weeks is not None and input_directory.is_dir():
+        week_count = len(find_week_directories(input_directory))
+
+    try:
+        weeks = (
+            None
+            if parsed_args.weeks is None
+            else parse_week_selection(parsed_args.weeks, week_count)
+        )
+    except ValueError as error:
+        argparser.error(str(error))
+
+    # Nowhere to save the coursework alongside stdout, unless it is asked for explicitly
+    targets = set(parsed_args.only or Constants.BUILD_TARGETS)
+    if parsed_args.output_file == Constants.STANDARD_OUTPUT and not parsed_args.only:
+        targets = {Constants.LOGBOOK_TARGET}
+
     # Create a dictionary to return the parsed arguments
     arguments: dict[str, Any] = {
         "log_output_location": Path(parsed_args.log_output_location),
@@ -87,6 +243,137 @@ def command_line_interface() -> dict[str, Any]:
         "config_file": Path(parsed_args.config_file),
         "input_directory": Path(parsed_args.input_directory),
         "output_file": Path(parsed_args.output_file),
+        "jobs": parsed_args.jobs,
+        "cache_directory": None if parsed_args.no_cache else Path(parsed_args.cache_directory),
+        "watch": parsed_args.watch,
+        "weeks": weeks,
+        "targets": targets,
+        "split": parsed_args.split,
+        "trace": parsed_args.trace,
+        "profile": parsed_args.profile or parsed_args.profile_dump is not None,
+        "profile_dump": (
+            None if parsed_args.profile_dump is None else Path(parsed_args.profile_dump)
+        ),
+        "profile_slowest": parsed_args.profile_slowest,
+        "metrics_file": (
+            None if parsed_args.metrics_file is None else Path(parsed_args.metrics_file)
+        ),
+    }
+
+    logger.debug(f"Arguments: {arguments}")
+
+    return arguments
+
+
+def batch_command_line_interface() -> dict[str, Any]:
+    """
+    Takes the batch arguments from the command line and returns them as a dictionary.
+
+    Returns
+    -------
+    dict[str, Any]
+        A dictionary containing the arguments passed to the batch application.
+    """
+    argparser = ArgumentParser(
+        formatter_class=ArgumentDefaultsHelpFormatter,
+        description="Build the logbooks of a whole cohort of students.",
+    )  # Automatically generates help messages
+
+    argparser.add_argument(
+        "--log_output_location",
+        "-l",
+        action="store",
+        type=str,
+        required=False,
+        default=Constants.DEFAULT_LOG_SAVE_PATH,
+        help="Path to save the log file, should end in .txt.",
+    )  # Path to save the log file
+
+    argparser.add_argument(
+        "--verbose",
+        "-v",
+        action="store_true",
+        required=False,
+        help="Increase logging verbosity.",
+    )  # Increase logging verbosity
+
+    argparser.add_argument(
+        "--version",
+        action="version",
+        version=f"%(prog)s {__version__}",
+    )  # Display the version number
+
+    students_source = argparser.add_mutually_exclusive_group(required=True)
+
+    students_source.add_argument(
+        "--root_directory",
+        "-r",
+        action="store",
+        type=str,
+        help="Path to a directory containing one directory per student, each with its own "
+        f"{Constants.DEFAULT_INPUT_DIRECTORY} directory and {Constants.DEFAULT_CONFIG_FILE}.",
+    )  # Path to the cohort root directory
+
+    students_source.add_argument(
+        "--manifest_file",
+        "-m",
+        action="store",
+        type=str,
+        help="Path to a YAML manifest listing each student's input directory and config file.",
+    )  # Path to the batch manifest
+
+    argparser.add_argument(
+        "--output_directory",
+        "-o",
+        action="store",
+        type=str,
+        required=False,
+        default=getcwd() / Constants.DEFAULT_OUTPUT_FILE.parent,
+        help="Path to the directory to save each student's outputs in.",
+    )  # Path to the output directory
+
+    argparser.add_argument(
+        "--jobs",
+        "-j",
+        action="store",
+        type=int,
+        required=False,
+        default=Constants.DEFAULT_BATCH_JOBS,
+        help="Number of students to build at once.",
+    )  # Number of worker processes
+
+    argparser.add_argument(
+        "--cache_directory",
+        action="store",
+        type=str,
+        required=False,
+        default=Constants.DEFAULT_CACHE_DIRECTORY,
+        help="Path to the directory used to cache results between builds.",
+    )  # Path to the cache directory
+
+    argparser.add_argument(
+        "--no_cache",
+        action="store_true",
+        required=False,
+        help="Disable the build cache.",
+    )  # Disable the build cache
+
+    parsed_args = argparser.parse_args()
+
+    if parsed_args.jobs < 1:
+        argparser.error("The number of jobs must be at least 1.")
+
+    # Create a dictionary to return the parsed arguments
+    arguments: dict[str, Any] = {
+        "log_output_location": Path(parsed_args.log_output_location),
+        "verbose": parsed_args.verbose,
+        "root_directory": (
+            Path(parsed_args.root_directory) if parsed_args.root_directory else None
+        ),
+        "manifest_file": Path(parsed_args.manifest_file) if parsed_args.manifest_file else None,
+        "output_directory": Path(parsed_args.output_directory),
+        "jobs": parsed_args.jobs,
+        "cache_directory": None if parsed_args.no_cache else Path(parsed_args.cache_directory),
     }
 
     logger.debug(f"Arguments: {arguments}")
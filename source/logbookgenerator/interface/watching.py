@@ -0,0 +1,202 @@
+"""watching.py: Watches the input directory for changes."""
+
+import os
+import time
+from collections.abc import Iterator
+from importlib.util import find_spec
+from pathlib import Path
+from queue import Empty, Queue
+from typing import Any
+
+from ..config.constants import Constants
+from . import logger
+
+logger = logger.getChild(__name__)
+
+
+def snapshot_directory(directory: Path) -> dict[Path, tuple[int, int]]:
+    """
+    Take a snapshot of the files within a directory.
+
+    Parameters
+    ----------
+    directory : Path
+        The directory to snapshot.
+
+    Returns
+    -------
+    dict[Path, tuple[int, int]]
+        The modification time, in nanoseconds, and size of every file within
+        the directory, keyed by path.
+    """
+    snapshot: dict[Path, tuple[int, int]] = {}
+    directories_to_scan = [directory]
+
+    while directories_to_scan:
+        try:
+            with os.scandir(directories_to_scan.pop()) as directory_entries:
+                for entry in directory_entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        directories_to_scan.append(Path(entry.path))
+                    elif entry.is_file():
+                        entry_stat = entry.stat()
+                        snapshot[Path(entry.path)] = (entry_stat.st_mtime_ns, entry_stat.st_size)
+        except FileNotFoundError:
+            continue  # The directory was removed whilst being scanned
+
+    return snapshot
+
+
+def compare_snapshots(
+    previous_snapshot: dict[Path, tuple[int, int]], current_snapshot: dict[Path, tuple[int, int]]
+) -> set[Path]:
+    """
+    Compare two snapshots of a directory.
+
+    Parameters
+    ----------
+    previous_snapshot : dict[Path, tuple[int, int]]
+        The earlier snapshot.
+    current_snapshot : dict[Path, tuple[int, int]]
+        The later snapshot.
+
+    Returns
+    -------
+    set[Path]
+        The paths that were created, removed or modified between the snapshots.
+    """
+    changed_paths = set(previous_snapshot.keys() ^ current_snapshot.keys())
+    changed_paths.update(
+        path
+        for path in previous_snapshot.keys() & current_snapshot.keys()
+        if previous_snapshot[path] != current_snapshot[path]
+    )
+
+    return changed_paths
+
+
+def poll_for_changes(
+    directory: Path, poll_interval: float = Constants.WATCH_POLL_INTERVAL
+) -> Iterator[set[Path]]:
+    """
+    Watch a directory for changes by polling it.
+
+    Parameters
+    ----------
+    directory : Path
+        The directory to watch.
+    poll_interval : float, optional
+        The number of seconds between polls, by default Constants.WATCH_POLL_INTERVAL
+
+    Yields
+    ------
+    set[Path]
+        The paths that changed since the previous batch of changes.
+    """
+    logger.debug(f"Polling {directory} for changes every {poll_interval} seconds.")
+    previous_snapshot = snapshot_directory(directory)
+
+    while True:
+        time.sleep(poll_interval)
+        current_snapshot = snapshot_directory(directory)
+
+        changed_paths = compare_snapshots(previous_snapshot, current_snapshot)
+        if changed_paths:
+            previous_snapshot = current_snapshot
+            yield changed_paths
+
+
+def notify_for_changes(
+    directory: Path, debounce_interval: float = Constants.WATCH_DEBOUNCE_INTERVAL
+) -> Iterator[set[Path]]:
+    """
+    Watch a directory for changes using operating system notifications.
+
+    Parameters
+    ----------
+    directory : Path
+        The directory to watch.
+    debounce_interval : float, optional
+        The number of seconds to wait for further changes before yielding a batch,
+        by default Constants.WATCH_DEBOUNCE_INTERVAL
+
+    Yields
+    ------
+    set[Path]
+        The paths that changed since the previous batch of changes.
+
+    Notes
+    -----
+    This uses watchdog, which uses inotify on Linux, FSEvents on macOS and
+    ReadDirectoryChangesW on Windows.
+    """
+    from watchdog.events import FileSystemEvent, FileSystemEventHandler
+    from watchdog.observers import Observer
+
+    changed_paths: Queue[Path] = Queue()
+
+    class ChangeHandler(FileSystemEventHandler):
+        """Queue the path of every changed file."""
+
+        def on_any_event(self, event: FileSystemEvent) -> None:
+            """
+            Queue the paths of an event.
+
+            Parameters
+            ----------
+            event : FileSystemEvent
+                The file system event.
+            """
+            if event.event_type in ("opened", "closed_no_write"):
+                return
+
+            for path in (event.src_path, getattr(event, "dest_path", "")):
+                if path:
+                    changed_paths.put(Path(os.fsdecode(path)))
+
+    observer: Any = Observer()
+    observer.schedule(ChangeHandler(), str(directory), recursive=True)
+    observer.start()
+    logger.debug(f"Watching {directory} for change notifications.")
+
+    try:
+        while True:
+            batch = {changed_paths.get()}
+
+            # Editors often save in several steps, so wait for the changes to settle
+            while True:
+                try:
+                    batch.add(changed_paths.get(timeout=debounce_interval))
+                except Empty:
+                    break
+
+            yield batch
+    finally:
+        observer.stop()
+        observer.join()
+
+
+def watch_for_changes(directory: Path) -> Iterator[set[Path]]:
+    """
+    Watch a directory for changes.
+
+    Parameters
+    ----------
+    directory : Path
+        The directory to watch.
+
+    Yields
+    ------
+    set[Path]
+        The paths that changed since the previous batch of changes.
+
+    Notes
+    -----
+    Uses operating system notifications if the optional watchdog package is
+    installed, and falls back to polling otherwise.
+    """
+    if find_spec("watchdog") is not None:
+        yield from notify_for_changes(directory)
+    else:
+        logger.debug("watchdog is not installed, falling back to polling.")
+        yield from poll_for_changes(directory)
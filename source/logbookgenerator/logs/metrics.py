@@ -0,0 +1,234 @@
+"""metrics.py: Machine readable metrics of a build, for tracking builds at scale."""
+
+import json
+import sys
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from ..config.constants import Constants
+from ..utilities.file_handling import save_file
+from . import __version__
+from .profiling import Profiler
+
+if TYPE_CHECKING:
+    from ..computation.models import Week
+
+
+def count_answers(weeks: "dict[str, Week]") -> dict[str, int]:
+    """
+    Count the answers extracted from each week.
+
+    Parameters
+    ----------
+    weeks : dict[str, Week]
+        The weeks, keyed by week number.
+
+    Returns
+    -------
+    dict[str, int]
+        The number of answers of each week, keyed by week number.
+    """
+    return {
+        week_number: sum(
+            len(answers)
+            for task in (*week.lab_tasks.values(), *week.extra_tasks.values())
+            for answers in task.answers.values()
+        )
+        for week_number, week in weeks.items()
+    }
+
+
+def peak_rss_bytes() -> tuple[int | None, int | None]:
+    """
+    Measure the peak resident set size of this process and of its worker processes.
+
+    Returns
+    -------
+    tuple[int | None, int | None]
+        The peak resident set size in bytes of this process, and the largest
+        of any worker processes it waited on, or None where it cannot be
+        measured, such as on Windows.
+    """
+    try:
+        import resource
+    except ImportError:
+        return None, None
+
+    # The peak is given in kilobytes, apart from on macOS, where it is in bytes
+    scale = 1 if sys.platform == "darwin" else 1024
+    own_peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+    workers_peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * scale
+
+    return own_peak, workers_peak or None
+
+
+def collect_metrics(
+    profiler: Profiler,
+    user_arguments: dict[str, Any],
+    answers: dict[str, int] | None = None,
+) -> dict[str, Any]:
+    """
+    Collect the metrics of a build from its profile.
+
+    Parameters
+    ----------
+    profiler : Profiler
+        The profiler, which was enabled for the whole build.
+    user_arguments : dict[str, Any]
+        The arguments from the command line.
+    answers : dict[str, int] | None, optional
+        The number of answers extracted from each week, by default None, which
+        is the case when the logbook was not built.
+
+    Returns
+    -------
+    dict[str, Any]
+        The metrics, with durations in seconds and sizes in bytes.
+    """
+
+    def stage_total(name: str, measure: str) -> Any:
+        """Get a measure of a stage, which is 0 if the stage never ran."""
+        stage_profile = profiler.stages.get(name)
+        return 0 if stage_profile is None else getattr(stage_profile, measure)
+
+    own_peak_rss, workers_peak_rss = peak_rss_bytes()
+
+    return {
+        "version": __version__,
+        "timestamp": time.time(),
+        "input_directory": str(user_arguments["input_directory"]),
+        "jobs": user_arguments["jobs"],
+        "duration_seconds": sum(stage.wall_seconds for stage in profiler.stages.values()),
+        "cpu_seconds": sum(stage.cpu_seconds for stage in profiler.stages.values()),
+        "files_read": stage_total("parsing", "files"),
+        "bytes_read": stage_total("parsing", "bytes"),
+        "files_processed": len(profiler.sources),
+        "answers": answers or {},
+        "sections_rendered": profiler.counters.get("sections_rendered", 0),
+        "cache_hits": {
+            Constants.COMMENTS_CACHE_NAME: profiler.counters.get("comment_cache_hits", 0),
+            Constants.SECTIONS_CACHE_NAME: profiler.counters.get("section_cache_hits", 0),
+        },
+        "files_written": stage_total("writing", "files"),
+        "bytes_written": stage_total("writing", "bytes"),
+        "stages": {
+            name: {
+                "wall_seconds": stage_profile.wall_seconds,
+                "cpu_seconds": stage_profile.cpu_seconds,
+                "files": stage_profile.files,
+                "bytes": stage_profile.bytes,
+            }
+            for name, stage_profile in profiler.stages.items()
+        },
+        "peak_rss_bytes": own_peak_rss,
+        "peak_worker_rss_bytes": workers_peak_rss,
+    }
+
+
+def format_prometheus(metrics: dict[str, Any]) -> str:
+    """
+    Format the metrics of a build in the Prometheus text format.
+
+    Parameters
+    ----------
+    metrics : dict[str, Any]
+        The metrics, from collect_metrics.
+
+    Returns
+    -------
+    str
+        The metrics as gauges, each labelled with the input directory, so that
+        the textfiles of several students can be collected side by side.
+    """
+
+    def label_value(value: Any) -> str:
+        """Escape a value to be quoted as the value of a label."""
+        return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    input_label = f'input_directory="{label_value(metrics["input_directory"])}"'
+    lines: list[str] = []
+
+    def add_gauge(name: str, description: str, samples: list[tuple[str, Any]]) -> None:
+        """Add a gauge and its samples that have a value, unless none of them do."""
+        samples = [(labels, value) for labels, value in samples if value is not None]
+        if not samples:
+            return
+
+        metric_name = f"{Constants.METRICS_PREFIX}_{name}"
+        lines.append(f"# HELP {metric_name} {description}")
+        lines.append(f"# TYPE {metric_name} gauge")
+        for labels, value in samples:
+            lines.append(f"{metric_name}{{{input_label}{labels}}} {value}")
+
+    add_gauge(
+        "build_info",
+        "The version of the build, and the jobs it used.",
+        [(f',version="{label_value(metrics["version"])}",jobs="{metrics["jobs"]}"', 1)],
+    )
+    add_gauge(
+        "last_run_timestamp_seconds",
+        "When the build finished, in seconds since the epoch.",
+        [("", metrics["timestamp"])],
+    )
+    for name, description in (
+        ("duration_seconds", "The wall time of the build, in seconds."),
+        ("cpu_seconds", "The CPU time of the build, not counting worker processes, in seconds."),
+        ("files_read", "The number of input files read."),
+        ("bytes_read", "The size of the input files read, in bytes."),
+        ("files_processed", "The number of C++ files processed for their comments."),
+        ("sections_rendered", "The number of sections rendered, not counting cached sections."),
+        ("files_written", "The number of output files written, not counting unchanged files."),
+        ("bytes_written", "The size of the output files written, in bytes."),
+        ("peak_rss_bytes", "The peak resident set size of the build, in bytes."),
+        ("peak_worker_rss_bytes", "The peak resident set size of any worker, in bytes."),
+    ):
+        add_gauge(name, description, [("", metrics[name])])
+
+    add_gauge(
+        "answers",
+        "The number of answers extracted from each week.",
+        [(f',week="{label_value(week)}"', count) for week, count in metrics["answers"].items()],
+    )
+    add_gauge(
+        "cache_hits",
+        "The number of results reused from each build cache.",
+        [(f',cache="{cache}"', hits) for cache, hits in metrics["cache_hits"].items()],
+    )
+    for measure, description in (
+        ("wall_seconds", "The wall time of each stage of the build, in seconds."),
+        ("cpu_seconds", "The CPU time of each stage of the build, in seconds."),
+        ("files", "The number of files handled by each stage of the build."),
+        ("bytes", "The size of the files handled by each stage of the build, in bytes."),
+    ):
+        add_gauge(
+            f"stage_{measure}",
+            description,
+            [(f',stage="{stage}"', values[measure]) for stage, values in metrics["stages"].items()],
+        )
+
+    return "\n".join(lines) + "\n"
+
+
+def save_metrics(metrics_file: Path, metrics: dict[str, Any]) -> None:
+    """
+    Save the metrics of a build.
+
+    Parameters
+    ----------
+    metrics_file : Path
+        Path to save the metrics to, as a Prometheus textfile if it ends in
+        Constants.METRICS_PROMETHEUS_SUFFIX and otherwise as JSON, or
+        Constants.STANDARD_OUTPUT for stdout.
+    metrics : dict[str, Any]
+        The metrics, from collect_metrics.
+
+    Notes
+    -----
+    The file is replaced atomically, so a collector never reads it partially
+    written.
+    """
+    if metrics_file.suffix == Constants.METRICS_PROMETHEUS_SUFFIX:
+        save_file(metrics_file, format_prometheus(metrics))
+    else:
+        save_file(metrics_file, json.dumps(metrics, indent=4) + "\n")
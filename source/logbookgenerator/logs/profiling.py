@@ -0,0 +1,350 @@
+"""profiling.py: Profiling of the stages of a build, which costs nothing when off."""
+
+import logging
+import sys
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from time import perf_counter, process_time
+from typing import Any, TypeVar
+
+from ..config.constants import Constants
+
+T = TypeVar("T")
+
+_EXHAUSTED = object()
+
+
+@dataclass(slots=True)
+class StageProfile:
+    """
+    The time spent in a stage of the build, and the files and bytes it handled.
+
+    Attributes
+    ----------
+    name : str
+        The name of the stage.
+    wall_seconds : float
+        The wall time spent in the stage, in seconds.
+    cpu_seconds : float
+        The CPU time of this process spent in the stage, in seconds.
+    files : int
+        The number of files the stage read, processed, rendered or wrote.
+    bytes : int
+        The size of those files, in bytes.
+    """
+
+    name: str
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    files: int = 0
+    bytes: int = 0
+
+
+class Profiler:
+    """
+    Profiles the stages of a build.
+
+    Attributes
+    ----------
+    enabled : bool
+        Whether profiling is enabled.
+    stages : dict[str, StageProfile]
+        The profile of each stage, in the order they were first entered.
+    sources : list[tuple[str, float, int]]
+        The name, processing time in seconds and size in bytes of each C++
+        file processed for its comments.
+    counters : dict[str, int]
+        Counts of events during the build, such as cache hits, keyed by name.
+
+    Notes
+    -----
+    Stage times are exclusive, so time spent in a stage entered within
+    another is only counted towards the inner stage. CPU times only count
+    this process, not any worker processes it waits on. When disabled,
+    entering a stage does nothing, and within hot loops, check enabled
+    before recording anything, so that not even the call is made.
+    """
+
+    __slots__ = (
+        "enabled",
+        "stages",
+        "sources",
+        "counters",
+        "_active_stages",
+        "_since",
+        "_profile",
+    )
+
+    def __init__(self, enabled: bool = False) -> None:
+        """
+        Initialise the profiler.
+
+        Parameters
+        ----------
+        enabled : bool, optional
+            Whether profiling is enabled, by default False
+        """
+        self.enabled = enabled
+        self.stages: dict[str, StageProfile] = {}
+        self.sources: list[tuple[str, float, int]] = []
+        self.counters: dict[str, int] = {}
+        self._active_stages: list[StageProfile] = []
+        self._since: tuple[float, float] = (0.0, 0.0)
+        self._profile: Any = None
+
+    def _charge_active_stage(self) -> None:
+        """Charge the time since the last switch between stages to the innermost stage."""
+        now = perf_counter(), process_time()
+
+        if self._active_stages:
+            self._active_stages[-1].wall_seconds += now[0] - self._since[0]
+            self._active_stages[-1].cpu_seconds += now[1] - self._since[1]
+
+        self._since = now
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        Time a stage of the build, within the block.
+
+        Parameters
+        ----------
+        name : str
+            The name of the stage. Time spent in the same stage more than once
+            is added together.
+
+        Yields
+        ------
+        None
+            Nothing, the stage is timed until the block is left.
+        """
+        if not self.enabled:
+            yield
+            return
+
+        self._charge_active_stage()
+        self._active_stages.append(self.stages.setdefault(name, StageProfile(name)))
+        try:
+            yield
+        finally:
+            self._charge_active_stage()
+            self._active_stages.pop()
+
+    def stage_items(self, name: str, items: Iterable[T], files: int = 1) -> Iterator[T]:
+        """
+        Time a stage that produces items, such as pieces of an output, as they are consumed.
+
+        Parameters
+        ----------
+        name : str
+            The name of the stage.
+        items : Iterable[T]
+            The items, such as the pieces of a rendered output.
+        files : int, optional
+            The number of files the items make up, by default 1
+
+        Yields
+        ------
+        T
+            Each item, counting the size of those that are strings as bytes of
+            the stage.
+
+        Notes
+        -----
+        Only producing each item is timed, so rendering an output as it is
+        written can be profiled apart from writing it.
+        """
+        iterator = iter(items)
+        self.count(name, files=files)
+
+        while True:
+            with self.stage(name):
+                item = next(iterator, _EXHAUSTED)
+                if isinstance(item, str):
+                    self.count(name, size=len(item.encode()))
+
+            if item is _EXHAUSTED:
+                return
+            yield item  # type: ignore[misc]
+
+    def count(self, name: str, files: int = 0, size: int = 0) -> None:
+        """
+        Count files and bytes towards a stage, if profiling is enabled.
+
+        Parameters
+        ----------
+        name : str
+            The name of the stage.
+        files : int, optional
+            The number of files, by default 0
+        size : int, optional
+            Their size in bytes, by default 0
+        """
+        if self.enabled:
+            stage_profile = self.stages.setdefault(name, StageProfile(name))
+            stage_profile.files += files
+            stage_profile.bytes += size
+
+    def increment(self, name: str, amount: int = 1) -> None:
+        """
+        Count an event during the build, if profiling is enabled.
+
+        Parameters
+        ----------
+        name : str
+            The name of the counter.
+        amount : int, optional
+            The number of events, by default 1
+        """
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def record_source(self, name: str, seconds: float, size: int) -> None:
+        """
+        Record how long a C++ file took to process for its comments.
+
+        Parameters
+        ----------
+        name : str
+            The name of the file.
+        seconds : float
+            The time it took, in seconds.
+        size : int
+            Its size in bytes.
+        """
+        self.sources.append((name, seconds, size))
+
+    def report(self, slowest_sources: int = Constants.PROFILE_SLOWEST_SOURCES) -> str:
+        """
+        Report the profile of each stage and the slowest files to process.
+
+        Parameters
+        ----------
+        slowest_sources : int, optional
+            The number of the slowest files to list, by default
+            Constants.PROFILE_SLOWEST_SOURCES. None are listed if 0.
+
+        Returns
+        -------
+        str
+            The report, as a table of the stages.
+        """
+        lines = [
+            f"{'Stage':<14} {'Wall (ms)':>10} {'CPU (ms)':>10} {'Files':>7} {'Bytes':>12}",
+        ]
+        for stage_profile in self.stages.values():
+            lines.append(
+                f"{stage_profile.name:<14} {stage_profile.wall_seconds * 1000:>10.1f} "
+                f"{stage_profile.cpu_seconds * 1000:>10.1f} {stage_profile.files:>7} "
+                f"{stage_profile.bytes:>12}"
+            )
+        lines.append(
+            f"{'total':<14} "
+            f"{sum(stage.wall_seconds for stage in self.stages.values()) * 1000:>10.1f} "
+            f"{sum(stage.cpu_seconds for stage in self.stages.values()) * 1000:>10.1f}"
+        )
+
+        if slowest_sources > 0 and self.sources:
+            lines.append("Slowest files to process:")
+            slowest = sorted(self.sources, key=lambda source: source[1], reverse=True)
+            for name, seconds, size in slowest[:slowest_sources]:
+                lines.append(f"  {seconds * 1000:>10.1f} ms {size:>12} bytes  {name}")
+
+        return "\n".join(lines)
+
+    def start_cprofile(self) -> None:
+        """Start profiling every function call of this process with cProfile."""
+        import cProfile
+
+        self._profile = cProfile.Profile()
+        self._profile.enable()
+
+    def save_cprofile(self, dump_file: Path) -> None:
+        """
+        Stop profiling function calls and save them, if cProfile was started.
+
+        Parameters
+        ----------
+        dump_file : Path
+            Path to save the profile to, which can be read by pstats or snakeviz.
+        """
+        if self._profile is None:
+            return
+
+        self._profile.disable()
+        dump_file.parent.mkdir(parents=True, exist_ok=True)
+        self._profile.dump_stats(dump_file)
+        self._profile = None
+
+
+_profiler = Profiler()
+
+
+def get_profiler() -> Profiler:
+    """
+    Get the profiler of this process.
+
+    Returns
+    -------
+    Profiler
+        The profiler, shared by every module.
+    """
+    return _profiler
+
+
+def enable_profiling(dump_file: Path | None = None) -> None:
+    """
+    Enable profiling the stages of the build, clearing any earlier profile.
+
+    Parameters
+    ----------
+    dump_file : Path | None, optional
+        Path to save a cProfile profile of every function call to, by default
+        None, which only profiles the stages. The profile is saved by
+        finish_profiling.
+    """
+    _profiler.enabled = True
+    _profiler.stages.clear()
+    _profiler.sources.clear()
+    _profiler.counters.clear()
+
+    if dump_file is not None:
+        _profiler.start_cprofile()
+
+
+def finish_profiling(
+    dump_file: Path | None = None,
+    slowest_sources: int = Constants.PROFILE_SLOWEST_SOURCES,
+    report: bool = True,
+) -> None:
+    """
+    Report the profile of the build, save any cProfile profile and stop profiling.
+
+    Parameters
+    ----------
+    dump_file : Path | None, optional
+        Path to save the cProfile profile to, if it was started, by default None
+    slowest_sources : int, optional
+        The number of the slowest files to list, by default
+        Constants.PROFILE_SLOWEST_SOURCES
+    report : bool, optional
+        Whether to report the profile, by default True, which is not needed
+        when profiling only to collect metrics.
+    """
+    if not _profiler.enabled:
+        return
+
+    logger = logging.getLogger(__name__)
+    if dump_file is not None:
+        _profiler.save_cprofile(dump_file)
+        logger.info(f"Saved the profile of every function call to {dump_file}")
+
+    if report:
+        # Printed rather than logged so the table is not wrapped, to stderr to keep stdout clean
+        profile_report = _profiler.report(slowest_sources)
+        logger.debug(f"Profile of the build:\n{profile_report}")
+        print(profile_report, file=sys.stderr)
+
+    _profiler.enabled = False
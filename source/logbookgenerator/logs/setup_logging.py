@@ -4,8 +4,6 @@ import logging
 import os
 from pathlib import Path
 
-from rich.logging import RichHandler
-
 from ..config.constants import Constants
 
 
@@ -43,6 +41,10 @@ def setup_logging(
 
     >>> setup_logging(console_logging_level="WARNING", file_logging_level="DEBUG")
     """
+    # rich is only imported once logging is needed, keeping startup fast
+    from rich.console import Console
+    from rich.logging import RichHandler
+
     valid_levels = {
         "CRITICAL": logging.CRITICAL,
         "ERROR": logging.ERROR,
@@ -74,8 +76,10 @@ def setup_logging(
         )
     )
 
-    # Set up console handler
-    console_handler = RichHandler(rich_tracebacks=Constants.LOGGING_TRACEBACKS)
+    # Set up console handler, on stderr so stdout is left for the output
+    console_handler = RichHandler(
+        console=Console(stderr=True), rich_tracebacks=Constants.LOGGING_TRACEBACKS
+    )
     console_handler.setLevel(valid_levels[console_logging_level])
     console_handler.setFormatter(
         logging.Formatter(
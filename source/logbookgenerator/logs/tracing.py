@@ -0,0 +1,180 @@
+"""tracing.py: Tracing for the hot paths of the application, which costs nothing when off."""
+
+import logging
+import os
+from collections.abc import Iterable
+
+from ..config.constants import Constants
+
+
+class Tracer:
+    """
+    Traces the hot paths of a single subsystem.
+
+    Attributes
+    ----------
+    subsystem : str
+        The subsystem being traced, one of Constants.TRACE_SUBSYSTEMS.
+    enabled : bool
+        Whether tracing is enabled for the subsystem.
+    logger : logging.Logger
+        The logger that traces are written to, at the DEBUG level.
+
+    Notes
+    -----
+    Trace messages use %-style arguments, which are only formatted once the
+    subsystem is enabled. Within hot loops, check enabled before tracing, so
+    that not even the call is made:
+
+    >>> tracer = get_tracer("lexing")
+    >>> if tracer.enabled:
+    ...     tracer("Lexed token: %s", token)
+    """
+
+    __slots__ = ("subsystem", "enabled", "logger")
+
+    def __init__(self, subsystem: str, enabled: bool = False) -> None:
+        """
+        Initialise the tracer.
+
+        Parameters
+        ----------
+        subsystem : str
+            The subsystem being traced.
+        enabled : bool, optional
+            Whether tracing is enabled for the subsystem, by default False
+        """
+        self.subsystem = subsystem
+        self.enabled = enabled
+        self.logger = logging.getLogger(f"{Constants.TRACE_LOGGER_NAME}.{subsystem}")
+
+    def __call__(self, message: str, *arguments: object) -> None:
+        """
+        Trace a message, if the subsystem is enabled.
+
+        Parameters
+        ----------
+        message : str
+            The message, with %-style placeholders for the arguments.
+        *arguments : object
+            The arguments, which are only formatted if the subsystem is enabled.
+        """
+        if self.enabled:
+            self.logger.debug(message, *arguments)
+
+
+def parse_subsystems(subsystems: Iterable[str]) -> set[str]:
+    """
+    Parse the names of the subsystems to trace.
+
+    Parameters
+    ----------
+    subsystems : Iterable[str]
+        The subsystems, where "all" stands for every subsystem.
+
+    Returns
+    -------
+    set[str]
+        The subsystems.
+
+    Raises
+    ------
+    ValueError
+        If a subsystem is not one of Constants.TRACE_SUBSYSTEMS.
+    """
+    parsed_subsystems = {subsystem.strip() for subsystem in subsystems if subsystem.strip()}
+
+    if Constants.TRACE_ALL in parsed_subsystems:
+        return set(Constants.TRACE_SUBSYSTEMS)
+
+    unknown_subsystems = parsed_subsystems - set(Constants.TRACE_SUBSYSTEMS)
+    if unknown_subsystems:
+        raise ValueError(
+            f"Unknown trace subsystems: {', '.join(sorted(unknown_subsystems))}. "
+            f"Valid subsystems are: {', '.join(Constants.TRACE_SUBSYSTEMS)}"
+        )
+
+    return parsed_subsystems
+
+
+def read_environment_subsystems() -> set[str]:
+    """
+    Read the subsystems to trace from the environment.
+
+    Returns
+    -------
+    set[str]
+        The subsystems listed in Constants.TRACE_ENVIRONMENT_VARIABLE, or none
+        if it lists an unknown subsystem.
+    """
+    try:
+        return parse_subsystems(os.environ.get(Constants.TRACE_ENVIRONMENT_VARIABLE, "").split(","))
+    except ValueError as error:
+        logging.getLogger(__name__).warning(
+            f"Ignoring {Constants.TRACE_ENVIRONMENT_VARIABLE}, as it is invalid: {error}"
+        )
+        return set()
+
+
+_tracers: dict[str, Tracer] = {}
+_enabled_subsystems: set[str] = read_environment_subsystems()
+
+
+def get_tracer(subsystem: str) -> Tracer:
+    """
+    Get the tracer for a subsystem.
+
+    Parameters
+    ----------
+    subsystem : str
+        The subsystem, one of Constants.TRACE_SUBSYSTEMS.
+
+    Returns
+    -------
+    Tracer
+        The subsystem's tracer, shared by every module in the subsystem.
+
+    Raises
+    ------
+    ValueError
+        If the subsystem is not one of Constants.TRACE_SUBSYSTEMS.
+    """
+    if subsystem not in _tracers:
+        parse_subsystems([subsystem])
+        _tracers[subsystem] = Tracer(subsystem, subsystem in _enabled_subsystems)
+
+    return _tracers[subsystem]
+
+
+def enable_tracing(subsystems: Iterable[str]) -> None:
+    """
+    Enable tracing for some subsystems, on top of any already enabled.
+
+    Parameters
+    ----------
+    subsystems : Iterable[str]
+        The subsystems, where "all" stands for every subsystem.
+
+    Raises
+    ------
+    ValueError
+        If a subsystem is not one of Constants.TRACE_SUBSYSTEMS.
+
+    Notes
+    -----
+    Tracing can also be enabled before the application starts, including in
+    batch worker processes, with a comma separated list of subsystems in the
+    environment variable Constants.TRACE_ENVIRONMENT_VARIABLE.
+    """
+    _enabled_subsystems.update(parse_subsystems(subsystems))
+
+    for subsystem, tracer in _tracers.items():
+        tracer.enabled = subsystem in _enabled_subsystems
+
+
+def disable_tracing() -> None:
+    """Disable tracing for every subsystem."""
+    _enabled_subsystems.clear()
+
+    for tracer in _tracers.values():
+        tracer.enabled = False
@@ -1,21 +1,299 @@
 """main.py: Called when the package is ran as a script."""
 
+from collections.abc import Collection, Iterable
+from logging import getLogger
 from logging import shutdown as shutdown_logging
 from pathlib import Path
-
-from yaml import YAMLError
+from typing import Any
 
 from .computation.config_generation import build_config_file
-from .computation.context_generation import generate_logbook_contexts
+from .computation.context_generation import (
+    generate_coursework_context,
+    generate_logbook_contexts,
+)
+from .computation.incremental import IncrementalBuild
+from .computation.models import CourseworkFile
 from .computation.parsing import parse_input_directory
-from .computation.render_context import create_coursework, create_logbook
+from .computation.render_context import (
+    logbook_section_order,
+    setup_template_environment,
+    stream_coursework,
+    stream_logbook,
+    stream_logbook_sections,
+)
 from .config.constants import Constants
-from .config.paths import cleanup_temporary_files
 from .interface.command_line import command_line_interface
+from .interface.watching import watch_for_changes
+from .logs.metrics import collect_metrics, count_answers, save_metrics
+from .logs.profiling import enable_profiling, finish_profiling, get_profiler
 from .logs.setup_logging import setup_logging
-from .utilities.file_handling import create_clean_code_files, load_yaml, save_file
+from .logs.tracing import enable_tracing
+from .utilities.caching import evict_cache_entries
+from .utilities.file_handling import (
+    create_clean_code_files,
+    load_yaml,
+    save_file,
+    save_output_files,
+)
+from .utilities.scanning import InputManifest, scan_input_directory
 from .utilities.validation import validate_input_directory
 
+logger = getLogger(__name__)
+
+
+def save_outputs(
+    output_file: Path,
+    logbook_markdown: str | Iterable[str] | None,
+    coursework_markdown: str | Iterable[str] | None,
+    clean_code: dict[str, str] | None,
+    targets: Collection[str] = Constants.BUILD_TARGETS,
+    remove_stale_code: bool = True,
+    logbook_sections: Iterable[tuple[str, Iterable[str]]] | None = None,
+) -> None:
+    """
+    Save the logbook and coursework files.
+
+    Parameters
+    ----------
+    output_file : Path
+        Path to save the logbook to, or Constants.STANDARD_OUTPUT for stdout.
+        The coursework is saved alongside it.
+    logbook_markdown : str | Iterable[str] | None
+        The rendered logbook, if it was built, either whole or as it is rendered.
+    coursework_markdown : str | Iterable[str] | None
+        The rendered coursework, if there is any, either whole or as it is
+        rendered.
+    clean_code : dict[str, str] | None
+        The clean coursework code, if there is any.
+    targets : Collection[str], optional
+        The outputs to save, from Constants.BUILD_TARGETS, by default all of them.
+    remove_stale_code : bool, optional
+        Whether to remove the clean code files of coursework that no longer
+        exists, and the sections of a split logbook that are no longer
+        rendered, by default True. Otherwise the sections that were rendered
+        are merged into the index of those already saved.
+    logbook_sections : Iterable[tuple[str, Iterable[str]]] | None, optional
+        The name and pieces of each section of the rendered logbook, by default
+        None. If given, each section is saved as its own file instead of
+        logbook_markdown, in a directory named after the output file.
+
+    Notes
+    -----
+    The logbook is written last, so that when it is given as it is rendered,
+    each section is written out as soon as it is rendered. Outputs that are
+    unchanged are not written again.
+    """
+    coursework_path = Path(output_file.parent / "coursework")
+
+    # Create the coursework files
+    if Constants.COURSEWORK_TARGET in targets and coursework_markdown is not None:
+        save_file(coursework_path / "coursework.md", coursework_markdown)
+
+    if Constants.CLEAN_CODE_TARGET in targets:
+        create_clean_code_files(coursework_path / "code", clean_code or {}, remove_stale_code)
+
+    # Write the logbook to the output file, or each of its sections to their own file
+    if Constants.LOGBOOK_TARGET in targets and logbook_sections is not None:
+        save_output_files(
+            output_file.with_suffix(""),
+            ((f"{section_name}.md", section) for section_name, section in logbook_sections),
+            manifest_name=Constants.SPLIT_INDEX_NAME,
+            remove_stale=remove_stale_code,
+            sort_key=lambda file_name: logbook_section_order(Path(file_name).stem),
+        )
+    elif Constants.LOGBOOK_TARGET in targets and logbook_markdown is not None:
+        save_file(output_file, logbook_markdown)
+
+
+def build_logbook(
+    user_arguments: dict[str, Any], config: dict[str, Any], manifest: InputManifest
+) -> dict[str, Any] | None:
+    """
+    Build the logbook once.
+
+    Parameters
+    ----------
+    user_arguments : dict[str, Any]
+        The arguments from the command line.
+    config : dict[str, Any]
+        The configuration file.
+    manifest : InputManifest
+        The manifest of the input directory.
+
+    Returns
+    -------
+    dict[str, Any] | None
+        The logbook contexts, if the logbook was built.
+
+    Notes
+    -----
+    Only the weeks and outputs selected in user_arguments are built. Without
+    the logbook, only the coursework files are processed, and without any of
+    the coursework outputs, the coursework is never generated. A split logbook
+    is saved a section at a time, so only one section is held in memory. When
+    profiling, each stage of the build is timed, and as the outputs are
+    rendered as they are written, rendering is timed apart from writing.
+    """
+    targets = user_arguments["targets"]
+    week_numbers = user_arguments["weeks"]
+    profiler = get_profiler()
+
+    # Parse through the input directory
+    with profiler.stage("parsing"):
+        weekly_files, coursework, references = parse_input_directory(
+            user_arguments["input_directory"],
+            jobs=user_arguments["jobs"],
+            manifest=manifest,
+            week_numbers=week_numbers,
+        )
+    if profiler.enabled:
+        read_contents = [
+            file_content
+            for weekly_file in weekly_files
+            for file_content in [
+                *weekly_file["cpp"].values(),  # type: ignore
+                weekly_file["reflection"],
+            ]
+        ]
+        references_entry = manifest.entries.get("references.yaml")
+        profiler.count(
+            "parsing",
+            files=len(read_contents) + (references_entry is not None),
+            size=sum(len(file_content.encode()) for file_content in read_contents)
+            + (references_entry.size if references_entry is not None else 0),
+        )
+
+    if Constants.COURSEWORK_TARGET not in targets and Constants.CLEAN_CODE_TARGET not in targets:
+        coursework = {}
+
+    # Create the template contexts
+    logbook_contexts: dict[str, Any] | None = None
+    coursework_context: dict[str, CourseworkFile] | None = None
+    clean_code: dict[str, str] | None = None
+    with profiler.stage("contexts"):
+        if Constants.LOGBOOK_TARGET in targets:
+            logbook_contexts, coursework_context, clean_code = generate_logbook_contexts(
+                config,
+                weekly_files,
+                coursework,
+                references,
+                user_arguments["cache_directory"],
+                user_arguments["jobs"],
+                week_numbers,
+            )
+        elif coursework:
+            coursework_context, clean_code = generate_coursework_context(
+                coursework, user_arguments["cache_directory"], user_arguments["jobs"]
+            )
+    profiler.count(
+        "contexts",
+        files=len(profiler.sources),
+        size=sum(size for _, _, size in profiler.sources),
+    )
+
+    # Render the logbook and coursework straight into the output files
+    logbook_markdown: Iterable[str] | None = None
+    logbook_sections: Iterable[tuple[str, Iterable[str]]] | None = None
+    if logbook_contexts is not None and user_arguments["split"]:
+        logbook_sections = stream_logbook_sections(
+            logbook_contexts,
+            cache_directory=user_arguments["cache_directory"],
+            jobs=user_arguments["jobs"],
+        )
+    elif logbook_contexts is not None:
+        logbook_markdown = stream_logbook(
+            logbook_contexts,
+            cache_directory=user_arguments["cache_directory"],
+            jobs=user_arguments["jobs"],
+        )
+
+    coursework_markdown: Iterable[str] | None = None
+    if coursework_context and Constants.COURSEWORK_TARGET in targets:
+        coursework_markdown = stream_coursework(
+            coursework_context,
+            cache_directory=user_arguments["cache_directory"],
+            jobs=user_arguments["jobs"],
+        )
+
+    if profiler.enabled:
+        if logbook_markdown is not None:
+            logbook_markdown = profiler.stage_items("rendering", logbook_markdown)
+        if coursework_markdown is not None:
+            coursework_markdown = profiler.stage_items("rendering", coursework_markdown)
+        if logbook_sections is not None:
+            logbook_sections = (
+                (section_name, profiler.stage_items("rendering", section))
+                for section_name, section in profiler.stage_items(
+                    "rendering", logbook_sections, files=0
+                )
+            )
+
+    with profiler.stage("writing"):
+        save_outputs(
+            user_arguments["output_file"],
+            logbook_markdown,
+            coursework_markdown,
+            clean_code,
+            targets,
+            remove_stale_code=week_numbers is None,
+            logbook_sections=logbook_sections,
+        )
+
+    return logbook_contexts
+
+
+def watch_logbook(user_arguments: dict[str, Any], config: dict[str, Any]) -> None:
+    """
+    Rebuild the logbook whenever the input directory changes.
+
+    Parameters
+    ----------
+    user_arguments : dict[str, Any]
+        The arguments from the command line.
+    config : dict[str, Any]
+        The configuration file.
+
+    Notes
+    -----
+    The process is kept alive between builds, and only the weeks and
+    coursework files affected by each change are rebuilt. Only the first
+    build uses more than one job, as the watcher may run in its own thread,
+    which forking the worker processes of a rebuild could deadlock. Stop
+    watching with Ctrl+C.
+    """
+    incremental_build = IncrementalBuild(
+        config,
+        user_arguments["input_directory"],
+        jobs=user_arguments["jobs"],
+        cache_directory=user_arguments["cache_directory"],
+    )
+
+    outputs = incremental_build.build()
+    if outputs is not None:
+        save_outputs(user_arguments["output_file"], *outputs)
+    logger.info(f"Watching {user_arguments['input_directory']} for changes...")
+
+    # Rebuilds only cover the changes, so are processed and rendered in this process
+    incremental_build.jobs = 1
+
+    try:
+        for changed_paths in watch_for_changes(user_arguments["input_directory"]):
+            logger.debug(f"Changed paths: {changed_paths}")
+
+            try:
+                outputs = incremental_build.build(changed_paths)
+            except Exception as error:
+                # Keep watching, as the input is often mid-edit when a build fails
+                logger.error(f"Rebuild failed, waiting for further changes: {error}")
+                incremental_build.reset()
+                continue
+
+            if outputs is not None:
+                save_outputs(user_arguments["output_file"], *outputs)
+                logger.info(f"Rebuilt {user_arguments['output_file']}.")
+    except KeyboardInterrupt:
+        logger.info("Stopped watching.")
+
 
 def main() -> None:
     """
@@ -37,40 +315,74 @@ def main() -> None:
             "DEBUG" if user_arguments["verbose"] else Constants.LOGGING_LEVEL_CONSOLE_DEFAULT
         ),
     )
+    enable_tracing(user_arguments["trace"])
+    profiler = get_profiler()
+    if user_arguments["profile"] or user_arguments["metrics_file"] is not None:
+        enable_profiling(user_arguments["profile_dump"])
 
-    # Validate the structure of the input directory
-    validate_input_directory(user_arguments["input_directory"])
+    with profiler.stage("validation"):
+        # Scan the input directory once, for both validation and parsing
+        manifest = scan_input_directory(user_arguments["input_directory"])
 
-    # Load the configuration file
-    try:
-        config = load_yaml(user_arguments["config_file"])
-    except YAMLError:
-        config_file = build_config_file()
-        config = load_yaml(config_file)
+        # Validate the structure of the input directory
+        validate_input_directory(user_arguments["input_directory"], manifest)
+    if profiler.enabled:
+        input_files = [
+            entry
+            for entries in (manifest.entries, *manifest.weeks.values())
+            for entry in entries.values()
+            if not entry.is_directory
+        ]
+        profiler.count(
+            "validation", files=len(input_files), size=sum(entry.size for entry in input_files)
+        )
 
-    # Parse through the input directory
-    weekly_files, coursework, references = parse_input_directory(user_arguments["input_directory"])
+    # Load the configuration file
+    with profiler.stage("configuration"):
+        from yaml import YAMLError
 
-    # Create the template contexts
-    logbook_contexts, coursework_context, clean_code = generate_logbook_contexts(
-        config, weekly_files, coursework, references
-    )
+        config_file = user_arguments["config_file"]
+        try:
+            config = load_yaml(config_file)
+        except YAMLError:
+            config_file = build_config_file()
+            config = load_yaml(config_file)
+    if profiler.enabled:
+        profiler.count("configuration", files=1, size=Path(config_file).stat().st_size)
 
-    # Create the logbook
-    logbook_markdown = create_logbook(logbook_contexts)
+    # Compile the templates once, reusing any compiled by earlier runs
+    with profiler.stage("templates"):
+        setup_template_environment(user_arguments["cache_directory"])
 
-    # Create the coursework files
-    if clean_code and coursework_context:
-        coursework_path = Path(user_arguments["output_file"].parent / "coursework")
+    logbook_contexts: dict[str, Any] | None = None
+    if user_arguments["watch"]:
+        watch_logbook(user_arguments, config)
+    else:
+        logbook_contexts = build_logbook(user_arguments, config, manifest)
 
-        create_clean_code_files(coursework_path / "code", clean_code)
+    # Keep the build cache within its size cap
+    if user_arguments["cache_directory"] is not None:
+        with profiler.stage("cache"):
+            for cache_name in (Constants.COMMENTS_CACHE_NAME, Constants.SECTIONS_CACHE_NAME):
+                evict_cache_entries(user_arguments["cache_directory"] / cache_name)
 
-        coursework_markdown = create_coursework(coursework_context)
+    # Save the metrics of the build, from its profile
+    if user_arguments["metrics_file"] is not None:
+        save_metrics(
+            user_arguments["metrics_file"],
+            collect_metrics(
+                profiler,
+                user_arguments,
+                count_answers(logbook_contexts["weeks"]) if logbook_contexts else None,
+            ),
+        )
+        logger.info(f"Saved the metrics of the build to {user_arguments['metrics_file']}")
 
-        save_file(coursework_path / "coursework.md", coursework_markdown)
-
-    # Write the logbook to the output file
-    save_file(user_arguments["output_file"], logbook_markdown)
+    finish_profiling(
+        user_arguments["profile_dump"],
+        user_arguments["profile_slowest"],
+        report=user_arguments["profile"],
+    )
 
     shutdown_logging()
 
@@ -81,5 +393,4 @@ if __name__ == "__main__":
     except Exception as e:
         print(f"An error occurred: {e}")
         shutdown_logging()
-        cleanup_temporary_files()
         raise e
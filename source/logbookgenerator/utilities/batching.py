@@ -0,0 +1,141 @@
+"""batching.py: Contains functions for finding the students to build in a batch."""
+
+from pathlib import Path
+from typing import Any
+
+from ..config.constants import Constants
+from . import logger
+from .file_handling import load_yaml
+
+logger = logger.getChild(__name__)
+
+
+def find_students(root_directory: Path, output_directory: Path) -> list[dict[str, Any]]:
+    """
+    Find the students within a cohort root directory.
+
+    Parameters
+    ----------
+    root_directory : Path
+        Path to the root directory, containing one directory per student.
+    output_directory : Path
+        Path to the directory to save each student's outputs in.
+
+    Returns
+    -------
+    list[dict[str, Any]]
+        The students, sorted by name, each with the keys "name",
+        "input_directory", "config_file" and "output_file".
+
+    Notes
+    -----
+    Expects a structure of:
+    ```
+    root_directory/
+    ├── student_1/
+    |   ├── weeks/
+    |   └── config.yaml
+    ├── student_2/
+    |   ├── weeks/
+    |   └── config.yaml
+    └── ...
+    ```
+    Any directory without an input directory is skipped.
+    """
+    students: list[dict[str, Any]] = []
+
+    for student_directory in sorted(root_directory.iterdir()):
+        input_directory = student_directory / Constants.DEFAULT_INPUT_DIRECTORY
+        if not input_directory.is_dir():
+            logger.debug(f"Skipping {student_directory}, as it has no input directory.")
+            continue
+
+        students.append(
+            {
+                "name": student_directory.name,
+                "input_directory": input_directory,
+                "config_file": student_directory / Constants.DEFAULT_CONFIG_FILE,
+                "output_file": (
+                    output_directory / student_directory.name / Constants.DEFAULT_OUTPUT_FILE.name
+                ),
+            }
+        )
+
+    logger.debug(f"Found {len(students)} students in {root_directory}")
+    return students
+
+
+def load_batch_manifest(manifest_file: Path, output_directory: Path) -> list[dict[str, Any]]:
+    """
+    Load the students from a batch manifest.
+
+    Parameters
+    ----------
+    manifest_file : Path
+        Path to the YAML batch manifest.
+    output_directory : Path
+        Path to the directory to save each student's outputs in, unless the
+        manifest gives an output file for the student.
+
+    Returns
+    -------
+    list[dict[str, Any]]
+        The students, in manifest order, each with the keys "name",
+        "input_directory", "config_file" and "output_file".
+
+    Raises
+    ------
+    ValueError
+        If a student in the manifest is missing a required key, or their name
+        is not a plain directory name or is shared with another student.
+
+    Notes
+    -----
+    The manifest has the following structure, where relative paths are
+    relative to the manifest file and output_file is optional. Each name is
+    used as the directory of the student's outputs, so it must be unique:
+    ```
+    ---
+    students:
+        - name: <student_name>
+          input_directory: <path>
+          config_file: <path>
+          output_file: <path>
+        - ...
+    ```
+    """
+    manifest_directory = manifest_file.parent
+    students: list[dict[str, Any]] = []
+    names: set[str] = set()
+
+    for student in load_yaml(manifest_file)["students"]:
+        missing_keys = {"name", "input_directory", "config_file"} - student.keys()
+        if missing_keys:
+            logger.error(f"Student {student} in {manifest_file} is missing {missing_keys}.")
+            raise ValueError(f"Student {student} in {manifest_file} is missing {missing_keys}.")
+
+        # Only ever save outputs directly within the output directory
+        name = str(student["name"])
+        if Path(name).name != name or name in ("", ".", ".."):
+            logger.error(f"Student name {name!r} in {manifest_file} is not a directory name.")
+            raise ValueError(f"Student name {name!r} in {manifest_file} is not a directory name.")
+        if name in names:
+            logger.error(f"Student name {name!r} appears more than once in {manifest_file}.")
+            raise ValueError(f"Student name {name!r} appears more than once in {manifest_file}.")
+        names.add(name)
+
+        students.append(
+            {
+                "name": name,
+                "input_directory": manifest_directory / student["input_directory"],
+                "config_file": manifest_directory / student["config_file"],
+                "output_file": (
+                    manifest_directory / student["output_file"]
+                    if "output_file" in student
+                    else output_directory / name / Constants.DEFAULT_OUTPUT_FILE.name
+                ),
+            }
+        )
+
+    logger.debug(f"Loaded {len(students)} students from {manifest_file}")
+    return students
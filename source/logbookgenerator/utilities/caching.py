@@ -0,0 +1,254 @@
+"""caching.py: Contains functions for the persistent on-disk build cache."""
+
+import json
+import os
+import tempfile
+from hashlib import sha256
+from pathlib import Path
+from typing import Any
+
+from ..computation.models import CodeSpan
+from ..config.constants import Constants
+from . import __version__, logger
+
+logger = logger.getChild(__name__)
+
+# Cache directories that could not be used, which are skipped for the rest of the process
+_unusable_cache_directories: set[Path] = set()
+
+
+def disable_cache_directory(cache_directory: Path, error: OSError) -> None:
+    """
+    Stop using a cache directory that cannot be used, such as one that is read only.
+
+    Parameters
+    ----------
+    cache_directory : Path
+        Path to the cache directory.
+    error : OSError
+        The error that using it raised.
+
+    Notes
+    -----
+    A warning is only logged for the first such directory, and the build
+    carries on without caching, as it would with caching disabled.
+    """
+    if not _unusable_cache_directories:
+        logger.warning(f"Building without the cache, as {cache_directory} cannot be used: {error}")
+    _unusable_cache_directories.add(cache_directory)
+
+
+def cache_key(*parts: str) -> str:
+    """
+    Create a cache key from some content.
+
+    Parameters
+    ----------
+    *parts : str
+        The content that the cached value depends on.
+
+    Returns
+    -------
+    str
+        A hex digest of the content, the tool version and the cache format.
+
+    Notes
+    -----
+    The tool version and Constants.CACHE_FORMAT_VERSION are part of every
+    key, so that neither upgrading the tool nor changing how results are
+    produced or stored ever reuses results from before.
+    """
+    hasher = sha256(f"{__version__}\0{Constants.CACHE_FORMAT_VERSION}".encode())
+
+    for part in parts:
+        hasher.update(b"\0")
+        hasher.update(part.encode())
+
+    return hasher.hexdigest()
+
+
+def fingerprint(value: Any) -> str:
+    """
+    Create a stable fingerprint of a value, such as the context of a template.
+
+    Parameters
+    ----------
+    value : Any
+        The value, made of JSON types, dataclasses, spans of code and anything
+        that can be converted to a string.
+
+    Returns
+    -------
+    str
+        The value serialised as JSON with sorted keys, ready to be hashed by
+        cache_key.
+
+    Notes
+    -----
+    Dataclasses are serialised by their fields, and any other value that is
+    not a JSON type by its string, so equal values always have equal
+    fingerprints. A span of code is serialised by a hash of the code it lies
+    within and its offsets, so that its string is never built just for the
+    fingerprint. Each buffer of code is only hashed once, however many spans
+    lie within it.
+    """
+    source_digests: dict[int, str] = {}
+
+    def serialise(unserialisable_value: Any) -> Any:
+        """Serialise a value that is not a JSON type."""
+        if isinstance(unserialisable_value, CodeSpan):
+            source = unserialisable_value.code
+            if id(source) not in source_digests:
+                source_digests[id(source)] = sha256(source.encode()).hexdigest()
+            return [
+                source_digests[id(source)],
+                unserialisable_value.start,
+                unserialisable_value.end,
+                unserialisable_value.after_comment,
+            ]
+
+        field_names = getattr(type(unserialisable_value), "__dataclass_fields__", None)
+        if field_names is not None:
+            return {
+                field_name: getattr(unserialisable_value, field_name) for field_name in field_names
+            }
+
+        return str(unserialisable_value)
+
+    return json.dumps(value, default=serialise, sort_keys=True)
+
+
+def load_cache_entry(cache_directory: Path, key: str) -> Any | None:
+    """
+    Load an entry from the cache.
+
+    Parameters
+    ----------
+    cache_directory : Path
+        Path to the cache directory.
+    key : str
+        The cache key.
+
+    Returns
+    -------
+    Any | None
+        The cached value, or None if there is no valid entry for the key.
+
+    Notes
+    -----
+    The modification time of the entry is bumped on every hit, so that
+    eviction can remove the least recently used entries first.
+    """
+    if cache_directory in _unusable_cache_directories:
+        return None
+
+    entry_path = cache_directory / f"{key}{Constants.CACHE_FILE_SUFFIX}"
+
+    try:
+        with open(entry_path) as file:
+            value = json.load(file)
+    except FileNotFoundError:
+        logger.debug(f"Cache miss for {key}")
+        return None
+    except NotADirectoryError as error:
+        disable_cache_directory(cache_directory, error)
+        return None
+    except (OSError, ValueError) as error:
+        logger.warning(f"Ignoring unreadable cache entry {entry_path}: {error}")
+        return None
+
+    try:
+        os.utime(entry_path)
+    except OSError:
+        pass  # The entry was evicted by another process, which is harmless
+
+    logger.debug(f"Cache hit for {key}")
+    return value
+
+
+def save_cache_entry(cache_directory: Path, key: str, value: Any) -> None:
+    """
+    Save an entry to the cache.
+
+    Parameters
+    ----------
+    cache_directory : Path
+        Path to the cache directory.
+    key : str
+        The cache key.
+    value : Any
+        The value to cache, which must be JSON serialisable.
+
+    Notes
+    -----
+    The entry is written to a temporary file and then renamed into place,
+    so that concurrent builds never read a partially written entry. If the
+    cache directory cannot be created or written to, nothing is cached.
+    """
+    if cache_directory in _unusable_cache_directories:
+        return
+
+    entry_path = cache_directory / f"{key}{Constants.CACHE_FILE_SUFFIX}"
+
+    try:
+        cache_directory.mkdir(parents=True, exist_ok=True)
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=cache_directory, suffix=".tmp")
+    except OSError as error:
+        disable_cache_directory(cache_directory, error)
+        return
+
+    try:
+        with os.fdopen(file_descriptor, "w") as file:
+            json.dump(value, file)
+        os.replace(temporary_path, entry_path)
+    except OSError as error:
+        logger.warning(f"Could not save cache entry {entry_path}: {error}")
+        Path(temporary_path).unlink(missing_ok=True)
+        return
+
+    logger.debug(f"Saved cache entry {key}")
+
+
+def evict_cache_entries(cache_directory: Path, max_size: int = Constants.CACHE_MAX_SIZE) -> None:
+    """
+    Evict the least recently used cache entries until the cache fits its size cap.
+
+    Parameters
+    ----------
+    cache_directory : Path
+        Path to the cache directory.
+    max_size : int, optional
+        The maximum total size of the cache in bytes, by default Constants.CACHE_MAX_SIZE
+    """
+    if cache_directory in _unusable_cache_directories or not cache_directory.is_dir():
+        return
+
+    entries: list[tuple[float, int, str]] = []
+    try:
+        with os.scandir(cache_directory) as directory_entries:
+            for entry in directory_entries:
+                if entry.is_file() and entry.name.endswith(Constants.CACHE_FILE_SUFFIX):
+                    entry_stat = entry.stat()
+                    entries.append((entry_stat.st_mtime, entry_stat.st_size, entry.path))
+    except OSError as error:
+        disable_cache_directory(cache_directory, error)
+        return
+
+    total_size = sum(size for _, size, _ in entries)
+    if total_size <= max_size:
+        return
+
+    # Remove the oldest entries first
+    for _, size, path in sorted(entries):
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+
+        total_size -= size
+        logger.debug(f"Evicted cache entry {path}")
+
+        if total_size <= max_size:
+            break
+
+    logger.debug(f"Cache at {cache_directory} is now {total_size} bytes")
@@ -1,10 +1,16 @@
 """file_handling.py: Contains functions for handling files."""
 
+import json
+import os
+import shutil
+import sys
+import tempfile
+from collections.abc import Callable, Iterable
 from pathlib import Path
 from typing import Any
 
-import yaml
-
+from ..config.constants import Constants
+from ..logs.profiling import get_profiler
 from . import logger
 
 logger = logger.getChild(__name__)
@@ -24,6 +30,8 @@ def load_yaml(yaml_path: Path) -> dict[str, Any]:
     dict[str, Any]
         The YAML file as a dictionary.
     """
+    import yaml
+
     with open(yaml_path) as file:
         try:
             logger.debug(f"Loading YAML file: {yaml_path}")
@@ -34,29 +42,224 @@ def load_yaml(yaml_path: Path) -> dict[str, Any]:
             raise error
 
 
-def save_file(file_path: Path, file_content: str) -> None:
+def current_umask() -> int:
+    """
+    Get the file mode creation mask of this process.
+
+    Returns
+    -------
+    int
+        The mask, which is left unchanged.
+    """
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+def files_match(first_path: Path, second_path: Path) -> bool:
+    """
+    Check whether two files have the same content.
+
+    Parameters
+    ----------
+    first_path : Path
+        Path to the first file.
+    second_path : Path
+        Path to the second file, which may not exist.
+
+    Returns
+    -------
+    bool
+        Whether both files exist and have the same content.
+
+    Notes
+    -----
+    The sizes are compared first, so files of different sizes are never read,
+    and otherwise the files are compared a chunk at a time.
+    """
+    try:
+        if first_path.stat().st_size != second_path.stat().st_size:
+            return False
+
+        with open(first_path, "rb") as first_file, open(second_path, "rb") as second_file:
+            while True:
+                first_chunk = first_file.read(Constants.FILE_COMPARISON_CHUNK_SIZE)
+                if first_chunk != second_file.read(Constants.FILE_COMPARISON_CHUNK_SIZE):
+                    return False
+                if not first_chunk:
+                    return True
+    except FileNotFoundError:
+        return False
+
+
+def save_file(file_path: Path, file_content: str | Iterable[str]) -> bool:
     """
-    Save the file.
+    Save the file, unless it already has the same content.
 
     Parameters
     ----------
     file_path : Path
-        Path to the file.
-    file_content : str
-        Content to save in the file.
+        Path to the file, or Constants.STANDARD_OUTPUT to write to stdout.
+    file_content : str | Iterable[str]
+        Content to save in the file, either whole or as pieces to write as
+        they are produced.
+
+    Returns
+    -------
+    bool
+        Whether the file was written, which is always the case for stdout.
+
+    Notes
+    -----
+    The content is written to a temporary file alongside the file. If the
+    file already has the same content, the temporary file is removed, so the
+    file and its modification time are left as they were. Otherwise it is
+    renamed into place, so the file is never seen partially written.
     """
+    if isinstance(file_content, str):
+        file_content = [file_content]
+
+    # Write to stdout, so the output can be piped into another program
+    if str(file_path) == Constants.STANDARD_OUTPUT:
+        logger.debug("Saving file to stdout")
+        sys.stdout.writelines(file_content)
+        sys.stdout.flush()
+        return True
+
     # Create the parent directories if they do not exist
     file_path.parent.mkdir(parents=True, exist_ok=True)
 
-    # Save the file
-    with open(file_path, "w") as file:
+    file_descriptor, temporary_name = tempfile.mkstemp(
+        dir=file_path.parent, prefix=f".{file_path.name}.", suffix=".tmp"
+    )
+    temporary_path = Path(temporary_name)
+    try:
+        with os.fdopen(file_descriptor, "w") as file:
+            file.writelines(file_content)
+
+        if files_match(temporary_path, file_path):
+            logger.debug(f"File is unchanged: {file_path}")
+            temporary_path.unlink()
+            return False
+
+        # Keep the mode of the file, or give a new file the usual mode
+        if file_path.exists():
+            shutil.copymode(file_path, temporary_path)
+        else:
+            temporary_path.chmod(0o666 & ~current_umask())
+
         logger.debug(f"Saving file: {file_path}")
-        file.write(file_content)
+        profiler = get_profiler()
+        if profiler.enabled:
+            profiler.count("writing", files=1, size=temporary_path.stat().st_size)
+        os.replace(temporary_path, file_path)
+    except BaseException:
+        temporary_path.unlink(missing_ok=True)
+        raise
+
+    return True
+
+
+def load_output_manifest(manifest_path: Path) -> list[str]:
+    """
+    Load the names of the files that were output into a directory.
+
+    Parameters
+    ----------
+    manifest_path : Path
+        Path to the manifest within the directory.
+
+    Returns
+    -------
+    list[str]
+        The names of the files, in order, or none if there is no valid manifest.
+    """
+    try:
+        with open(manifest_path) as file:
+            file_names = json.load(file)
+    except FileNotFoundError:
+        return []
+    except (OSError, ValueError) as error:
+        logger.warning(f"Ignoring unreadable output manifest {manifest_path}: {error}")
+        return []
+
+    # Only ever touch files directly within the directory
+    return [
+        file_name
+        for file_name in file_names
+        if isinstance(file_name, str) and file_name and Path(file_name).name == file_name
+    ]
 
 
-def create_clean_code_files(coursework_path: Path, clean_code: dict[str, str]) -> None:
+def save_output_files(
+    output_directory: Path,
+    output_files: Iterable[tuple[str, str | Iterable[str]]],
+    manifest_name: str = Constants.OUTPUT_MANIFEST_NAME,
+    remove_stale: bool = True,
+    sort_key: Callable[[str], Any] | None = None,
+) -> None:
     """
-    Create the clean code files.
+    Save several files into a directory, and remove those that are no longer output.
+
+    Parameters
+    ----------
+    output_directory : Path
+        Path to the directory.
+    output_files : Iterable[tuple[str, str | Iterable[str]]]
+        The name and content of each file, in order. Each content may be given
+        as pieces, which are written before the next file is taken.
+    manifest_name : str, optional
+        The name of the manifest within the directory, by default
+        Constants.OUTPUT_MANIFEST_NAME
+    remove_stale : bool, optional
+        Whether to remove the files listed in the manifest by an earlier call
+        that are not output by this one, by default True. Otherwise they are
+        kept, and stay listed after the files that were output.
+    sort_key : Callable[[str], Any] | None, optional
+        Key to order the names listed in the manifest by when stale files are
+        kept, by default None, which keeps the order described above.
+
+    Notes
+    -----
+    The manifest lists the files output into the directory in order, so that
+    files that are no longer output can be removed, without touching any other
+    files. Files that are unchanged are not written again.
+    """
+    manifest_path = output_directory / manifest_name
+    previous_file_names = load_output_manifest(manifest_path)
+    file_names: list[str] = []
+
+    for file_name, file_content in output_files:
+        if save_file(output_directory / file_name, file_content):
+            logger.info(f"Output file saved: {file_name} in {output_directory}.")
+        else:
+            logger.debug(f"Output file unchanged: {file_name} in {output_directory}.")
+        file_names.append(file_name)
+
+    if not file_names and not previous_file_names:
+        return
+
+    output_file_names = set(file_names)
+    stale_file_names = [
+        file_name for file_name in previous_file_names if file_name not in output_file_names
+    ]
+    if remove_stale:
+        for stale_file_name in stale_file_names:
+            (output_directory / stale_file_name).unlink(missing_ok=True)
+            logger.info(f"Stale output file removed: {stale_file_name} in {output_directory}.")
+    else:
+        file_names.extend(stale_file_names)
+        if sort_key is not None:
+            file_names.sort(key=sort_key)
+
+    save_file(manifest_path, json.dumps(file_names, indent=4))
+
+
+def create_clean_code_files(
+    coursework_path: Path, clean_code: dict[str, str], remove_stale: bool = True
+) -> None:
+    """
+    Create the clean code files, and remove those that are no longer output.
 
     Parameters
     ----------
@@ -64,7 +267,17 @@ def create_clean_code_files(coursework_path: Path, clean_code: dict[str, str]) -
         Path to the coursework directory.
     clean_code : dict[str, str]
         The clean code files.
+    remove_stale : bool, optional
+        Whether to remove the clean code files of coursework that is not in
+        clean_code, by default True. Builds of only some weeks keep them.
+
+    Notes
+    -----
+    The files are listed in the directory's Constants.OUTPUT_MANIFEST_NAME,
+    so that the files of coursework that no longer exists can be removed.
     """
-    for file_name, file_content in clean_code.items():
-        save_file(coursework_path / f"{file_name}.cpp", file_content)
-        logger.info(f"Clean code file created: {file_name} in {coursework_path}.")
+    save_output_files(
+        coursework_path,
+        ((f"{file_name}.cpp", file_content) for file_name, file_content in clean_code.items()),
+        remove_stale=remove_stale,
+    )
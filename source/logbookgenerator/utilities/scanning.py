@@ -0,0 +1,154 @@
+"""scanning.py: Contains functions for scanning the input directory in a single pass."""
+
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from . import logger
+
+logger = logger.getChild(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class ManifestEntry:
+    """
+    An entry within the input directory.
+
+    Attributes
+    ----------
+    path : Path
+        Path to the entry.
+    is_directory : bool
+        Whether the entry is a directory.
+    size : int
+        The size of the entry in bytes.
+    modified_time : int
+        The modification time of the entry in nanoseconds.
+    """
+
+    path: Path
+    is_directory: bool
+    size: int
+    modified_time: int
+
+    @property
+    def name(self) -> str:
+        """
+        The name of the entry.
+
+        Returns
+        -------
+        str
+            The final component of the entry's path.
+        """
+        return self.path.name
+
+
+@dataclass(slots=True)
+class InputManifest:
+    """
+    A manifest of the input directory, built by walking it once.
+
+    Attributes
+    ----------
+    input_directory : Path
+        Path to the input directory.
+    entries : dict[str, ManifestEntry]
+        The top-level entries of the input directory, keyed by name.
+    weeks : dict[str, dict[str, ManifestEntry]]
+        The entries of each week directory, keyed by week directory name and
+        then by entry name. Week directories are organised chronologically.
+    """
+
+    input_directory: Path
+    entries: dict[str, ManifestEntry] = field(default_factory=dict)
+    weeks: dict[str, dict[str, ManifestEntry]] = field(default_factory=dict)
+
+    def week_cpp_files(self, week: str) -> list[ManifestEntry]:
+        """
+        Get the CPP files within a week directory.
+
+        Parameters
+        ----------
+        week : str
+            The name of the week directory.
+
+        Returns
+        -------
+        list[ManifestEntry]
+            The CPP files, in directory order, matching what glob("*.cpp") finds.
+        """
+        return [
+            entry
+            for name, entry in self.weeks.get(week, {}).items()
+            if name.endswith(".cpp") and not name.startswith(".")
+        ]
+
+
+def scan_directory(directory: Path) -> dict[str, ManifestEntry]:
+    """
+    Scan the entries of a single directory.
+
+    Parameters
+    ----------
+    directory : Path
+        Path to the directory.
+
+    Returns
+    -------
+    dict[str, ManifestEntry]
+        The entries of the directory, keyed by name, in directory order.
+    """
+    entries: dict[str, ManifestEntry] = {}
+
+    with os.scandir(directory) as directory_entries:
+        for directory_entry in directory_entries:
+            entry_stat = directory_entry.stat()
+            entries[directory_entry.name] = ManifestEntry(
+                path=directory / directory_entry.name,
+                is_directory=directory_entry.is_dir(),
+                size=entry_stat.st_size,
+                modified_time=entry_stat.st_mtime_ns,
+            )
+
+    return entries
+
+
+def scan_input_directory(input_directory: Path) -> InputManifest:
+    """
+    Scan the input directory and its week directories.
+
+    Parameters
+    ----------
+    input_directory : Path
+        Path to the input directory.
+
+    Returns
+    -------
+    InputManifest
+        The manifest of the input directory.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the input directory does not exist.
+
+    Notes
+    -----
+    The input directory and each week directory are each listed exactly
+    once, so that validation and parsing need no further metadata calls.
+    """
+    try:
+        entries = scan_directory(input_directory)
+    except FileNotFoundError:
+        logger.error(f"Input directory {input_directory} does not exist.")
+        raise FileNotFoundError(f"Input directory {input_directory} does not exist.")
+
+    manifest = InputManifest(input_directory=input_directory, entries=entries)
+
+    for name in sorted(entries):
+        if name.startswith("week") and entries[name].is_directory:
+            manifest.weeks[name] = scan_directory(entries[name].path)
+
+    logger.debug(f"Scanned {input_directory}, found weeks: {list(manifest.weeks)}")
+    return manifest
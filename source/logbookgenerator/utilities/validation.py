@@ -5,6 +5,7 @@ from pathlib import Path
 
 from ..config.constants import Constants
 from . import logger
+from .scanning import InputManifest, scan_input_directory
 
 logger = logger.getChild(__name__)
 
@@ -84,7 +85,54 @@ def validate_date(date: str) -> str:
     raise ValueError("Date must be in the format YYYY-MM-DD.")
 
 
-def validate_input_directory(input_directory: Path) -> None:
+def parse_week_selection(selection: str, week_count: int | None = None) -> list[int]:
+    """
+    Parse a selection of week numbers, such as "3-5" or "1,3,7-9".
+
+    Parameters
+    ----------
+    selection : str
+        Comma separated week numbers and inclusive ranges of week numbers.
+    week_count : int | None, optional
+        The number of weeks that can be selected from, by default None, which
+        allows any week number.
+
+    Returns
+    -------
+    list[int]
+        The selected week numbers, sorted and without duplicates.
+
+    Raises
+    ------
+    ValueError
+        If the selection is not made of week numbers and ranges, or a week
+        number is less than 1 or more than week_count, or a range is backwards.
+    """
+    week_numbers: set[int] = set()
+
+    for part in selection.split(","):
+        match = re.match(Constants.WEEK_SELECTION_REGEX, part.strip())
+        if match is None:
+            raise ValueError(f"Invalid week selection {part.strip()!r}, expected such as 3 or 3-5.")
+
+        first_week = int(match.group(1))
+        last_week = int(match.group(2) or first_week)
+        if first_week < 1 or last_week < first_week:
+            raise ValueError(f"Invalid week range {part.strip()!r}, weeks are numbered from 1.")
+
+        week_numbers.update(range(first_week, last_week + 1))
+
+    if week_count is not None and week_numbers and max(week_numbers) > week_count:
+        missing_weeks = [str(number) for number in sorted(week_numbers) if number > week_count]
+        raise ValueError(
+            f"There is no week {', '.join(missing_weeks)}, as there are only {week_count} weeks."
+        )
+
+    logger.debug(f"Selected weeks: {sorted(week_numbers)}")
+    return sorted(week_numbers)
+
+
+def validate_input_directory(input_directory: Path, manifest: InputManifest | None = None) -> None:
     """
     Validate that the input directory exists and is not empty.
 
@@ -92,6 +140,9 @@ def validate_input_directory(input_directory: Path) -> None:
     ----------
     input_directory : Path
         The input directory to validate.
+    manifest : InputManifest | None, optional
+        A manifest of the input directory, by default None, which scans the
+        input directory.
 
     Raises
     ------
@@ -124,32 +175,30 @@ def validate_input_directory(input_directory: Path) -> None:
     This is the same with the references file.
     There must be at least one week directory, with at least one file in it, though.
     """
-    # Check if the input directory exists
-    if not input_directory.exists():
-        logger.error(f"Input directory {input_directory} does not exist.")
-        raise FileNotFoundError(f"Input directory {input_directory} does not exist.")
+    # Check if the input directory exists, scanning it if it has not been already
+    if manifest is None:
+        manifest = scan_input_directory(input_directory)
 
     # Check if the input directory is empty
-    if not any(input_directory.iterdir()):
+    if not manifest.entries:
         logger.error(f"Input directory {input_directory} is empty.")
         raise ValueError(f"Input directory {input_directory} is empty.")
 
     # Check if there is at least one week directory with at least one file
-    week_directories = list(input_directory.glob("week*"))
+    week_directories = [name for name in manifest.entries if name.startswith("week")]
     if not week_directories:
         logger.error(f"Input directory {input_directory} does not have any week directories.")
         raise ValueError(f"Input directory {input_directory} does not have any week directories.")
 
     # Check if there is at least one file in each week directory
     for week_directory in week_directories:
-        week_files = list(week_directory.glob("*.cpp"))
-        if not week_files:
-            logger.error(f"Week directory {week_directory} does not have any week files.")
-            raise ValueError(f"Week directory {week_directory} does not have any week files.")
+        if not manifest.week_cpp_files(week_directory):
+            week_path = input_directory / week_directory
+            logger.error(f"Week directory {week_path} does not have any week files.")
+            raise ValueError(f"Week directory {week_path} does not have any week files.")
 
     # Check if there is a references file
-    references_file = input_directory / "references.yaml"
-    if not references_file.exists():
+    if "references.yaml" not in manifest.entries:
         logger.warning(f"Input directory {input_directory} does not have a references file.")
 
     logger.info(f"Input directory {input_directory} is valid.")
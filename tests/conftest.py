@@ -0,0 +1,99 @@
+"""conftest.py: Shared fixtures for the tests."""
+
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+WEEK_FILES: dict[str, dict[str, str]] = {
+    "week1": {
+        "l01-basics-hello_world.cpp": (
+            "#include <iostream>\n"
+            "\n"
+            "int main() {\n"
+            '    std::cout << "Hello" << std::endl;\n'
+            "    /* ANSWER (Task 1.1): Prints hello. */\n"
+            "    return 0;\n"
+            "}\n"
+        ),
+        "e01-extra-thing.cpp": "int f() { return 1; }\n",
+        "reflection.md": "Week one reflection.\n",
+    },
+    "week2": {
+        "l01-loops-for_loop.cpp": (
+            "int main() {\n"
+            "    for (int i = 0; i < 3; i++) {}\n"
+            "    /* ANSWER (Task 2.1): Loops thrice. */\n"
+            "    return 0;\n"
+            "}\n"
+        ),
+        "e02-coursework-solver.cpp": (
+            "#include <cmath>\n"
+            "double solve(double x) {\n"
+            "    return std::sqrt(x);\n"
+            "    /* ANSWER (Task 1.1): Square root. */\n"
+            "}\n"
+        ),
+        "reflection.md": "Week two reflection.\n",
+    },
+}
+
+REFERENCES_FILE: str = (
+    "references:\n"
+    "  - description: Something\n"
+    "    title: A Book\n"
+    "    year: 2020\n"
+    "    url: http://example.com\n"
+    '    date_accessed: "2024-01-01"\n'
+)
+
+
+@pytest.fixture
+def input_directory(tmp_path: Path) -> Path:
+    """
+    Create a small input directory with two weeks of files.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        The pytest temporary directory.
+
+    Returns
+    -------
+    Path
+        Path to the input directory.
+    """
+    input_path = tmp_path / "weeks"
+
+    for week, files in WEEK_FILES.items():
+        week_path = input_path / week
+        week_path.mkdir(parents=True)
+        for file_name, file_contents in files.items():
+            (week_path / file_name).write_text(file_contents)
+
+    (input_path / "references.yaml").write_text(REFERENCES_FILE)
+
+    return input_path
+
+
+@pytest.fixture
+def config() -> dict[str, Any]:
+    """
+    Create a configuration for the logbook.
+
+    Returns
+    -------
+    dict[str, Any]
+        The configuration.
+    """
+    return {
+        "module": {
+            "code": "MTH2008",
+            "name": "Scientific Computing",
+            "semester": "Semester A",
+            "year": 2024,
+        },
+        "statement": {"text": "Statement."},
+        "student": {"id": 12345678, "name": "Test Student"},
+        "university": {"department": "Department", "name": "University", "start": "2024-09-23"},
+    }
@@ -0,0 +1,130 @@
+"""test_batching.py: Tests for building the logbooks of a whole cohort at once."""
+
+import logging
+import shutil
+import sys
+from pathlib import Path
+from typing import Any
+
+import pytest
+import yaml
+from logbookgenerator import batch
+from logbookgenerator.utilities.batching import find_students, load_batch_manifest
+
+
+def test_students_are_found_and_loaded(input_directory: Path, tmp_path: Path) -> None:
+    """
+    Test that a cohort root directory and a batch manifest give the same students.
+
+    Parameters
+    ----------
+    input_directory : Path
+        The input directory fixture.
+    tmp_path : Path
+        A temporary directory.
+    """
+    root_directory = tmp_path / "cohort"
+    for name in ("bob", "alice"):
+        shutil.copytree(input_directory, root_directory / name / "weeks")
+    (root_directory / "notes").mkdir()
+
+    manifest_file = root_directory / "batch.yaml"
+    manifest_file.write_text(
+        "students:\n"
+        + "".join(
+            f"  - name: {name}\n"
+            f"    input_directory: {name}/weeks\n"
+            f"    config_file: {name}/config.yaml\n"
+            for name in ("alice", "bob")
+        )
+    )
+
+    students = find_students(root_directory, tmp_path / "output")
+
+    assert [student["name"] for student in students] == ["alice", "bob"]
+    assert students[0]["output_file"] == tmp_path / "output" / "alice" / "logbook.md"
+    assert load_batch_manifest(manifest_file, tmp_path / "output") == students
+
+
+@pytest.mark.parametrize("names", [["../escaped"], ["alice/bob"], [".."], ["alice", "alice"]])
+def test_unsafe_student_names_are_rejected(tmp_path: Path, names: list[str]) -> None:
+    """
+    Test that a manifest cannot save outputs outside the output directory, or over each other.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        A temporary directory.
+    names : list[str]
+        The names of the students in the manifest.
+    """
+    manifest_file = tmp_path / "batch.yaml"
+    manifest_file.write_text(
+        "students:\n"
+        + "".join(
+            f'  - name: "{name}"\n    input_directory: weeks\n    config_file: config.yaml\n'
+            for name in names
+        )
+    )
+
+    with pytest.raises(ValueError):
+        load_batch_manifest(manifest_file, tmp_path / "output")
+
+
+def test_batch_builds_every_student(
+    input_directory: Path,
+    config: dict[str, Any],
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """
+    Test that a batch builds each student's logbook in its own directory, despite failures.
+
+    Parameters
+    ----------
+    input_directory : Path
+        The input directory fixture.
+    config : dict[str, Any]
+        The configuration fixture.
+    tmp_path : Path
+        A temporary directory.
+    monkeypatch : pytest.MonkeyPatch
+        The monkeypatch fixture.
+    """
+    root_directory = tmp_path / "cohort"
+    for name in ("alice", "bob", "carol"):
+        shutil.copytree(input_directory, root_directory / name / "weeks")
+        if name != "carol":
+            (root_directory / name / "config.yaml").write_text(yaml.safe_dump(config))
+
+    # Keep the logging set up by the batch from outliving the test
+    root_logger = logging.getLogger()
+    monkeypatch.setattr(root_logger, "handlers", [])
+    monkeypatch.setattr(root_logger, "level", root_logger.level)
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [
+            "logbookgenerator-batch",
+            "--root_directory",
+            str(root_directory),
+            "--output_directory",
+            str(tmp_path / "output"),
+            "--jobs",
+            "2",
+            "--no_cache",
+            "--log_output_location",
+            str(tmp_path / "log.txt"),
+        ],
+    )
+
+    with pytest.raises(SystemExit) as exit_info:
+        batch.main()
+
+    assert exit_info.value.code == 1
+    for name in ("alice", "bob"):
+        logbook = (tmp_path / "output" / name / "logbook.md").read_text()
+        assert "Week two reflection." in logbook
+        assert (tmp_path / "output" / name / "coursework" / "code" / "solver.cpp").exists()
+    assert not (tmp_path / "output" / "carol").exists()
+    assert "FAILED carol" in (tmp_path / "log.txt").read_text()
@@ -0,0 +1,115 @@
+"""test_caching.py: Tests for the persistent build cache."""
+
+import os
+from pathlib import Path
+
+import pytest
+from logbookgenerator.computation.code_processing import process_file_comments
+from logbookgenerator.computation.models import CodeSpan
+from logbookgenerator.utilities import caching
+from logbookgenerator.utilities.caching import (
+    cache_key,
+    evict_cache_entries,
+    fingerprint,
+    load_cache_entry,
+    save_cache_entry,
+)
+
+CODE = "int main() {\n    return 0;\n    /* ANSWER (Task 1.1): Returns zero. */\n}\n"
+
+
+def test_cached_result_matches_uncached(tmp_path: Path) -> None:
+    """
+    Test that a cached result is identical to processing the file again.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        The pytest temporary directory.
+    """
+    uncached_result = process_file_comments(CODE, remove_comments=True)
+    first_result = process_file_comments(CODE, remove_comments=True, cache_directory=tmp_path)
+    second_result = process_file_comments(CODE, remove_comments=True, cache_directory=tmp_path)
+
+    assert first_result == uncached_result
+    assert second_result == uncached_result
+    assert len(list((tmp_path / "comments").iterdir())) == 1
+
+
+def test_eviction_removes_least_recently_used(tmp_path: Path) -> None:
+    """
+    Test that eviction removes the least recently used entries first.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        The pytest temporary directory.
+    """
+    keys = [cache_key(str(index)) for index in range(3)]
+    for age, key in enumerate(keys):
+        save_cache_entry(tmp_path, key, "x" * 100)
+        os.utime(tmp_path / f"{key}.json", (1000 + age, 1000 + age))
+
+    # Reading the oldest entry makes it the most recently used
+    assert load_cache_entry(tmp_path, keys[0]) == "x" * 100
+
+    evict_cache_entries(tmp_path, max_size=250)
+
+    assert load_cache_entry(tmp_path, keys[0]) is not None
+    assert load_cache_entry(tmp_path, keys[1]) is None
+    assert load_cache_entry(tmp_path, keys[2]) is not None
+
+
+def test_unusable_cache_directory_is_skipped(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """
+    Test that a cache directory that cannot be created falls back to building without the cache.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        The pytest temporary directory.
+    monkeypatch : pytest.MonkeyPatch
+        The monkeypatch fixture.
+    """
+    monkeypatch.setattr(caching, "_unusable_cache_directories", set())
+    (tmp_path / "file").write_text("not a directory")
+    cache_directory = tmp_path / "file" / "cache"
+
+    uncached_result = process_file_comments(CODE, remove_comments=True)
+    for _ in range(2):
+        assert (
+            process_file_comments(CODE, remove_comments=True, cache_directory=cache_directory)
+            == uncached_result
+        )
+
+    evict_cache_entries(cache_directory, max_size=0)
+    assert caching._unusable_cache_directories == {cache_directory / "comments"}
+
+
+def test_spans_are_fingerprinted_without_their_code(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Test that a span of code is fingerprinted by its source and offsets, not by its code.
+
+    Parameters
+    ----------
+    monkeypatch : pytest.MonkeyPatch
+        The monkeypatch fixture.
+    """
+
+    def build_code(_: CodeSpan) -> str:
+        """Fail if the code of a span is built."""
+        raise AssertionError("The code of the span was built")
+
+    monkeypatch.setattr(CodeSpan, "__str__", build_code)
+
+    assert fingerprint({"code": CodeSpan(CODE, 0, 12, False)}) == fingerprint(
+        {"code": CodeSpan(CODE[:-1] + "\n", 0, 12, False)}
+    )
+    assert fingerprint({"code": CodeSpan(CODE, 0, 12, False)}) != fingerprint(
+        {"code": CodeSpan(CODE, 0, 13, False)}
+    )
+    assert fingerprint({"code": CodeSpan(CODE, 0, 12, False)}) != fingerprint(
+        {"code": CodeSpan(CODE.replace("0", "1"), 0, 12, False)}
+    )
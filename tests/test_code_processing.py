@@ -0,0 +1,123 @@
+"""test_code_processing.py: Tests for processing the comments in the code files."""
+
+import pytest
+from logbookgenerator.computation.code_processing import (
+    process_code_comments,
+    process_file_comments,
+    process_files_comments,
+    scan_code_comments,
+)
+from logbookgenerator.computation.models import CodeSpan
+from logbookgenerator.config.constants import Constants
+
+CODE = (
+    "#include <iostream>\n"
+    "int main() {\n"
+    "    int x = 1;\n"
+    "    /* ANSWER (Task 1.1): Declares x. */\n"
+    "    std::cout << x;\n"
+    "    /* Not an answer. */\n"
+    "    return 0;\n"
+    "    /* ANSWER (Task 1.2): Returns zero. */\n"
+    "}\n"
+)
+
+
+def test_process_code_comments() -> None:
+    """Test that answer comments are extracted with the code preceding them."""
+    task_comments, clean_code = process_code_comments(CODE.splitlines(), remove_comments=True)
+
+    assert task_comments == {
+        "Task_1_1": [("Declares x.", "#include <iostream>\nint main() {\nint x = 1;")],
+        "Task_1_2": [("Returns zero.", "return 0;")],
+    }
+    assert clean_code == (
+        "#include <iostream>\nint main() {\n    int x = 1;\n"
+        "    std::cout << x;\n    return 0;\n}"
+    )
+
+
+def test_comments_are_lexed_in_context() -> None:
+    """Test block answers, mid-line comments and comment markers within strings."""
+    code = (
+        'const char* text = "/* not a comment */ // nor this";\n'
+        "int y = 2;  // a trailing comment\n"
+        "/**\n"
+        " * ANSWER (Task 2.1):\n"
+        " * Sets y.\n"
+        " * ```\n"
+        " * *p = y;\n"
+        " * ```\n"
+        " */\n"
+        "y++; /* ANSWER (Task 2.2): Increments y. */\n"
+        "// A comment on its own line\n"
+    )
+
+    task_comments, clean_code = process_code_comments(code.splitlines(), remove_comments=True)
+
+    assert task_comments == {
+        "Task_2_1": [
+            (
+                "Sets y.\n\n```\n*p = y;\n```",
+                'const char* text = "/* not a comment */ // nor this";\n'
+                "int y = 2;  // a trailing comment",
+            )
+        ],
+        "Task_2_2": [("Increments y.", "y++;")],
+    }
+    assert clean_code == (
+        'const char* text = "/* not a comment */ // nor this";\n'
+        "int y = 2;  // a trailing comment\ny++;\n// A comment on its own line"
+    )
+
+
+def test_line_comments_are_kept_in_the_code() -> None:
+    """Test that a line comment on its own line is part of the answer's code, not its end."""
+    code = (
+        "int main() {\n"
+        "// compute sum\n"
+        "int s = a + b;\n"
+        "// print it\n"
+        "cout << s; /* why */\n"
+        "/* ANSWER (Task 3.1): Prints the sum. */\n"
+    )
+    expected_code = (
+        "int main() {\n// compute sum\nint s = a + b;\n// print it\ncout << s; /* why */"
+    )
+
+    task_comments, clean_code = scan_code_comments(code, remove_comments=True)
+
+    assert task_comments == {"Task_3_1": [("Prints the sum.", expected_code)]}
+    assert clean_code == expected_code
+
+
+def test_scan_whole_file() -> None:
+    """Test that scanning a whole file ignores its line endings, and skips files without answers."""
+    assert scan_code_comments(CODE.replace("\n", "\r\n"), True) == process_code_comments(
+        CODE.splitlines(), remove_comments=True
+    )
+
+    plain_code = CODE.replace("ANSWER", "NOTE")
+    assert scan_code_comments(plain_code, True) == (plain_code.rstrip("\n"),) * 2
+
+
+def test_parallel_processing_matches_serial(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that processing files over a process pool keeps their order and results."""
+    monkeypatch.setattr(Constants, "PARALLEL_PROCESSING_MINIMUM_SIZE", 0)
+    file_contents = [
+        CODE.replace("Task 1.", f"Task {index}.") if index % 3 else CODE.replace("ANSWER", "NOTE")
+        for index in range(12)
+    ]
+
+    results = process_files_comments(file_contents, remove_comments=True, jobs=2)
+
+    assert results == [process_file_comments(content, True) for content in file_contents]
+
+
+def test_answer_code_is_a_span_of_the_file() -> None:
+    """Test that answer code without comments is kept as a span of the file."""
+    task_comments, _ = scan_code_comments(CODE)
+
+    first_code = task_comments["Task_1_1"][0][1]  # type: ignore
+    assert isinstance(first_code, CodeSpan)
+    assert str(first_code) == "#include <iostream>\nint main() {\nint x = 1;"
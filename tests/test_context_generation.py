@@ -0,0 +1,108 @@
+"""test_context_generation.py: Tests for generating the contexts for the logbook."""
+
+import shutil
+from pathlib import Path
+from typing import Any
+
+import pytest
+from logbookgenerator.computation import code_processing
+from logbookgenerator.computation.context_generation import generate_logbook_contexts
+from logbookgenerator.computation.models import Answer, CourseworkFile, Task
+from logbookgenerator.computation.parsing import parse_input_directory
+
+
+def test_coursework_is_processed_once(
+    input_directory: Path, config: dict[str, Any], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """
+    Test that each file, including coursework, is scanned exactly once.
+
+    Parameters
+    ----------
+    input_directory : Path
+        The input directory fixture.
+    config : dict[str, Any]
+        The configuration fixture.
+    monkeypatch : pytest.MonkeyPatch
+        The monkeypatch fixture.
+    """
+    scanned_code: list[str] = []
+    scan_code_comments = code_processing.scan_code_comments
+
+    def counting_scan_code_comments(code: str, remove_comments: bool = False) -> Any:
+        scanned_code.append(code)
+        return scan_code_comments(code, remove_comments)
+
+    monkeypatch.setattr(code_processing, "scan_code_comments", counting_scan_code_comments)
+    weekly_files, coursework, references = parse_input_directory(input_directory)
+
+    logbook_contexts, coursework_context, clean_code = generate_logbook_contexts(
+        config, weekly_files, coursework, references
+    )
+
+    assert len(scanned_code) == len(set(scanned_code)) == 4
+    assert coursework_context == {
+        "solver": CourseworkFile("solver", logbook_contexts["weeks"]["2"].extra_tasks["02"].answers)
+    }
+    assert clean_code == {
+        "solver": "#include <cmath>\ndouble solve(double x) {\n    return std::sqrt(x);\n}"
+    }
+
+
+def test_logbook_without_coursework(input_directory: Path, config: dict[str, Any]) -> None:
+    """
+    Test that a logbook without any coursework files has no coursework outputs.
+
+    Parameters
+    ----------
+    input_directory : Path
+        The input directory fixture.
+    config : dict[str, Any]
+        The configuration fixture.
+    """
+    (input_directory / "week2" / "e02-coursework-solver.cpp").unlink()
+    shutil.rmtree(input_directory / "week1")
+
+    logbook_contexts, coursework_context, clean_code = generate_logbook_contexts(
+        config, *parse_input_directory(input_directory)
+    )
+
+    assert list(logbook_contexts["weeks"]) == ["1"]
+    assert coursework_context is None
+    assert clean_code is None
+
+
+def test_weeks_are_built_from_the_model(input_directory: Path, config: dict[str, Any]) -> None:
+    """
+    Test that the weeks hold their tasks and answers in the slotted data model.
+
+    Parameters
+    ----------
+    input_directory : Path
+        The input directory fixture.
+    config : dict[str, Any]
+        The configuration fixture.
+    """
+    logbook_contexts, _, _ = generate_logbook_contexts(
+        config, *parse_input_directory(input_directory)
+    )
+    first_week = logbook_contexts["weeks"]["1"]
+
+    assert first_week.number == 1
+    assert first_week.lab_tasks == {
+        "01": Task(
+            "Basics",
+            "Hello World",
+            {
+                "Task_1_1": [
+                    Answer(
+                        "Prints hello.",
+                        '#include <iostream>\n\nint main() {\nstd::cout << "Hello" << std::endl;',
+                    )
+                ]
+            },
+        )
+    }
+    assert first_week.extra_tasks["01"].answers == {}
+    assert first_week.extra_tasks["01"].code == "int f() { return 1; }"
+    assert not hasattr(first_week, "__dict__")
@@ -0,0 +1,78 @@
+"""test_file_handling.py: Tests for saving the output files."""
+
+import os
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from logbookgenerator.utilities.file_handling import create_clean_code_files, save_file
+
+
+def test_unchanged_files_are_not_rewritten(tmp_path: Path) -> None:
+    """
+    Test that saving a file with the same content leaves it untouched.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        A temporary directory.
+    """
+    file_path = tmp_path / "renders" / "logbook.md"
+
+    assert save_file(file_path, ["# Logbook\n", "Week 1\n"])
+    os.utime(file_path, (0, 0))
+
+    assert not save_file(file_path, "# Logbook\nWeek 1\n")
+    assert file_path.stat().st_mtime == 0
+
+    assert save_file(file_path, "# Logbook\nWeek 2\n")
+    assert file_path.read_text() == "# Logbook\nWeek 2\n"
+    assert file_path.stat().st_mtime != 0
+    assert list(file_path.parent.iterdir()) == [file_path]
+
+
+def test_failed_save_keeps_the_file(tmp_path: Path) -> None:
+    """
+    Test that a save which fails part way through leaves the old file in place.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        A temporary directory.
+    """
+    file_path = tmp_path / "logbook.md"
+    save_file(file_path, "# Logbook\n")
+
+    def failing_content() -> Iterator[str]:
+        yield "# New\n"
+        raise RuntimeError("Rendering failed.")
+
+    with pytest.raises(RuntimeError):
+        save_file(file_path, failing_content())
+
+    assert file_path.read_text() == "# Logbook\n"
+    assert list(tmp_path.iterdir()) == [file_path]
+
+
+def test_stale_clean_code_files_are_removed(tmp_path: Path) -> None:
+    """
+    Test that only the clean code files of removed coursework are deleted.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        A temporary directory.
+    """
+    code_path = tmp_path / "code"
+    code_path.mkdir()
+    (code_path / "notes.cpp").write_text("// Written by hand.\n")
+
+    create_clean_code_files(code_path, {"solver": "int main() {}", "plotter": "int main() {}"})
+    assert (code_path / "plotter.cpp").exists()
+
+    create_clean_code_files(code_path, {"solver": "int main() {}"})
+    assert not (code_path / "plotter.cpp").exists()
+    assert (code_path / "solver.cpp").exists()
+
+    create_clean_code_files(code_path, {})
+    assert sorted(path.name for path in code_path.iterdir()) == [".outputs.json", "notes.cpp"]
@@ -0,0 +1,33 @@
+"""test_incremental.py: Tests for rebuilding only the changed parts of a logbook."""
+
+from pathlib import Path
+from typing import Any
+
+from logbookgenerator.computation.incremental import IncrementalBuild
+
+
+def test_rebuild_matches_full_build(input_directory: Path, config: dict[str, Any]) -> None:
+    """
+    Test that rebuilding a changed week gives the same result as a full build.
+
+    Parameters
+    ----------
+    input_directory : Path
+        The input directory fixture.
+    config : dict[str, Any]
+        The configuration fixture.
+    """
+    incremental_build = IncrementalBuild(config, input_directory)
+    first_outputs = incremental_build.build()
+
+    changed_path = input_directory / "week2" / "e02-coursework-solver.cpp"
+    changed_path.write_text(changed_path.read_text().replace("Square root", "Root"))
+
+    assert incremental_build.build({input_directory / "notes.txt"}) is None
+
+    rebuilt_outputs = incremental_build.build({changed_path})
+    full_outputs = IncrementalBuild(config, input_directory).build()
+
+    assert rebuilt_outputs == full_outputs
+    assert rebuilt_outputs != first_outputs
+    assert rebuilt_outputs is not None and "Root." in rebuilt_outputs[0]
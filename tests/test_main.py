@@ -1,5 +1,14 @@
 """test_main.py: Tests for the main entry point of the application."""
 
+import json
+import shutil
+from pathlib import Path
+from typing import Any
+
+import pytest
+from logbookgenerator.main import build_logbook
+from logbookgenerator.utilities.scanning import scan_input_directory
+
 
 def test_run_main() -> None:
     """
@@ -13,3 +22,144 @@ def test_run_main() -> None:
     anything.
     """
     assert True  # TODO: Implement tests
+
+
+def test_partial_builds(input_directory: Path, config: dict[str, Any], tmp_path: Path) -> None:
+    """
+    Test that only the selected weeks and outputs are built.
+
+    Parameters
+    ----------
+    input_directory : Path
+        The input directory fixture.
+    config : dict[str, Any]
+        The configuration fixture.
+    tmp_path : Path
+        A temporary directory.
+    """
+    output_file = tmp_path / "renders" / "logbook.md"
+    user_arguments: dict[str, Any] = {
+        "input_directory": input_directory,
+        "output_file": output_file,
+        "jobs": 1,
+        "cache_directory": None,
+        "weeks": [2],
+        "targets": {"logbook"},
+        "split": False,
+    }
+
+    build_logbook(user_arguments, config, scan_input_directory(input_directory))
+
+    logbook = output_file.read_text()
+    assert "Week two reflection." in logbook
+    assert "Week one reflection." not in logbook
+    assert "Week 2" in logbook and "Week 1" not in logbook
+    assert not (tmp_path / "renders" / "coursework").exists()
+
+    output_file.unlink()
+    build_logbook(
+        user_arguments | {"weeks": None, "targets": {"clean-code"}},
+        config,
+        scan_input_directory(input_directory),
+    )
+
+    assert not output_file.exists()
+    assert not (tmp_path / "renders" / "coursework" / "coursework.md").exists()
+    assert (tmp_path / "renders" / "coursework" / "code" / "solver.cpp").exists()
+
+    # A build of only some weeks keeps the clean code of the other weeks
+    build_logbook(
+        user_arguments | {"weeks": [1], "targets": {"clean-code"}},
+        config,
+        scan_input_directory(input_directory),
+    )
+    assert (tmp_path / "renders" / "coursework" / "code" / "solver.cpp").exists()
+
+    with pytest.raises(ValueError):
+        build_logbook(
+            user_arguments | {"weeks": [3]}, config, scan_input_directory(input_directory)
+        )
+
+
+def test_split_logbook(input_directory: Path, config: dict[str, Any], tmp_path: Path) -> None:
+    """
+    Test that a split logbook has one file per section, listed in order in its index.
+
+    Parameters
+    ----------
+    input_directory : Path
+        The input directory fixture.
+    config : dict[str, Any]
+        The configuration fixture.
+    tmp_path : Path
+        A temporary directory.
+    """
+    output_file = tmp_path / "renders" / "logbook.md"
+    user_arguments: dict[str, Any] = {
+        "input_directory": input_directory,
+        "output_file": output_file,
+        "jobs": 1,
+        "cache_directory": None,
+        "weeks": None,
+        "targets": {"logbook"},
+        "split": False,
+    }
+    build_logbook(user_arguments, config, scan_input_directory(input_directory))
+    build_logbook(user_arguments | {"split": True}, config, scan_input_directory(input_directory))
+
+    split_directory = tmp_path / "renders" / "logbook"
+    index = json.loads((split_directory / "index.json").read_text())
+    assert index == ["cover.md", "contents.md", "week-01.md", "week-02.md", "references.md"]
+    assert "".join((split_directory / name).read_text() for name in index) == (
+        output_file.read_text()
+    )
+
+    # Sections that no longer exist are removed
+    shutil.rmtree(input_directory / "week2")
+    build_logbook(user_arguments | {"split": True}, config, scan_input_directory(input_directory))
+    assert not (split_directory / "week-02.md").exists()
+    assert json.loads((split_directory / "index.json").read_text()) == [
+        "cover.md",
+        "contents.md",
+        "week-01.md",
+        "references.md",
+    ]
+
+
+def test_split_logbook_of_some_weeks(
+    input_directory: Path, config: dict[str, Any], tmp_path: Path
+) -> None:
+    """
+    Test that a split build of only some weeks keeps the sections of the other weeks.
+
+    Parameters
+    ----------
+    input_directory : Path
+        The input directory fixture.
+    config : dict[str, Any]
+        The configuration fixture.
+    tmp_path : Path
+        A temporary directory.
+    """
+    user_arguments: dict[str, Any] = {
+        "input_directory": input_directory,
+        "output_file": tmp_path / "renders" / "logbook.md",
+        "jobs": 1,
+        "cache_directory": None,
+        "weeks": [2],
+        "targets": {"logbook"},
+        "split": True,
+    }
+    build_logbook(user_arguments, config, scan_input_directory(input_directory))
+    build_logbook(user_arguments | {"weeks": [1]}, config, scan_input_directory(input_directory))
+
+    split_directory = tmp_path / "renders" / "logbook"
+    assert "Week two reflection." in (split_directory / "week-02.md").read_text()
+    assert "Week one reflection." in (split_directory / "week-01.md").read_text()
+    assert json.loads((split_directory / "index.json").read_text()) == [
+        "cover.md",
+        "contents.md",
+        "week-01.md",
+        "week-02.md",
+        "references.md",
+    ]
@@ -0,0 +1,63 @@
+"""test_metrics.py: Tests for the machine readable metrics of a build."""
+
+import json
+from pathlib import Path
+from typing import Any
+
+from logbookgenerator.computation.context_generation import generate_logbook_contexts
+from logbookgenerator.computation.parsing import parse_input_directory
+from logbookgenerator.logs.metrics import (
+    collect_metrics,
+    count_answers,
+    format_prometheus,
+    save_metrics,
+)
+from logbookgenerator.logs.profiling import Profiler
+
+
+def test_metrics_are_saved_as_json_and_prometheus(
+    input_directory: Path, config: dict[str, Any], tmp_path: Path
+) -> None:
+    """
+    Test that the metrics of a build hold its answers, counters and stages in both formats.
+
+    Parameters
+    ----------
+    input_directory : Path
+        The input directory fixture.
+    config : dict[str, Any]
+        The configuration fixture.
+    tmp_path : Path
+        A temporary directory.
+    """
+    logbook_contexts, _, _ = generate_logbook_contexts(
+        config, *parse_input_directory(input_directory)
+    )
+    answers = count_answers(logbook_contexts["weeks"])
+    assert answers == {"1": 1, "2": 2}
+
+    profiler = Profiler(enabled=True)
+    with profiler.stage("parsing"):
+        profiler.count("parsing", files=5, size=1000)
+    profiler.increment("sections_rendered", 4)
+    profiler.increment("section_cache_hits")
+
+    metrics = collect_metrics(
+        profiler, {"input_directory": Path('students/"ada"'), "jobs": 2}, answers
+    )
+    assert metrics["files_read"] == 5 and metrics["bytes_read"] == 1000
+    assert metrics["sections_rendered"] == 4
+    assert metrics["cache_hits"] == {"comments": 0, "sections": 1}
+    assert metrics["files_written"] == 0
+
+    save_metrics(tmp_path / "metrics.json", metrics)
+    assert json.loads((tmp_path / "metrics.json").read_text()) == metrics
+
+    save_metrics(tmp_path / "metrics.prom", metrics)
+    textfile = (tmp_path / "metrics.prom").read_text()
+    assert textfile == format_prometheus(metrics)
+    assert 'logbookgenerator_answers{input_directory="students/\\"ada\\"",week="2"} 2\n' in textfile
+    assert (
+        'logbookgenerator_stage_files{input_directory="students/\\"ada\\"",stage="parsing"} 5'
+        in textfile
+    )
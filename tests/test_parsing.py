@@ -0,0 +1,26 @@
+"""test_parsing.py: Tests for parsing the input directory."""
+
+from pathlib import Path
+
+from logbookgenerator.computation.parsing import parse_input_directory
+
+
+def test_parallel_parse_matches_serial(input_directory: Path) -> None:
+    """
+    Test that reading files concurrently gives the same result as reading serially.
+
+    Parameters
+    ----------
+    input_directory : Path
+        The input directory fixture.
+    """
+    serial_result = parse_input_directory(input_directory, jobs=1)
+    parallel_result = parse_input_directory(input_directory, jobs=4)
+
+    assert parallel_result == serial_result
+    assert [list(week["cpp"]) for week in parallel_result[0]] == [
+        list(week["cpp"]) for week in serial_result[0]
+    ]
+    assert parallel_result[1] == {
+        "solver": (input_directory / "week2" / "e02-coursework-solver.cpp").read_text()
+    }
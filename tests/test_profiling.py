@@ -0,0 +1,61 @@
+"""test_profiling.py: Tests for profiling the stages of a build."""
+
+import pytest
+from logbookgenerator.computation.code_processing import process_files_comments
+from logbookgenerator.logs import profiling
+
+
+def test_stages_are_timed_exclusively() -> None:
+    """Test that time in a nested stage, such as rendering during writing, is not counted twice."""
+    profiler = profiling.Profiler(enabled=True)
+
+    def render() -> list[str]:
+        with profiler.stage("busy"):
+            sum(range(200_000))
+        return ["# Logbook\n", "Week 1 ✓\n"]
+
+    with profiler.stage("writing"):
+        pieces = list(profiler.stage_items("rendering", iter(render())))
+        profiler.count("writing", files=1, size=20)
+
+    with profiler.stage("writing"):
+        pass
+
+    assert pieces == ["# Logbook\n", "Week 1 ✓\n"]
+    assert list(profiler.stages) == ["writing", "busy", "rendering"]
+    assert profiler.stages["rendering"].files == 1
+    assert profiler.stages["rendering"].bytes == len("# Logbook\nWeek 1 ✓\n".encode())
+    assert profiler.stages["writing"].files == 1
+    assert profiler.stages["busy"].wall_seconds > profiler.stages["writing"].wall_seconds
+
+    disabled_profiler = profiling.Profiler()
+    with disabled_profiler.stage("writing"):
+        disabled_profiler.count("writing", files=1)
+    assert not disabled_profiler.stages
+
+
+def test_slowest_files_are_reported(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Test that the time to process each file is recorded under its name when profiling.
+
+    Parameters
+    ----------
+    monkeypatch : pytest.MonkeyPatch
+        The monkeypatch fixture.
+    """
+    file_contents = ["int f() { return 1; }", "// ANSWER (Task 1.1): Returns two.\nint g();"]
+    unprofiled_results = process_files_comments(file_contents)
+
+    profiler = profiling.Profiler(enabled=True)
+    monkeypatch.setattr(profiling, "_profiler", profiler)
+    results = process_files_comments(file_contents, file_names=["Week 1: f.cpp", "Week 1: g.cpp"])
+
+    assert results == unprofiled_results
+    assert [(name, size) for name, _, size in profiler.sources] == [
+        ("Week 1: f.cpp", 21),
+        ("Week 1: g.cpp", 43),
+    ]
+
+    report = profiler.report(slowest_sources=1)
+    assert "Slowest files to process:" in report
+    assert report.count("Week 1:") == 1
@@ -0,0 +1,186 @@
+"""test_render_context.py: Tests for rendering the contexts."""
+
+from pathlib import Path
+from typing import Any
+
+import pytest
+from logbookgenerator.computation import render_context
+from logbookgenerator.computation.context_generation import generate_logbook_contexts
+from logbookgenerator.computation.parsing import parse_input_directory
+from logbookgenerator.utilities.file_handling import save_file
+
+
+def test_templates_are_compiled_once(tmp_path: Path) -> None:
+    """
+    Test that templates are compiled once and their bytecode is cached on disk.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        A temporary directory.
+    """
+    environment = render_context.setup_template_environment(tmp_path)
+    references = {"references": [{"title": "A", "url": "https://example.com"}]}
+
+    rendered = render_context.render_template("references.md.j2", references)
+
+    assert render_context.get_template_environment() is environment
+    assert environment.get_template("references.md.j2") is environment.get_template(
+        "references.md.j2"
+    )
+    assert list((tmp_path / "templates").iterdir())
+
+    # A new process reloads the compiled template from the bytecode cache
+    render_context.setup_template_environment(tmp_path)
+    assert render_context.render_template("references.md.j2", references) == rendered
+    render_context.setup_template_environment()
+
+
+def test_logbook_is_streamed_to_stdout(
+    input_directory: Path, config: dict[str, Any], capsys: pytest.CaptureFixture[str]
+) -> None:
+    """
+    Test that streaming the logbook to stdout matches rendering it whole.
+
+    Parameters
+    ----------
+    input_directory : Path
+        The input directory fixture.
+    config : dict[str, Any]
+        The configuration fixture.
+    capsys : pytest.CaptureFixture[str]
+        The captured output.
+    """
+    logbook_contexts, _, _ = generate_logbook_contexts(
+        config, *parse_input_directory(input_directory)
+    )
+
+    save_file(Path("-"), render_context.stream_logbook(logbook_contexts))
+
+    assert capsys.readouterr().out == render_context.create_logbook(logbook_contexts)
+
+
+def test_unchanged_sections_are_reused(
+    input_directory: Path,
+    config: dict[str, Any],
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """
+    Test that only the sections whose context changed are rendered again.
+
+    Parameters
+    ----------
+    input_directory : Path
+        The input directory fixture.
+    config : dict[str, Any]
+        The configuration fixture.
+    tmp_path : Path
+        A temporary directory.
+    monkeypatch : pytest.MonkeyPatch
+        The monkeypatch fixture.
+    """
+    cache_directory = tmp_path / "cache"
+    logbook_contexts, _, _ = generate_logbook_contexts(
+        config, *parse_input_directory(input_directory)
+    )
+    logbook = render_context.create_logbook(logbook_contexts, cache_directory=cache_directory)
+
+    rendered_templates: list[str] = []
+    stream_template = render_context.stream_template
+
+    def recording_stream_template(template_name: str, context: dict[str, Any]) -> Any:
+        rendered_templates.append(template_name)
+        return stream_template(template_name, context)
+
+    monkeypatch.setattr(render_context, "stream_template", recording_stream_template)
+
+    cached_logbook = render_context.create_logbook(
+        logbook_contexts, cache_directory=cache_directory
+    )
+    assert rendered_templates == []
+    assert cached_logbook == logbook == render_context.create_logbook(logbook_contexts)
+    rendered_templates.clear()
+
+    logbook_contexts["weeks"]["2"].reflection = "A changed reflection.\n"
+    changed_logbook = render_context.create_logbook(
+        logbook_contexts, cache_directory=cache_directory
+    )
+
+    assert rendered_templates == ["week.md.j2"]
+    assert "A changed reflection." in changed_logbook
+
+
+def test_sections_are_rendered_in_parallel(
+    input_directory: Path,
+    config: dict[str, Any],
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """
+    Test that rendering the sections over a process pool keeps them in order.
+
+    Parameters
+    ----------
+    input_directory : Path
+        The input directory fixture.
+    config : dict[str, Any]
+        The configuration fixture.
+    tmp_path : Path
+        A temporary directory.
+    monkeypatch : pytest.MonkeyPatch
+        The monkeypatch fixture.
+    """
+    monkeypatch.setattr(render_context.Constants, "PARALLEL_RENDERING_MINIMUM_SECTIONS", 1)
+    logbook_contexts, coursework_context, _ = generate_logbook_contexts(
+        config, *parse_input_directory(input_directory)
+    )
+    assert coursework_context is not None
+
+    logbook = render_context.create_logbook(logbook_contexts)
+    coursework = render_context.create_coursework(coursework_context)
+
+    assert render_context.create_logbook(logbook_contexts, jobs=2) == logbook
+    assert render_context.create_coursework(coursework_context, jobs=2) == coursework
+
+    # The parallel renderings are cached for the next build, whatever its jobs
+    cache_directory = tmp_path / "cache"
+    assert (
+        render_context.create_logbook(logbook_contexts, cache_directory=cache_directory, jobs=2)
+        == logbook
+    )
+    assert render_context.create_logbook(logbook_contexts, cache_directory=cache_directory) == (
+        logbook
+    )
+    assert len(list((cache_directory / "sections").iterdir())) == len(logbook_contexts["weeks"]) + 3
+
+
+def test_sections_are_streamed_without_a_process_pool(
+    input_directory: Path, config: dict[str, Any], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """
+    Test that with several jobs but too few sections for a process pool, each is streamed.
+
+    Parameters
+    ----------
+    input_directory : Path
+        The input directory fixture.
+    config : dict[str, Any]
+        The configuration fixture.
+    monkeypatch : pytest.MonkeyPatch
+        The monkeypatch fixture.
+    """
+    logbook_contexts, coursework_context, _ = generate_logbook_contexts(
+        config, *parse_input_directory(input_directory)
+    )
+    assert coursework_context is not None
+    logbook = render_context.create_logbook(logbook_contexts)
+    coursework = render_context.create_coursework(coursework_context)
+
+    def render_sections(*_: Any) -> list[str]:
+        """Fail if the sections are rendered together."""
+        raise AssertionError("The sections were rendered together")
+
+    monkeypatch.setattr(render_context, "render_sections", render_sections)
+    assert render_context.create_logbook(logbook_contexts, jobs=2) == logbook
+    assert render_context.create_coursework(coursework_context, jobs=2) == coursework
@@ -0,0 +1,22 @@
+"""test_startup.py: Tests for keeping the command line interface quick to start."""
+
+import subprocess
+import sys
+
+HEAVY_MODULES = ["jinja2", "questionary", "rich", "yaml"]
+
+
+def test_heavy_modules_are_imported_lazily() -> None:
+    """Test that importing the entry point does not import any heavy dependencies."""
+    imported_modules = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, logbookgenerator.main; print(' '.join(sys.modules))",
+        ],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.split()
+
+    assert [module for module in HEAVY_MODULES if module in imported_modules] == []
@@ -0,0 +1,48 @@
+"""test_tracing.py: Tests for tracing the hot paths of the application."""
+
+import logging
+
+import pytest
+from logbookgenerator.logs import tracing
+
+
+class Unformattable:
+    """An argument that fails the test if it is ever formatted."""
+
+    def __repr__(self) -> str:
+        """
+        Fail the test.
+
+        Returns
+        -------
+        str
+            Never returns.
+        """
+        raise AssertionError("The trace argument was formatted.")
+
+
+def test_tracing_is_only_formatted_when_enabled(caplog: pytest.LogCaptureFixture) -> None:
+    """
+    Test that trace arguments are only formatted once a subsystem is enabled.
+
+    Parameters
+    ----------
+    caplog : pytest.LogCaptureFixture
+        The captured log records.
+    """
+    tracing.disable_tracing()
+    tracer = tracing.get_tracer("rendering")
+
+    with caplog.at_level(logging.DEBUG):
+        tracer("Context: %s", Unformattable())
+
+        tracing.enable_tracing(["rendering"])
+        tracer("Context: %s", {"week": 1})
+
+    assert tracing.get_tracer("rendering") is tracer and tracer.enabled
+    assert [record.getMessage() for record in caplog.records] == ["Context: {'week': 1}"]
+
+    with pytest.raises(ValueError):
+        tracing.get_tracer("unknown")
+
+    tracing.disable_tracing()
@@ -0,0 +1,61 @@
+"""test_validation.py: Tests for validating the input directory."""
+
+from pathlib import Path
+
+import pytest
+from logbookgenerator.computation.parsing import parse_input_directory
+from logbookgenerator.utilities.scanning import scan_input_directory
+from logbookgenerator.utilities.validation import (
+    parse_week_selection,
+    validate_input_directory,
+)
+
+
+def test_manifest_is_shared_by_validation_and_parsing(input_directory: Path) -> None:
+    """
+    Test that validating and parsing with a manifest matches doing so without one.
+
+    Parameters
+    ----------
+    input_directory : Path
+        The input directory fixture.
+    """
+    manifest = scan_input_directory(input_directory)
+
+    validate_input_directory(input_directory, manifest)
+
+    assert list(manifest.weeks) == ["week1", "week2"]
+    assert parse_input_directory(input_directory, manifest=manifest) == parse_input_directory(
+        input_directory
+    )
+
+
+def test_invalid_input_directories(input_directory: Path) -> None:
+    """
+    Test that invalid input directories are rejected.
+
+    Parameters
+    ----------
+    input_directory : Path
+        The input directory fixture.
+    """
+    with pytest.raises(FileNotFoundError):
+        validate_input_directory(input_directory / "missing")
+
+    (input_directory / "week3").mkdir()
+    with pytest.raises(ValueError, match="does not have any week files"):
+        validate_input_directory(input_directory)
+
+
+def test_week_selection() -> None:
+    """Test that week selections are parsed into sorted week numbers."""
+    assert parse_week_selection("3-5") == [3, 4, 5]
+    assert parse_week_selection("7, 1,3-4,3") == [1, 3, 4, 7]
+
+    for invalid_selection in ["", "0", "5-3", "three", "1-"]:
+        with pytest.raises(ValueError):
+            parse_week_selection(invalid_selection)
+
+    assert parse_week_selection("1-2", week_count=2) == [1, 2]
+    with pytest.raises(ValueError, match="There is no week 3, 20"):
+        parse_week_selection("2-3,20", week_count=2)